@@ -0,0 +1,182 @@
+"""Measure how much time skipping internal type checks saves for each
+endpoint.
+
+Each endpoint is called many times against an in-memory mock, first with
+internal type checks and then without them. Type checks are chosen when
+``mock_vws`` is imported, so each run is made in a new interpreter.
+
+Run this with:
+
+.. code-block:: console
+
+   $ python admin/benchmark_type_checks.py
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+
+from PIL import Image
+from vws import VWS, CloudRecoService
+
+from mock_vws import MockVWS
+from mock_vws._type_checks import (
+    SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE,
+)
+from mock_vws.database import CloudDatabase
+from mock_vws.image_matchers import ExactMatcher
+from mock_vws.target_raters import HardcodedTargetTrackingRater
+
+_CALLS_PER_ENDPOINT = 200
+_TARGETS_IN_DATABASE = 100
+
+
+def _image_content(*, color: tuple[int, int, int]) -> bytes:
+    """Create a PNG image of one color."""
+    image_file = io.BytesIO()
+    Image.new(mode="RGB", size=(100, 100), color=color).save(
+        fp=image_file,
+        format="PNG",
+    )
+    return image_file.getvalue()
+
+
+def _time_endpoints() -> dict[str, float]:
+    """Time calls to each endpoint in this interpreter.
+
+    Returns:
+        The mean number of seconds taken by a call to each endpoint.
+    """
+    database = CloudDatabase()
+    vws_client = VWS(
+        server_access_key=database.server_access_key,
+        server_secret_key=database.server_secret_key,
+    )
+    cloud_reco_client = CloudRecoService(
+        client_access_key=database.client_access_key,
+        client_secret_key=database.client_secret_key,
+    )
+    image_content = _image_content(color=(255, 0, 0))
+
+    with MockVWS(
+        processing_time_seconds=0,
+        duplicate_match_checker=ExactMatcher(),
+        query_match_checker=ExactMatcher(),
+        target_tracking_rater=HardcodedTargetTrackingRater(rating=3),
+    ) as mock:
+        mock.add_cloud_database(cloud_database=database)
+        target_ids = [
+            vws_client.add_target(
+                name=uuid.uuid4().hex,
+                width=1,
+                image=io.BytesIO(initial_bytes=image_content),
+                active_flag=True,
+                application_metadata=None,
+            )
+            for _ in range(_TARGETS_IN_DATABASE)
+        ]
+        target_id = target_ids[0]
+        vws_client.wait_for_target_processed(target_id=target_id)
+
+        def add_and_delete_target() -> None:
+            """Add a target and then delete it."""
+            new_target_id = vws_client.add_target(
+                name=uuid.uuid4().hex,
+                width=1,
+                image=io.BytesIO(initial_bytes=image_content),
+                active_flag=True,
+                application_metadata=None,
+            )
+            vws_client.delete_target(target_id=new_target_id)
+
+        endpoints: dict[str, Callable[[], object]] = {
+            "add and delete target": add_and_delete_target,
+            "database summary": vws_client.get_database_summary_report,
+            "get duplicates": lambda: vws_client.get_duplicate_targets(
+                target_id=target_id,
+            ),
+            "get target record": lambda: vws_client.get_target_record(
+                target_id=target_id,
+            ),
+            "list targets": vws_client.list_targets,
+            "query": lambda: cloud_reco_client.query(
+                image=io.BytesIO(initial_bytes=image_content),
+            ),
+            "target summary": lambda: vws_client.get_target_summary_report(
+                target_id=target_id,
+            ),
+            "update target": lambda: vws_client.update_target(
+                target_id=target_id,
+                width=2,
+            ),
+        }
+        return {
+            name: timeit.timeit(stmt=call, number=_CALLS_PER_ENDPOINT)
+            / _CALLS_PER_ENDPOINT
+            for name, call in endpoints.items()
+        }
+
+
+def _time_endpoints_in_new_interpreter(
+    *,
+    skip_internal_type_checks: bool,
+) -> dict[str, float]:
+    """Time calls to each endpoint in a new interpreter.
+
+    Args:
+        skip_internal_type_checks: Whether internal type checks are skipped.
+
+    Returns:
+        The mean number of seconds taken by a call to each endpoint.
+    """
+    env = {
+        **os.environ,
+        SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE: (
+            "1" if skip_internal_type_checks else "0"
+        ),
+    }
+    result = subprocess.run(
+        args=[sys.executable, __file__, "--worker"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    timings: dict[str, float] = json.loads(s=result.stdout)
+    return timings
+
+
+def main() -> None:
+    """Print the time taken by each endpoint with and without internal type
+    checks.
+    """
+    if sys.argv[1:] == ["--worker"]:
+        sys.stdout.write(json.dumps(obj=_time_endpoints()))
+        return
+
+    checked = _time_endpoints_in_new_interpreter(
+        skip_internal_type_checks=False,
+    )
+    unchecked = _time_endpoints_in_new_interpreter(
+        skip_internal_type_checks=True,
+    )
+    sys.stdout.write(
+        f"{'Endpoint':<24}{'Checked (ms)':>14}{'Unchecked (ms)':>16}"
+        f"{'Saving':>9}\n",
+    )
+    for name, checked_seconds in checked.items():
+        unchecked_seconds = unchecked[name]
+        saving = 1 - unchecked_seconds / checked_seconds
+        sys.stdout.write(
+            f"{name:<24}{checked_seconds * 1000:>14.3f}"
+            f"{unchecked_seconds * 1000:>16.3f}{saving:>9.1%}\n",
+        )
+
+
+if __name__ == "__main__":
+    main()
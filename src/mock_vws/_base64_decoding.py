@@ -4,10 +4,10 @@ import base64
 import binascii
 import string
 
-from beartype import beartype
+from mock_vws._type_checks import internal_beartype
 
 
-@beartype
+@internal_beartype
 def decode_base64(encoded_data: str) -> bytes:
     """Decode base64 somewhat like Vuforia does.
 
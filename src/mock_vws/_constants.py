@@ -2,7 +2,7 @@
 
 from enum import Enum, unique
 
-from beartype import beartype
+from mock_vws._type_checks import internal_beartype
 
 VUMARK_PNG = (
     b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00"
@@ -27,7 +27,7 @@ VUMARK_PDF = (
 )
 
 
-@beartype
+@internal_beartype
 @unique
 class ResultCodes(Enum):
     """Constants representing various VWS result codes.
@@ -73,7 +73,7 @@ class ResultCodes(Enum):
     INVALID_TARGET_TYPE = "InvalidTargetType"
 
 
-@beartype
+@internal_beartype
 @unique
 class TargetStatuses(Enum):
     """Constants representing VWS target statuses.
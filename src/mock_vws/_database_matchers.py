@@ -2,15 +2,37 @@
 
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
 from vws_auth_tools import authorization_header
 
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase, VuMarkDatabase
 
 AnyDatabase = CloudDatabase | VuMarkDatabase
 
 
-@beartype
+@internal_beartype
+def access_key_from_auth_header(*, auth_header: str | None) -> str | None:
+    """Get the access key given in an ``Authorization`` header.
+
+    Only a database with this access key can match the header, so the
+    signature is computed only for those databases.
+
+    Args:
+        auth_header: The ``Authorization`` header given in a request, of the
+            form ``VWS <access key>:<signature>``.
+
+    Returns:
+        The access key, which is empty if the header has no access key, or
+        ``None`` if no header is given.
+    """
+    if auth_header is None:
+        return None
+    credentials, _, _ = auth_header.partition(":")
+    _, _, access_key = credentials.partition(" ")
+    return access_key
+
+
+@internal_beartype
 def get_database_matching_client_keys(
     *,
     request_headers: Mapping[str, str],
@@ -43,7 +65,10 @@ def get_database_matching_client_keys(
     auth_header = request_headers_dict.get("Authorization")
     date = request_headers_dict.get("Date", "")
 
+    given_access_key = access_key_from_auth_header(auth_header=auth_header)
     for database in databases:
+        if database.client_access_key != given_access_key:
+            continue
         expected_authorization_header = authorization_header(
             access_key=database.client_access_key,
             secret_key=database.client_secret_key,
@@ -59,7 +84,7 @@ def get_database_matching_client_keys(
     raise ValueError
 
 
-@beartype
+@internal_beartype
 def get_database_matching_server_keys[DatabaseT: AnyDatabase](
     *,
     request_headers: Mapping[str, str],
@@ -91,7 +116,10 @@ def get_database_matching_server_keys[DatabaseT: AnyDatabase](
     auth_header = request_headers_dict.get("Authorization")
     date = request_headers_dict.get("Date", "")
 
+    given_access_key = access_key_from_auth_header(auth_header=auth_header)
     for database in databases:
+        if database.server_access_key != given_access_key:
+            continue
         expected_authorization_header = authorization_header(
             access_key=database.server_access_key,
             secret_key=database.server_secret_key,
@@ -0,0 +1,86 @@
+"""The VWS, VWQ and target manager applications served by one process.
+
+The applications share one target manager in memory, as they do in
+:class:`mock_vws.MockVWS`. The VWS and VWQ applications read the target
+manager's databases directly, and their changes to the target manager are
+handled in this process rather than over a network connection.
+
+Query requests, to ``/v1/query``, are handled by the VWQ application.
+Target manager requests are handled under the ``/target-manager`` path, and
+all other requests are handled by the VWS application. For example:
+
+.. code-block:: console
+
+   $ python -m gunicorn \
+       --config python:mock_vws._flask_server.gunicorn_config \
+       --bind 0.0.0.0:5000 \
+       --workers 1 \
+       mock_vws._flask_server.embedded:EMBEDDED_APP
+
+The target manager keeps its state in memory, so this must be served by one
+process.
+"""
+
+import os
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+from mock_vws._flask_server.target_manager import (
+    TARGET_MANAGER,
+    TARGET_MANAGER_FLASK_APP,
+)
+from mock_vws._flask_server.target_manager_client import (
+    TARGET_MANAGER_CLIENT,
+)
+from mock_vws._flask_server.vwq import CLOUDRECO_FLASK_APP
+from mock_vws._flask_server.vws import VWS_FLASK_APP, VWS_SETTINGS
+from mock_vws._type_checks import internal_beartype
+
+_QUERY_PATH = "/v1/query"
+
+# The VWS and VWQ applications find the target manager at this URL, unless
+# ``TARGET_MANAGER_BASE_URL`` is set. Nothing is served at this URL; requests
+# to it are handled in this process.
+_DEFAULT_TARGET_MANAGER_BASE_URL = "http://target-manager.invalid"
+
+os.environ.setdefault(
+    "TARGET_MANAGER_BASE_URL",
+    _DEFAULT_TARGET_MANAGER_BASE_URL,
+)
+
+# Requests to the target manager at this base URL are handled in this
+# process.
+IN_PROCESS_TARGET_MANAGER_BASE_URL = VWS_SETTINGS.get().target_manager_base_url
+TARGET_MANAGER_CLIENT.mount_in_process(
+    base_url=IN_PROCESS_TARGET_MANAGER_BASE_URL,
+    app=TARGET_MANAGER_FLASK_APP,
+    target_manager=TARGET_MANAGER,
+)
+
+
+@internal_beartype
+def _vws_or_vwq_app(
+    environ: dict[str, Any],
+    start_response: Callable[..., Any],
+) -> Iterable[bytes]:
+    """Handle a request with the VWQ application if it is a query, and with
+    the VWS application otherwise.
+
+    Args:
+        environ: The WSGI environment of the request.
+        start_response: The WSGI callable which starts the response.
+
+    Returns:
+        The response body.
+    """
+    if environ.get("PATH_INFO") == _QUERY_PATH:
+        return CLOUDRECO_FLASK_APP(environ, start_response)
+    return VWS_FLASK_APP(environ, start_response)
+
+
+EMBEDDED_APP = DispatcherMiddleware(
+    app=_vws_or_vwq_app,
+    mounts={"/target-manager": TARGET_MANAGER_FLASK_APP},
+)
@@ -0,0 +1,44 @@
+"""Gunicorn configuration for serving the Flask applications.
+
+The Docker images serve each application with Gunicorn, which reads the
+module-level settings here. Gunicorn is installed with the ``docker`` extra.
+For example:
+
+.. code-block:: console
+
+   $ python -m gunicorn \
+       --config python:mock_vws._flask_server.gunicorn_config \
+       --bind 0.0.0.0:5000 \
+       mock_vws._flask_server.vws:VWS_FLASK_APP
+
+On ``SIGTERM``, which ``docker stop`` sends, Gunicorn stops accepting
+connections, so the health check fails, and then waits for requests which
+are in progress to finish.
+"""
+
+from pydantic_settings import BaseSettings
+
+from mock_vws._type_checks import internal_beartype
+
+
+@internal_beartype
+class ServingSettings(BaseSettings):
+    """Settings for serving a Flask app."""
+
+    # The target manager keeps its state in memory, so it must be served by
+    # one process.
+    worker_processes: int = 1
+    worker_threads: int = 8
+    graceful_shutdown_timeout_seconds: int = 30
+
+
+_SETTINGS = ServingSettings.model_validate(obj={})
+
+workers = _SETTINGS.worker_processes
+threads = _SETTINGS.worker_threads
+# Each request is handled on a thread from a pool in each worker process.
+worker_class = "gthread"
+graceful_timeout = _SETTINGS.graceful_shutdown_timeout_seconds
+# Do not kill a worker for handling a request slowly, as requests are slow on
+# purpose when ``RESPONSE_DELAY_SECONDS`` is set.
+timeout = 0
@@ -4,13 +4,20 @@ import http.client
 import sys
 from http import HTTPStatus
 
-from beartype import beartype
+from mock_vws._type_checks import internal_beartype
 
 
-@beartype
+@internal_beartype
 def flask_app_healthy(port: int) -> bool:
     """Check if the Flask app is healthy."""
-    conn = http.client.HTTPConnection(host="localhost", port=port)
+    # While a Gunicorn worker is starting, a connection can be accepted but
+    # not responded to, so the request times out rather than waiting.
+    timeout_seconds = 5
+    conn = http.client.HTTPConnection(
+        host="localhost",
+        port=port,
+        timeout=timeout_seconds,
+    )
     try:
         conn.request(method="GET", url="/some-random-endpoint")
         response = conn.getresponse()
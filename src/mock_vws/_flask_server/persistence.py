@@ -0,0 +1,732 @@
+"""Persistence of the target manager service's state to a local directory.
+
+Each change to the state is appended to a log of mutations, and is written
+to disk before the change is acknowledged. Every so often, the log is set
+aside and the whole state is written to a snapshot in a background thread,
+and then the set aside log is deleted. On startup, the snapshot is loaded and
+then any set aside logs and the log are replayed, so startup takes time in
+proportion to the size of the state rather than to the number of changes
+which made it.
+
+Snapshots and log records are written in the binary wire format, so target
+images are stored as raw bytes. Each log record is prefixed by its length as a
+4 byte big-endian unsigned integer. A record which was cut short, for example
+because the process was killed while writing it, is ignored.
+"""
+
+import copy
+import os
+import struct
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import Any
+
+from mock_vws._flask_server.wire_format import (
+    BinaryWireReader,
+    BinaryWireWriter,
+    WireReader,
+)
+from mock_vws._type_checks import internal_beartype
+from mock_vws.database import CloudDatabase, VuMarkDatabase
+from mock_vws.model_target import ModelTargetDataset, OAuth2ClientCredential
+from mock_vws.target import ImageTarget, VuMarkTarget
+from mock_vws.target_manager import TargetManager
+
+_SNAPSHOT_FILE_NAME = "snapshot.bin"
+_LOG_FILE_NAME = "mutations.log"
+# A log which is set aside while a snapshot is written is renamed to this
+# name, followed by the sequence number of its last change.
+_SET_ASIDE_LOG_FILE_NAME_PREFIX = _LOG_FILE_NAME + "."
+
+_LENGTH_PREFIX = struct.Struct(">I")
+
+
+@internal_beartype
+class MutationKind(StrEnum):
+    """The kinds of change which the log records."""
+
+    CLOUD_DATABASE_ADDED = auto()
+    CLOUD_DATABASE_REMOVED = auto()
+    TARGET_PUT = auto()
+    VUMARK_DATABASE_ADDED = auto()
+    VUMARK_DATABASE_REMOVED = auto()
+    VUMARK_TARGET_ADDED = auto()
+    MODEL_TARGET_DATASET_ADDED = auto()
+    MODEL_TARGET_DATASET_REMOVED = auto()
+    OAUTH2_CLIENT_CREDENTIAL_PUT = auto()
+    OAUTH2_CLIENT_CREDENTIAL_REMOVED = auto()
+
+
+@internal_beartype
+def _oauth2_client_credential_to_dict(
+    *,
+    credential: OAuth2ClientCredential,
+) -> dict[str, Any]:
+    """Dump an OAuth2 client credential to a dictionary."""
+    return {
+        "client_id": credential.client_id,
+        "client_secret": credential.client_secret,
+        "scopes": list(credential.scopes),
+    }
+
+
+@internal_beartype
+def _oauth2_client_credential_from_dict(
+    *,
+    credential_dict: dict[str, Any],
+) -> OAuth2ClientCredential:
+    """Load an OAuth2 client credential from a dictionary."""
+    return OAuth2ClientCredential(
+        client_id=credential_dict["client_id"],
+        client_secret=credential_dict["client_secret"],
+        scopes=tuple(credential_dict["scopes"]),
+    )
+
+
+@internal_beartype
+def _apply_cloud_database_added(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Add a cloud database from the log to a target manager."""
+    target_manager.add_cloud_database(
+        cloud_database=reader.cloud_database_from_dict(database_dict=data),
+    )
+
+
+@internal_beartype
+def _apply_cloud_database_removed(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Remove a cloud database named in the log from a target manager."""
+    del reader
+    target_manager.remove_cloud_database(
+        cloud_database=target_manager.get_cloud_database(database_name=data),
+    )
+
+
+@internal_beartype
+def _put_targets(
+    *,
+    target_manager: TargetManager,
+    targets_by_database_name: Mapping[str, Mapping[str, ImageTarget]],
+) -> None:
+    """Replace cloud databases with versions which have the given targets.
+
+    Args:
+        target_manager: The target manager which has the databases.
+        targets_by_database_name: The targets to put into each database,
+            keyed by target ID. Each replaces the target with the same ID.
+    """
+    for database_name, targets in targets_by_database_name.items():
+        database = target_manager.get_cloud_database(
+            database_name=database_name,
+        )
+        new_targets = {
+            existing_target
+            for existing_target in database.targets
+            if existing_target.target_id not in targets
+        }
+        new_targets.update(targets.values())
+        # See https://github.com/facebook/pyrefly/issues/1897
+        new_database: CloudDatabase = copy.replace(
+            database,  # pyrefly: ignore[bad-argument-type]
+            targets=new_targets,
+        )
+        target_manager.replace_cloud_database(cloud_database=new_database)
+
+
+@internal_beartype
+def _apply_vumark_database_added(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Add a VuMark database from the log to a target manager."""
+    del reader
+    target_manager.add_vumark_database(
+        vumark_database=VuMarkDatabase.from_dict(database_dict=data),
+    )
+
+
+@internal_beartype
+def _apply_vumark_database_removed(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Remove a VuMark database named in the log from a target manager."""
+    del reader
+    target_manager.remove_vumark_database(
+        vumark_database=target_manager.get_vumark_database(
+            database_name=data,
+        ),
+    )
+
+
+@internal_beartype
+def _apply_vumark_target_added(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Add a VuMark target from the log to a VuMark database."""
+    del reader
+    database = target_manager.get_vumark_database(
+        database_name=data["database_name"],
+    )
+    target = VuMarkTarget.from_dict(target_dict=data["target"])
+    # See https://github.com/facebook/pyrefly/issues/1897
+    new_database: VuMarkDatabase = copy.replace(
+        database,  # pyrefly: ignore[bad-argument-type]
+        vumark_targets={*database.vumark_targets, target},
+    )
+    target_manager.replace_vumark_database(vumark_database=new_database)
+
+
+@internal_beartype
+def _apply_model_target_dataset_added(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Add a Model Target dataset from the log to a target manager."""
+    del reader
+    target_manager.add_model_target_dataset(
+        model_target_dataset=ModelTargetDataset.from_dict(dataset_dict=data),
+    )
+
+
+@internal_beartype
+def _apply_model_target_dataset_removed(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Remove a Model Target dataset named in the log."""
+    del reader
+    target_manager.remove_model_target_dataset(dataset_uuid=data)
+
+
+@internal_beartype
+def _apply_oauth2_client_credential_put(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Add or replace an OAuth2 client credential from the log."""
+    del reader
+    target_manager.add_oauth2_client_credential(
+        credential=_oauth2_client_credential_from_dict(credential_dict=data),
+    )
+
+
+@internal_beartype
+def _apply_oauth2_client_credential_removed(
+    *,
+    target_manager: TargetManager,
+    data: Any,  # noqa: ANN401
+    reader: WireReader,
+) -> None:
+    """Remove an OAuth2 client credential named in the log."""
+    del reader
+    target_manager.remove_oauth2_client_credential(client_id=data)
+
+
+# Targets which are put into cloud databases are not applied one change at a
+# time. See ``TargetManagerStore.load``.
+_MUTATION_APPLIERS: Mapping[MutationKind, Callable[..., None]] = {
+    MutationKind.CLOUD_DATABASE_ADDED: _apply_cloud_database_added,
+    MutationKind.CLOUD_DATABASE_REMOVED: _apply_cloud_database_removed,
+    MutationKind.VUMARK_DATABASE_ADDED: _apply_vumark_database_added,
+    MutationKind.VUMARK_DATABASE_REMOVED: _apply_vumark_database_removed,
+    MutationKind.VUMARK_TARGET_ADDED: _apply_vumark_target_added,
+    MutationKind.MODEL_TARGET_DATASET_ADDED: _apply_model_target_dataset_added,
+    MutationKind.MODEL_TARGET_DATASET_REMOVED: (
+        _apply_model_target_dataset_removed
+    ),
+    MutationKind.OAUTH2_CLIENT_CREDENTIAL_PUT: (
+        _apply_oauth2_client_credential_put
+    ),
+    MutationKind.OAUTH2_CLIENT_CREDENTIAL_REMOVED: (
+        _apply_oauth2_client_credential_removed
+    ),
+}
+
+
+@internal_beartype
+def _read_records(*, content: bytes) -> list[bytes]:
+    """Split the content of a log into records.
+
+    Args:
+        content: The content of a log.
+
+    Returns:
+        The complete records in the log, oldest first.
+    """
+    records: list[bytes] = []
+    offset = 0
+    while offset + _LENGTH_PREFIX.size <= len(content):
+        (length,) = _LENGTH_PREFIX.unpack_from(content, offset)
+        record_end = offset + _LENGTH_PREFIX.size + length
+        if record_end > len(content):
+            break
+        records.append(content[offset + _LENGTH_PREFIX.size : record_end])
+        offset = record_end
+    return records
+
+
+@internal_beartype
+@dataclass(frozen=True, kw_only=True)
+class _Snapshot:
+    """The state of a target manager after a change.
+
+    The state is never changed, so it can be written to disk while the
+    target manager's lock is not held.
+    """
+
+    sequence: int
+    cloud_databases: tuple[CloudDatabase, ...]
+    vumark_databases: tuple[VuMarkDatabase, ...]
+    model_target_datasets: tuple[ModelTargetDataset, ...]
+    oauth2_client_credentials: tuple[OAuth2ClientCredential, ...]
+
+
+@internal_beartype
+class TargetManagerStore:
+    """A snapshot and a log of changes to a target manager, in a directory.
+
+    The store has no lock of its own. Changes must be recorded while the
+    target manager's lock is held, so that they are logged in the same order
+    as they are made.
+    """
+
+    def __init__(
+        self,
+        *,
+        target_manager: TargetManager,
+        directory: Path,
+        snapshot_interval_changes: int,
+    ) -> None:
+        """
+        Args:
+            target_manager: The target manager whose changes are recorded.
+            directory: The directory to keep the snapshot and the log in. It
+                is created if it does not exist.
+            snapshot_interval_changes: The number of changes to log before
+                the log is compacted into a new snapshot.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        self._directory = directory
+        self._snapshot_path = directory / _SNAPSHOT_FILE_NAME
+        self._log_path = directory / _LOG_FILE_NAME
+        self._snapshot_interval_changes = snapshot_interval_changes
+        self._sequence = 0
+        self._changes_since_snapshot = 0
+        self._target_manager = target_manager
+        self._snapshot_thread: threading.Thread | None = None
+
+    def _set_aside_log_paths(self) -> list[Path]:
+        """Get the logs which were set aside for snapshots, oldest first.
+
+        A log is kept until a snapshot which includes its changes has been
+        written. There is more than one only if writing a snapshot failed.
+        """
+        return sorted(
+            self._directory.glob(
+                pattern=_SET_ASIDE_LOG_FILE_NAME_PREFIX + "*",
+            ),
+            key=lambda path: int(
+                path.name.removeprefix(_SET_ASIDE_LOG_FILE_NAME_PREFIX),
+            ),
+        )
+
+    def load(self) -> None:
+        """Load the stored state into the target manager, and then write a
+        new snapshot of it.
+
+        The target manager must have no state, and must not record its
+        changes to this store until this has returned.
+        """
+        target_manager = self._target_manager
+        snapshot_sequence = 0
+        if self._snapshot_path.exists():
+            reader = BinaryWireReader(content=self._snapshot_path.read_bytes())
+            snapshot = reader.document
+            snapshot_sequence = snapshot["sequence"]
+            for database_dict in snapshot["cloud_databases"]:
+                target_manager.add_cloud_database(
+                    cloud_database=reader.cloud_database_from_dict(
+                        database_dict=database_dict,
+                    ),
+                )
+            for database_dict in snapshot["vumark_databases"]:
+                target_manager.add_vumark_database(
+                    vumark_database=VuMarkDatabase.from_dict(
+                        database_dict=database_dict,
+                    ),
+                )
+            for dataset_dict in snapshot["model_target_datasets"]:
+                target_manager.add_model_target_dataset(
+                    model_target_dataset=ModelTargetDataset.from_dict(
+                        dataset_dict=dataset_dict,
+                    ),
+                )
+            for credential_dict in snapshot["oauth2_client_credentials"]:
+                target_manager.add_oauth2_client_credential(
+                    credential=_oauth2_client_credential_from_dict(
+                        credential_dict=credential_dict,
+                    ),
+                )
+
+        self._sequence = snapshot_sequence
+        self._replay_logs(snapshot_sequence=snapshot_sequence)
+        self._write_snapshot(snapshot=self._snapshot())
+        self._log_path.unlink(missing_ok=True)
+
+    def _replay_logs(self, *, snapshot_sequence: int) -> None:
+        """Apply the logged changes which are not in the loaded snapshot.
+
+        Args:
+            snapshot_sequence: The sequence number of the last change in the
+                loaded snapshot.
+        """
+        target_manager = self._target_manager
+        # Targets which are put into a database are kept until a change of
+        # another kind is replayed, and then the database is replaced once
+        # for all of them, so that replaying does not copy the database's
+        # targets for each target.
+        targets_to_put: dict[str, dict[str, ImageTarget]] = {}
+        for log_path in [*self._set_aside_log_paths(), self._log_path]:
+            log_content = log_path.read_bytes() if log_path.exists() else b""
+            for record in _read_records(content=log_content):
+                reader = BinaryWireReader(content=record)
+                mutation = reader.document
+                # A snapshot may have been written after a record was
+                # logged, but before the log was deleted.
+                if mutation["sequence"] <= snapshot_sequence:
+                    continue
+                kind = MutationKind(mutation["kind"])
+                data = mutation["data"]
+                if kind == MutationKind.TARGET_PUT:
+                    target = reader.target_from_dict(
+                        target_dict=data["target"],
+                    )
+                    database_targets = targets_to_put.setdefault(
+                        data["database_name"],
+                        {},
+                    )
+                    database_targets[target.target_id] = target
+                else:
+                    _put_targets(
+                        target_manager=target_manager,
+                        targets_by_database_name=targets_to_put,
+                    )
+                    targets_to_put = {}
+                    apply_mutation = _MUTATION_APPLIERS[kind]
+                    apply_mutation(
+                        target_manager=target_manager,
+                        data=data,
+                        reader=reader,
+                    )
+                self._sequence = mutation["sequence"]
+        _put_targets(
+            target_manager=target_manager,
+            targets_by_database_name=targets_to_put,
+        )
+
+    def _snapshot(self) -> _Snapshot:
+        """Get the whole state, as of the latest recorded change."""
+        target_manager = self._target_manager
+        return _Snapshot(
+            sequence=self._sequence,
+            cloud_databases=tuple(target_manager.cloud_databases),
+            vumark_databases=tuple(target_manager.vumark_databases),
+            model_target_datasets=tuple(
+                target_manager.model_target_datasets.values(),
+            ),
+            oauth2_client_credentials=tuple(
+                target_manager.oauth2_client_credentials.values(),
+            ),
+        )
+
+    def _write_snapshot(self, *, snapshot: _Snapshot) -> None:
+        """Write the whole state to a new snapshot, and delete the logs which
+        were set aside for it.
+
+        Args:
+            snapshot: The state to write.
+        """
+        wire_writer = BinaryWireWriter()
+        snapshot_document = {
+            "sequence": snapshot.sequence,
+            "cloud_databases": [
+                wire_writer.cloud_database_to_dict(database=database)
+                for database in snapshot.cloud_databases
+            ],
+            "vumark_databases": [
+                database.to_dict() for database in snapshot.vumark_databases
+            ],
+            "model_target_datasets": [
+                dataset.to_dict() for dataset in snapshot.model_target_datasets
+            ],
+            "oauth2_client_credentials": [
+                _oauth2_client_credential_to_dict(credential=credential)
+                for credential in snapshot.oauth2_client_credentials
+            ],
+        }
+
+        # The snapshot is replaced atomically, so that a snapshot which was
+        # cut short is never loaded.
+        temporary_path = self._snapshot_path.with_suffix(suffix=".tmp")
+        with temporary_path.open(mode="wb") as snapshot_file:
+            snapshot_file.write(wire_writer.dumps(document=snapshot_document))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        temporary_path.replace(target=self._snapshot_path)
+        for log_path in self._set_aside_log_paths():
+            last_sequence = int(
+                log_path.name.removeprefix(_SET_ASIDE_LOG_FILE_NAME_PREFIX),
+            )
+            if last_sequence <= snapshot.sequence:
+                log_path.unlink()
+
+    def _start_snapshot(self) -> None:
+        """Set the log aside, and write a snapshot in a background thread.
+
+        Only the references to the state are copied while the target
+        manager's lock is held. The state is never changed, so it is dumped
+        and written to disk after that lock is released.
+        """
+        snapshot = self._snapshot()
+        self._log_path.replace(
+            target=self._directory
+            / f"{_SET_ASIDE_LOG_FILE_NAME_PREFIX}{snapshot.sequence}",
+        )
+        self._changes_since_snapshot = 0
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot,
+            kwargs={"snapshot": snapshot},
+            name="target-manager-snapshot",
+            # Stopping the service while a snapshot is written loses no
+            # changes, as the set aside log is replayed on startup.
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+
+    def wait_for_snapshot(self) -> None:
+        """Wait until any snapshot which is being written in the background
+        has been written.
+        """
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+
+    def _record(
+        self,
+        *,
+        kind: MutationKind,
+        data: object,
+        wire_writer: BinaryWireWriter,
+    ) -> None:
+        """Log a change, and start compacting the log if it is due.
+
+        The change is written to disk before this returns.
+
+        Args:
+            kind: The kind of change.
+            data: The data to record with the change, which can be dumped
+                by the given writer.
+            wire_writer: The writer which dumped any targets in the data.
+        """
+        self._sequence += 1
+        record = wire_writer.dumps(
+            document={
+                "sequence": self._sequence,
+                "kind": kind.value,
+                "data": data,
+            },
+        )
+        with self._log_path.open(mode="ab") as log_file:
+            log_file.write(_LENGTH_PREFIX.pack(len(record)) + record)
+            log_file.flush()
+            os.fsync(log_file.fileno())
+
+        self._changes_since_snapshot += 1
+        snapshot_due = (
+            self._changes_since_snapshot >= self._snapshot_interval_changes
+        )
+        # If a snapshot is still being written, the log is compacted after
+        # the next change once it has been written.
+        snapshot_in_progress = (
+            self._snapshot_thread is not None
+            and self._snapshot_thread.is_alive()
+        )
+        if snapshot_due and not snapshot_in_progress:
+            self._start_snapshot()
+
+    def record_cloud_database_added(self, *, database: CloudDatabase) -> None:
+        """Record that a cloud database was added.
+
+        Args:
+            database: The added database.
+        """
+        wire_writer = BinaryWireWriter()
+        self._record(
+            kind=MutationKind.CLOUD_DATABASE_ADDED,
+            data=wire_writer.cloud_database_to_dict(database=database),
+            wire_writer=wire_writer,
+        )
+
+    def record_cloud_database_removed(self, *, database_name: str) -> None:
+        """Record that a cloud database was removed.
+
+        Args:
+            database_name: The name of the removed database.
+        """
+        self._record(
+            kind=MutationKind.CLOUD_DATABASE_REMOVED,
+            data=database_name,
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_target_put(
+        self,
+        *,
+        database_name: str,
+        target: ImageTarget,
+    ) -> None:
+        """Record that a target was added to a database, or replaced in it.
+
+        Args:
+            database_name: The name of the database which has the target.
+            target: The new or changed target.
+        """
+        wire_writer = BinaryWireWriter()
+        self._record(
+            kind=MutationKind.TARGET_PUT,
+            data={
+                "database_name": database_name,
+                "target": wire_writer.target_to_dict(target=target),
+            },
+            wire_writer=wire_writer,
+        )
+
+    def record_vumark_database_added(
+        self,
+        *,
+        database: VuMarkDatabase,
+    ) -> None:
+        """Record that a VuMark database was added.
+
+        Args:
+            database: The added database.
+        """
+        self._record(
+            kind=MutationKind.VUMARK_DATABASE_ADDED,
+            data=database.to_dict(),
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_vumark_database_removed(self, *, database_name: str) -> None:
+        """Record that a VuMark database was removed.
+
+        Args:
+            database_name: The name of the removed database.
+        """
+        self._record(
+            kind=MutationKind.VUMARK_DATABASE_REMOVED,
+            data=database_name,
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_vumark_target_added(
+        self,
+        *,
+        database_name: str,
+        target: VuMarkTarget,
+    ) -> None:
+        """Record that a VuMark target was added to a database.
+
+        Args:
+            database_name: The name of the database which has the target.
+            target: The added target.
+        """
+        self._record(
+            kind=MutationKind.VUMARK_TARGET_ADDED,
+            data={"database_name": database_name, "target": target.to_dict()},
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_model_target_dataset_added(
+        self,
+        *,
+        dataset: ModelTargetDataset,
+    ) -> None:
+        """Record that a Model Target dataset was added.
+
+        Args:
+            dataset: The added dataset.
+        """
+        self._record(
+            kind=MutationKind.MODEL_TARGET_DATASET_ADDED,
+            data=dataset.to_dict(),
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_model_target_dataset_removed(
+        self, *, dataset_uuid: str
+    ) -> None:
+        """Record that a Model Target dataset was removed.
+
+        Args:
+            dataset_uuid: The UUID of the removed dataset.
+        """
+        self._record(
+            kind=MutationKind.MODEL_TARGET_DATASET_REMOVED,
+            data=dataset_uuid,
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_oauth2_client_credential_put(
+        self,
+        *,
+        credential: OAuth2ClientCredential,
+    ) -> None:
+        """Record that an OAuth2 client credential was added or replaced.
+
+        Args:
+            credential: The new credential.
+        """
+        self._record(
+            kind=MutationKind.OAUTH2_CLIENT_CREDENTIAL_PUT,
+            data=_oauth2_client_credential_to_dict(credential=credential),
+            wire_writer=BinaryWireWriter(),
+        )
+
+    def record_oauth2_client_credential_removed(
+        self, *, client_id: str
+    ) -> None:
+        """Record that an OAuth2 client credential was removed.
+
+        Args:
+            client_id: The client ID of the removed credential.
+        """
+        self._record(
+            kind=MutationKind.OAUTH2_CLIENT_CREDENTIAL_REMOVED,
+            data=client_id,
+            wire_writer=BinaryWireWriter(),
+        )
@@ -0,0 +1,557 @@
+"""Replication of cloud databases from the target manager service.
+
+The target manager service records every change to its cloud databases in a
+journal. The VWS and VWQ applications keep a replica of the cloud databases
+and ask the target manager only for the changes since the version which they
+last saw, rather than for every database on every request.
+"""
+
+import copy
+import threading
+import uuid
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from http import HTTPMethod
+from typing import TypedDict
+
+from mock_vws._flask_server.target_manager_client import (
+    ASYNC_TARGET_MANAGER_CLIENT,
+    TARGET_MANAGER_CLIENT,
+)
+from mock_vws._flask_server.wire_format import (
+    BINARY_MEDIA_TYPE,
+    WireReader,
+    WireWriter,
+    wire_reader,
+)
+from mock_vws._type_checks import internal_beartype
+from mock_vws.database import CloudDatabase, CloudDatabaseDict
+from mock_vws.target import ImageTarget, ImageTargetDict
+
+
+@internal_beartype
+class ChangeKind(StrEnum):
+    """The kinds of change which the journal records."""
+
+    CLOUD_DATABASE_ADDED = auto()
+    CLOUD_DATABASE_REMOVED = auto()
+    TARGET_PUT = auto()
+
+
+class ChangeDict(TypedDict):
+    """A dictionary type which represents a change to cloud databases."""
+
+    version: int
+    kind: str
+    database_name: str
+    database: CloudDatabaseDict | None
+    target: ImageTargetDict | None
+
+
+class ChangesResponseDict(TypedDict):
+    """A dictionary type which represents a response from the change
+    feed.
+
+    ``databases`` is given, and ``changes`` is empty, when the requester
+    cannot catch up from the journal and must instead replace its replica.
+    """
+
+    journal_id: str
+    version: int
+    databases: list[CloudDatabaseDict] | None
+    changes: list[ChangeDict]
+
+
+@internal_beartype
+@dataclass(frozen=True, kw_only=True)
+class _Change:
+    """A change to the cloud databases of a target manager.
+
+    Args:
+        version: The version of the target manager state which this change
+            created.
+        kind: The kind of change.
+        database_name: The name of the changed database.
+        database: The added database, for an added database.
+        target: The new or changed target, for a changed target.
+    """
+
+    version: int
+    kind: ChangeKind
+    database_name: str
+    database: CloudDatabase | None = None
+    target: ImageTarget | None = None
+
+    def to_dict(self, *, wire_writer: WireWriter) -> ChangeDict:
+        """Dump a change to a dictionary which can be loaded as JSON.
+
+        Args:
+            wire_writer: The writer of the body which includes the change.
+        """
+        return {
+            "version": self.version,
+            "kind": self.kind.value,
+            "database_name": self.database_name,
+            "database": (
+                None
+                if self.database is None
+                else wire_writer.cloud_database_to_dict(database=self.database)
+            ),
+            "target": (
+                None
+                if self.target is None
+                else wire_writer.target_to_dict(target=self.target)
+            ),
+        }
+
+
+@internal_beartype
+class CloudDatabaseChangeJournal:
+    """A bounded, ordered record of changes to cloud databases.
+
+    The journal has no lock of its own. Changes must be recorded while the
+    state which they describe is guarded, so that versions are given out in
+    the same order as the changes are made.
+    """
+
+    def __init__(self, *, max_changes: int) -> None:
+        """
+        Args:
+            max_changes: The number of changes to keep. A replica which is
+                further behind than this is sent every database instead.
+        """
+        # The journal ID changes whenever the journal is created, for example
+        # when the target manager service restarts, so that replicas of the
+        # previous state are not updated with unrelated changes.
+        self._journal_id = uuid.uuid4().hex
+        self._version = 0
+        self._changes: deque[_Change] = deque(maxlen=max_changes)
+
+    @property
+    def journal_id(self) -> str:
+        """The identifier of this journal."""
+        return self._journal_id
+
+    @property
+    def version(self) -> int:
+        """The version of the latest recorded change."""
+        return self._version
+
+    def _record(
+        self,
+        *,
+        kind: ChangeKind,
+        database_name: str,
+        database: CloudDatabase | None = None,
+        target: ImageTarget | None = None,
+    ) -> None:
+        """Record a change with the next version."""
+        self._version += 1
+        self._changes.append(
+            _Change(
+                version=self._version,
+                kind=kind,
+                database_name=database_name,
+                database=database,
+                target=target,
+            ),
+        )
+
+    def record_cloud_database_added(self, *, database: CloudDatabase) -> None:
+        """Record that a cloud database was added.
+
+        Args:
+            database: The added database.
+        """
+        # The targets of a database change after it is added, and those
+        # changes are recorded separately, so the database is recorded with
+        # the targets which it has now.
+        snapshot: CloudDatabase = copy.replace(
+            database,  # pyrefly: ignore[bad-argument-type]
+            targets=set(database.targets),
+        )
+        self._record(
+            kind=ChangeKind.CLOUD_DATABASE_ADDED,
+            database_name=database.database_name,
+            database=snapshot,
+        )
+
+    def record_cloud_database_removed(self, *, database_name: str) -> None:
+        """Record that a cloud database was removed.
+
+        Args:
+            database_name: The name of the removed database.
+        """
+        self._record(
+            kind=ChangeKind.CLOUD_DATABASE_REMOVED,
+            database_name=database_name,
+        )
+
+    def record_target_put(
+        self,
+        *,
+        database_name: str,
+        target: ImageTarget,
+    ) -> None:
+        """Record that a target was added to a database, or replaced in it.
+
+        Args:
+            database_name: The name of the database which has the target.
+            target: The new or changed target.
+        """
+        self._record(
+            kind=ChangeKind.TARGET_PUT,
+            database_name=database_name,
+            target=target,
+        )
+
+    def changes_since(self, *, version: int) -> list[_Change] | None:
+        """Return the changes made after a given version.
+
+        Args:
+            version: The version which a replica has.
+
+        Returns:
+            The changes made after the given version, oldest first, or
+            ``None`` if the journal no longer has all of those changes.
+        """
+        if version > self._version:
+            return None
+        if not self._changes:
+            return [] if version == self._version else None
+        oldest_version = self._changes[0].version
+        if version < oldest_version - 1:
+            return None
+        return [change for change in self._changes if change.version > version]
+
+
+@internal_beartype
+@dataclass(frozen=True, kw_only=True)
+class ChangesSnapshot:
+    """What a replica needs to catch up with the state at one version.
+
+    Args:
+        journal_id: The ID of the journal.
+        version: The version of the latest change.
+        databases: Every cloud database, when the replica cannot catch up
+            from the changes which are kept, otherwise ``None``.
+        changes: The changes after the replica's version, oldest first.
+    """
+
+    journal_id: str
+    version: int
+    databases: tuple[CloudDatabase, ...] | None
+    changes: tuple[_Change, ...]
+
+
+@internal_beartype
+def changes_snapshot(
+    *,
+    journal: CloudDatabaseChangeJournal,
+    journal_id: str,
+    since: int,
+    databases: Iterable[CloudDatabase],
+) -> ChangesSnapshot:
+    """Get what a replica needs to catch up with the current state.
+
+    This must be called while the state which the journal describes is
+    guarded. The databases and changes which it gives are never changed,
+    so they can be dumped by :func:`changes_response` after that guard is
+    released.
+
+    Args:
+        journal: The journal of changes to the given databases.
+        journal_id: The journal ID which the replica has.
+        since: The version which the replica has.
+        databases: All current cloud databases.
+
+    Returns:
+        The changes since the replica's version, or every database if the
+        replica cannot catch up from the journal.
+    """
+    changes = (
+        journal.changes_since(version=since)
+        if journal_id == journal.journal_id
+        else None
+    )
+    if changes is None:
+        return ChangesSnapshot(
+            journal_id=journal.journal_id,
+            version=journal.version,
+            databases=tuple(databases),
+            changes=(),
+        )
+    return ChangesSnapshot(
+        journal_id=journal.journal_id,
+        version=journal.version,
+        databases=None,
+        changes=tuple(changes),
+    )
+
+
+@internal_beartype
+def changes_response(
+    *,
+    snapshot: ChangesSnapshot,
+    wire_writer: WireWriter,
+) -> ChangesResponseDict:
+    """Describe how a replica can catch up with the state at one version.
+
+    Args:
+        snapshot: What the replica needs to catch up.
+        wire_writer: The writer of the body which includes the response.
+
+    Returns:
+        A response which can be dumped by the given writer.
+    """
+    return {
+        "journal_id": snapshot.journal_id,
+        "version": snapshot.version,
+        "databases": (
+            None
+            if snapshot.databases is None
+            else [
+                wire_writer.cloud_database_to_dict(database=database)
+                for database in snapshot.databases
+            ]
+        ),
+        "changes": [
+            change.to_dict(wire_writer=wire_writer)
+            for change in snapshot.changes
+        ],
+    }
+
+
+@internal_beartype
+class CloudDatabaseReplica:
+    """A copy of the cloud databases in a target manager service.
+
+    The databases which this gives out are never changed, so they can be
+    read by many threads at once. Changes replace a whole database object.
+
+    The databases of a target manager which is served in this process are
+    not copied, as they are also never changed.
+    """
+
+    def __init__(self) -> None:
+        """Create a replica which has no databases yet."""
+        self._lock = threading.Lock()
+        self._base_url: str | None = None
+        self._journal_id = ""
+        self._version = 0
+        self._databases: dict[str, CloudDatabase] = {}
+
+    def _start_catching_up(self, *, base_url: str) -> dict[str, str]:
+        """Get the query parameters for a request to the change feed.
+
+        Args:
+            base_url: The base URL of the target manager service.
+
+        Returns:
+            The query parameters which describe the version of this replica.
+        """
+        with self._lock:
+            if base_url != self._base_url:
+                self._base_url = base_url
+                self._journal_id = ""
+                self._version = 0
+                self._databases = {}
+            return {
+                "journal_id": self._journal_id,
+                "since": str(object=self._version),
+            }
+
+    def _finish_catching_up(
+        self,
+        *,
+        base_url: str,
+        content: bytes,
+        content_type: str,
+    ) -> AbstractSet[CloudDatabase]:
+        """Apply a response from the change feed.
+
+        Args:
+            base_url: The base URL of the target manager service.
+            content: The body of the response.
+            content_type: The ``Content-Type`` header of the response.
+
+        Returns:
+            All cloud databases in the target manager service.
+        """
+        reader = wire_reader(content=content, content_type=content_type)
+        with self._lock:
+            if base_url == self._base_url:
+                self._apply(reader=reader)
+            return frozenset(self._databases.values())
+
+    def cloud_databases(self, *, base_url: str) -> AbstractSet[CloudDatabase]:
+        """Catch up with a target manager and return its cloud databases.
+
+        Args:
+            base_url: The base URL of the target manager service.
+
+        Returns:
+            All cloud databases in the target manager service.
+        """
+        target_manager = TARGET_MANAGER_CLIENT.in_process_target_manager(
+            base_url=base_url,
+        )
+        if target_manager is not None:
+            return target_manager.cloud_databases
+        params = self._start_catching_up(base_url=base_url)
+        # The request is made without holding the lock so that concurrent
+        # requests do not wait for each other. A response which arrives after
+        # another thread has caught up further is applied only as far as it
+        # is newer.
+        response = TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.GET,
+            url=f"{base_url}/cloud_database_changes",
+            params=params,
+            headers={"Accept": BINARY_MEDIA_TYPE},
+        )
+        return self._finish_catching_up(
+            base_url=base_url,
+            content=response.content,
+            content_type=response.headers.get("Content-Type", ""),
+        )
+
+    async def cloud_databases_async(
+        self,
+        *,
+        base_url: str,
+    ) -> AbstractSet[CloudDatabase]:
+        """Catch up with a target manager and return its cloud databases,
+        without blocking the running event loop on the request.
+
+        Args:
+            base_url: The base URL of the target manager service.
+
+        Returns:
+            All cloud databases in the target manager service.
+        """
+        target_manager = TARGET_MANAGER_CLIENT.in_process_target_manager(
+            base_url=base_url,
+        )
+        if target_manager is not None:
+            return target_manager.cloud_databases
+        params = self._start_catching_up(base_url=base_url)
+        response = await ASYNC_TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.GET,
+            url=f"{base_url}/cloud_database_changes",
+            params=params,
+            headers={"Accept": BINARY_MEDIA_TYPE},
+        )
+        return self._finish_catching_up(
+            base_url=base_url,
+            content=response.content,
+            content_type=response.headers.get("Content-Type", ""),
+        )
+
+    def _apply(self, *, reader: WireReader) -> None:
+        """Apply a response from the change feed.
+
+        Args:
+            reader: A reader of the response to apply.
+        """
+        changes_response_dict: ChangesResponseDict = reader.document
+        new_journal_id = changes_response_dict["journal_id"]
+        new_version = changes_response_dict["version"]
+        database_dicts = changes_response_dict["databases"]
+        if database_dicts is not None:
+            if (
+                new_journal_id == self._journal_id
+                and new_version <= self._version
+            ):
+                return
+            databases = (
+                reader.cloud_database_from_dict(database_dict=database_dict)
+                for database_dict in database_dicts
+            )
+            self._databases = {
+                database.database_name: database for database in databases
+            }
+        elif new_journal_id == self._journal_id:
+            self._apply_changes(
+                reader=reader,
+                changes=[
+                    change
+                    for change in changes_response_dict["changes"]
+                    if change["version"] > self._version
+                ],
+            )
+        else:
+            return
+
+        self._journal_id = new_journal_id
+        self._version = max(self._version, new_version)
+
+    def _apply_changes(
+        self,
+        *,
+        reader: WireReader,
+        changes: Iterable[ChangeDict],
+    ) -> None:
+        """Apply changes, in order, to the databases in this replica.
+
+        Each changed database is replaced with a new database object, once,
+        however many of its targets changed.
+
+        Args:
+            reader: A reader of the response which includes the changes.
+            changes: The changes to apply.
+        """
+        # A database which is removed by the changes is given as ``None``.
+        changed: dict[
+            str,
+            tuple[CloudDatabase, dict[str, ImageTarget]] | None,
+        ] = {}
+        for change in changes:
+            database_name = change["database_name"]
+            database_dict = change["database"]
+            target_dict = change["target"]
+            if database_dict is not None:
+                database = reader.cloud_database_from_dict(
+                    database_dict=database_dict,
+                )
+                changed[database_name] = (
+                    database,
+                    {target.target_id: target for target in database.targets},
+                )
+            elif target_dict is None:
+                changed[database_name] = None
+            else:
+                if database_name not in changed:
+                    existing = self._databases.get(database_name)
+                    changed[database_name] = (
+                        None
+                        if existing is None
+                        else (
+                            existing,
+                            {
+                                target.target_id: target
+                                for target in existing.targets
+                            },
+                        )
+                    )
+                changed_database = changed[database_name]
+                # A change to a database which this replica does not have is
+                # for a database which has since been removed.
+                if changed_database is None:
+                    continue
+                target = reader.target_from_dict(target_dict=target_dict)
+                _, targets = changed_database
+                targets[target.target_id] = target
+
+        for database_name, changed_database in changed.items():
+            if changed_database is None:
+                self._databases.pop(database_name, None)
+                continue
+            database, targets = changed_database
+            new_database: CloudDatabase = copy.replace(
+                database,  # pyrefly: ignore[bad-argument-type]
+                targets=set(targets.values()),
+            )
+            self._databases[database_name] = new_database
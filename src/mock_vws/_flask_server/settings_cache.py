@@ -0,0 +1,148 @@
+"""A cache of the settings of a Flask application.
+
+Reading settings from environment variables with ``pydantic-settings`` is
+slow compared with handling a simple request, and the settings are needed
+several times for each request. A cache reads them once, and then only again
+when one of the environment variables which they are read from changes.
+
+The environment of a running process cannot be changed from outside it, so
+in the Docker containers the settings are read once for each worker process.
+Gunicorn's own reload, on ``SIGHUP``, starts new worker processes which read
+the settings again. Tests change the environment in the process which serves
+the applications, and the cache notices those changes.
+"""
+
+import os
+import threading
+
+from pydantic_settings import BaseSettings
+
+from mock_vws._type_checks import internal_beartype
+
+# The names and values of the environment variables which settings are read
+# from, sorted by name.
+type _Environment = tuple[tuple[str, str], ...]
+
+
+@internal_beartype
+def _environment_variable_names(
+    *,
+    settings_class: type[BaseSettings],
+) -> frozenset[str]:
+    """Get the names of the environment variables which settings are read
+    from, as ``pydantic-settings`` finds them.
+
+    A field is read from its validation aliases if it has any, and otherwise
+    from its name with the configured prefix. Names are lower case unless
+    the settings are case sensitive.
+    """
+    env_prefix = settings_class.model_config.get("env_prefix", "")
+    names: set[str] = set()
+    for field_name, field_info in settings_class.model_fields.items():
+        alias = field_info.validation_alias or field_info.alias
+        if alias is None:
+            names.add(env_prefix + field_name)
+            continue
+        alias_paths = (
+            [[alias]] if isinstance(alias, str) else alias.convert_to_aliases()
+        )
+        # Only the first item of a path is an environment variable.
+        names.update(str(object=alias_path[0]) for alias_path in alias_paths)
+    if settings_class.model_config.get("case_sensitive", False):
+        return frozenset(names)
+    return frozenset(name.lower() for name in names)
+
+
+@internal_beartype
+class SettingsCache[SettingsT: BaseSettings]:
+    """A cache of settings which are read from environment variables.
+
+    The environment variables which are watched for changes are found as
+    ``pydantic-settings`` finds them, using the configured prefix, case
+    sensitivity and aliases, and any nested delimiter.
+    """
+
+    def __init__(self, *, settings_class: type[SettingsT]) -> None:
+        """Create a cache which has not read the settings yet.
+
+        Args:
+            settings_class: The class of the settings to read. This should
+                be frozen, so that the settings which are shared between
+                requests cannot be changed by one of them.
+        """
+        self._settings_class = settings_class
+        self._case_sensitive = settings_class.model_config.get(
+            "case_sensitive",
+            False,
+        )
+        self._environment_variable_names = _environment_variable_names(
+            settings_class=settings_class,
+        )
+        # With a nested delimiter, a field is also read from environment
+        # variables whose names start with its name and the delimiter.
+        nested_delimiter = settings_class.model_config.get(
+            "env_nested_delimiter",
+        )
+        self._environment_variable_prefixes = (
+            ()
+            if not nested_delimiter
+            else tuple(
+                name + nested_delimiter
+                for name in self._environment_variable_names
+            )
+        )
+        self._lock = threading.Lock()
+        self._cached: tuple[_Environment, SettingsT] | None = None
+
+    def _is_read(self, *, environment_variable_name: str) -> bool:
+        """Whether the settings are read from an environment variable."""
+        name = (
+            environment_variable_name
+            if self._case_sensitive
+            else environment_variable_name.lower()
+        )
+        return name in self._environment_variable_names or name.startswith(
+            self._environment_variable_prefixes,
+        )
+
+    def _environment(self) -> _Environment:
+        """Get the environment variables which the settings are read from.
+
+        Every environment variable is checked, as names which differ only in
+        case can match a field when the settings are not case sensitive.
+        """
+        return tuple(
+            sorted(
+                (name, value)
+                for name, value in os.environ.items()
+                if self._is_read(environment_variable_name=name)
+            ),
+        )
+
+    def _read(self) -> SettingsT:
+        """Read the settings, and replace the cached settings.
+
+        Returns:
+            The new settings.
+        """
+        with self._lock:
+            environment = self._environment()
+            settings = self._settings_class.model_validate(obj={})
+            # The settings and the environment which they were read from are
+            # replaced together, in one assignment.
+            self._cached = (environment, settings)
+        return settings
+
+    def get(self) -> SettingsT:
+        """Get the settings, reading them again only if the environment
+        variables which they are read from have changed.
+
+        Returns:
+            The current settings.
+        """
+        cached = self._cached
+        if cached is not None:
+            cached_environment, cached_settings = cached
+            if cached_environment == self._environment():
+                return cached_settings
+        return self._read()
@@ -3,20 +3,46 @@
 import base64
 import copy
 import datetime
+import functools
 import json
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from collections.abc import Set as AbstractSet
+from contextlib import AbstractContextManager
 from enum import StrEnum, auto
 from http import HTTPMethod, HTTPStatus
-from typing import assert_never
+from pathlib import Path
+from typing import assert_never, override
 from zoneinfo import ZoneInfo
 
-from beartype import beartype
+from beartype.roar import BeartypeCallHintViolation
 from flask import Flask, Response, request
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from mock_vws._flask_server.persistence import TargetManagerStore
+from mock_vws._flask_server.replication import (
+    CloudDatabaseChangeJournal,
+    changes_response,
+    changes_snapshot,
+)
+from mock_vws._flask_server.settings_cache import SettingsCache
+from mock_vws._flask_server.wire_format import (
+    BINARY_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    BinaryWireWriter,
+    JSONWireWriter,
+    WireWriter,
+    wire_reader,
+)
+from mock_vws._services_validators.exceptions import TooManyRequestsError
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase, VuMarkDatabase
 from mock_vws.database_type import DatabaseType
 from mock_vws.model_target import ModelTargetDataset, OAuth2ClientCredential
-from mock_vws.request_rate_limits import RequestRateLimits
+from mock_vws.request_rate_limits import (
+    RateLimitedEndpoint,
+    RequestRateLimits,
+)
 from mock_vws.states import States
 from mock_vws.target import ImageTarget, VuMarkTarget
 from mock_vws.target_manager import TargetManager
@@ -29,10 +55,400 @@ from mock_vws.target_raters import (
 
 TARGET_MANAGER_FLASK_APP = Flask(import_name=__name__, static_folder=None)
 
-TARGET_MANAGER = TargetManager()
+# The number of changes which the target manager keeps so that replicas can
+# catch up with them. A replica which is further behind than this is sent
+# every database instead.
+_MAX_JOURNAL_CHANGES = 10_000
+
+# Databases are imported and exported as newline-delimited JSON, so that they
+# are processed one target at a time rather than as one document.
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@internal_beartype
+class _JournaledTargetManager(TargetManager):
+    """A target manager which records changes to its cloud databases.
+
+    The VWS and VWQ applications keep replicas of the cloud databases, and
+    catch up with these changes rather than fetching every database.
+
+    When a store is given with :meth:`persist`, every change to the state is
+    also recorded in that store.
+
+    Databases in this target manager are not changed once they are added.
+    A change to the targets of a database replaces the database with a new
+    version, so that the databases can be read while holding the lock only
+    for long enough to get them.
+    Targets which are put into a cloud database are kept, keyed by target
+    ID, until that database is next read. The new version of the database is
+    made then, once for all of those targets, so putting a target takes
+    constant time however many targets the database has.
+    Each database also has its own lock, which is held while a change to
+    that database is made which depends on what was read from it. A
+    database's lock must not be taken while holding the lock of this target
+    manager.
+    """
+
+    def __init__(self) -> None:
+        """Create a target manager with no databases."""
+        super().__init__()
+        self._cloud_database_journal = CloudDatabaseChangeJournal(
+            max_changes=_MAX_JOURNAL_CHANGES,
+        )
+        self._store: TargetManagerStore | None = None
+        self._database_locks: dict[str, AbstractContextManager[bool]] = {}
+        # Targets which have been put into each cloud database, but which
+        # are not yet in the published version of that database.
+        self._pending_targets: dict[str, dict[str, ImageTarget]] = {}
+
+    def persist(self, *, store: TargetManagerStore) -> None:
+        """Load the state in a store, and record every later change to it.
+
+        This must be called before this target manager is shared between
+        threads.
+
+        Args:
+            store: A store of the state of this target manager.
+        """
+        store.load()
+        self._store = store
+
+    @property
+    def cloud_database_journal(self) -> CloudDatabaseChangeJournal:
+        """The journal of changes to the cloud databases."""
+        return self._cloud_database_journal
+
+    def database_lock(
+        self,
+        *,
+        database_name: str,
+    ) -> AbstractContextManager[bool]:
+        """Get the lock which is held while a new version of a database is
+        made.
+
+        Hold this lock while reading a database to make a new version of it,
+        so that no other change to that database is lost.
+
+        Args:
+            database_name: The name of a cloud or VuMark database.
+
+        Returns:
+            A re-entrant lock for the database.
+
+        Raises:
+            KeyError: There is no database with the given name.
+        """
+        with self.lock:
+            return self._database_locks[database_name]
+
+    def _publish_pending_targets(self, *, database_name: str) -> None:
+        """Publish a new version of a cloud database which has the targets
+        which have been put into it since it was last published.
+
+        Args:
+            database_name: The name of the cloud database.
+        """
+        if database_name not in self._pending_targets:
+            return
+        with self.lock:
+            pending_targets = self._pending_targets.pop(database_name, None)
+            if pending_targets is None:
+                return
+            database = super().get_cloud_database(database_name=database_name)
+            targets = {
+                existing_target
+                for existing_target in database.targets
+                if existing_target.target_id not in pending_targets
+            }
+            targets.update(pending_targets.values())
+            new_database: CloudDatabase = copy.replace(
+                database,  # pyrefly: ignore[bad-argument-type]
+                targets=targets,
+            )
+            self.replace_cloud_database(cloud_database=new_database)
+
+    @property
+    @override
+    def cloud_databases(self) -> AbstractSet[CloudDatabase]:
+        """All cloud databases, with every target which has been put into
+        them.
+        """
+        for database_name in list(self._pending_targets):
+            self._publish_pending_targets(database_name=database_name)
+        return super().cloud_databases
+
+    @override
+    def get_cloud_database(self, database_name: str) -> CloudDatabase:
+        """Get the cloud database with the given name, with every target
+        which has been put into it.
+
+        Raises:
+            KeyError: There is no cloud database with the given name.
+        """
+        self._publish_pending_targets(database_name=database_name)
+        return super().get_cloud_database(database_name=database_name)
+
+    @override
+    def get_cloud_database_by_server_access_key(
+        self,
+        server_access_key: str,
+        *,
+        include_pending_targets: bool = True,
+    ) -> CloudDatabase:
+        """Get the cloud database with the given server access key.
+
+        Args:
+            server_access_key: The server access key of the cloud database.
+            include_pending_targets: Whether the database must have every
+                target which has been put into it. Set this to ``False``
+                when the targets are not needed, so that no new version of
+                the database is made.
+
+        Raises:
+            KeyError: There is no cloud database with the given server access
+                key.
+        """
+        database = super().get_cloud_database_by_server_access_key(
+            server_access_key=server_access_key,
+        )
+        if not include_pending_targets:
+            return database
+        return self.get_cloud_database(database_name=database.database_name)
+
+    @override
+    def get_cloud_database_by_client_access_key(
+        self,
+        client_access_key: str,
+    ) -> CloudDatabase:
+        """Get the cloud database with the given client access key, with
+        every target which has been put into it.
+
+        Raises:
+            KeyError: There is no cloud database with the given client access
+                key.
+        """
+        database = super().get_cloud_database_by_client_access_key(
+            client_access_key=client_access_key,
+        )
+        return self.get_cloud_database(database_name=database.database_name)
+
+    def add_cloud_database(self, cloud_database: CloudDatabase) -> None:
+        """Add a cloud database and record the change.
+
+        Args:
+            cloud_database: The cloud database to add.
+
+        Raises:
+            ValueError: One of the given cloud database keys matches a key for
+                an existing cloud database.
+        """
+        with self.lock:
+            super().add_cloud_database(cloud_database=cloud_database)
+            self._database_locks[cloud_database.database_name] = (
+                threading.RLock()
+            )
+            self._cloud_database_journal.record_cloud_database_added(
+                database=cloud_database,
+            )
+            if self._store is not None:
+                self._store.record_cloud_database_added(
+                    database=cloud_database,
+                )
+
+    def remove_cloud_database(self, cloud_database: CloudDatabase) -> None:
+        """Remove a cloud database and record the change.
+
+        Args:
+            cloud_database: The cloud database to remove.
+        """
+        database_name = cloud_database.database_name
+        try:
+            database_lock = self.database_lock(database_name=database_name)
+        except KeyError:
+            return
+        with database_lock, self.lock:
+            # The database may have been removed while waiting for its lock.
+            if self._database_locks.get(database_name) is not database_lock:
+                return
+            super().remove_cloud_database(cloud_database=cloud_database)
+            del self._database_locks[database_name]
+            self._pending_targets.pop(database_name, None)
+            self._cloud_database_journal.record_cloud_database_removed(
+                database_name=database_name,
+            )
+            if self._store is not None:
+                self._store.record_cloud_database_removed(
+                    database_name=database_name,
+                )
+
+    def _add_pending_targets(
+        self,
+        *,
+        database_name: str,
+        targets: Iterable[ImageTarget],
+    ) -> None:
+        """Keep targets to be published in a cloud database when it is next
+        read, and record the change in the journal.
+
+        This must be called while holding the lock of this target manager.
+
+        Raises:
+            KeyError: There is no cloud database with the given name.
+        """
+        # This raises a ``KeyError`` if there is no such cloud database.
+        super().get_cloud_database(database_name=database_name)
+        pending_targets = self._pending_targets.setdefault(database_name, {})
+        for target in targets:
+            pending_targets[target.target_id] = target
+            self._cloud_database_journal.record_target_put(
+                database_name=database_name,
+                target=target,
+            )
+
+    def put_target(self, *, database_name: str, target: ImageTarget) -> None:
+        """Add a target to a cloud database, or replace the target with the
+        same ID, and record the change.
+
+        This takes constant time, however many targets the database has.
 
+        Args:
+            database_name: The name of the cloud database.
+            target: The new or changed target.
 
-@beartype
+        Raises:
+            KeyError: There is no cloud database with the given name.
+        """
+        with self.lock:
+            self._add_pending_targets(
+                database_name=database_name,
+                targets=[target],
+            )
+            if self._store is not None:
+                self._store.record_target_put(
+                    database_name=database_name,
+                    target=target,
+                )
+
+    def add_vumark_database(self, vumark_database: VuMarkDatabase) -> None:
+        """Add a VuMark database and record the change.
+
+        Args:
+            vumark_database: The VuMark database to add.
+
+        Raises:
+            ValueError: One of the given database keys matches a key for
+                an existing database.
+        """
+        with self.lock:
+            super().add_vumark_database(vumark_database=vumark_database)
+            self._database_locks[vumark_database.database_name] = (
+                threading.RLock()
+            )
+            if self._store is not None:
+                self._store.record_vumark_database_added(
+                    database=vumark_database,
+                )
+
+    def remove_vumark_database(self, vumark_database: VuMarkDatabase) -> None:
+        """Remove a VuMark database and record the change.
+
+        Args:
+            vumark_database: The VuMark database to remove.
+        """
+        database_name = vumark_database.database_name
+        try:
+            database_lock = self.database_lock(database_name=database_name)
+        except KeyError:
+            return
+        with database_lock, self.lock:
+            # The database may have been removed while waiting for its lock.
+            if self._database_locks.get(database_name) is not database_lock:
+                return
+            super().remove_vumark_database(vumark_database=vumark_database)
+            del self._database_locks[database_name]
+            if self._store is not None:
+                self._store.record_vumark_database_removed(
+                    database_name=database_name,
+                )
+
+    def add_vumark_target(
+        self,
+        *,
+        database_name: str,
+        target: VuMarkTarget,
+    ) -> None:
+        """Add a VuMark target to a VuMark database, and record the change.
+
+        Args:
+            database_name: The name of the VuMark database.
+            target: The new target.
+
+        Raises:
+            KeyError: There is no VuMark database with the given name.
+        """
+        with self.database_lock(database_name=database_name):
+            database = self.get_vumark_database(database_name=database_name)
+            new_database: VuMarkDatabase = copy.replace(
+                database,  # pyrefly: ignore[bad-argument-type]
+                vumark_targets={*database.vumark_targets, target},
+            )
+            with self.lock:
+                self.replace_vumark_database(vumark_database=new_database)
+                if self._store is not None:
+                    self._store.record_vumark_target_added(
+                        database_name=database_name,
+                        target=target,
+                    )
+
+    def add_model_target_dataset(
+        self,
+        model_target_dataset: ModelTargetDataset,
+    ) -> None:
+        """Add a Model Target dataset and record the change."""
+        with self.lock:
+            super().add_model_target_dataset(
+                model_target_dataset=model_target_dataset,
+            )
+            if self._store is not None:
+                self._store.record_model_target_dataset_added(
+                    dataset=model_target_dataset,
+                )
+
+    def remove_model_target_dataset(self, dataset_uuid: str) -> None:
+        """Remove a Model Target dataset and record the change."""
+        with self.lock:
+            super().remove_model_target_dataset(dataset_uuid=dataset_uuid)
+            if self._store is not None:
+                self._store.record_model_target_dataset_removed(
+                    dataset_uuid=dataset_uuid,
+                )
+
+    def add_oauth2_client_credential(
+        self,
+        credential: OAuth2ClientCredential,
+    ) -> None:
+        """Add an OAuth2 client credential and record the change."""
+        with self.lock:
+            super().add_oauth2_client_credential(credential=credential)
+            if self._store is not None:
+                self._store.record_oauth2_client_credential_put(
+                    credential=credential,
+                )
+
+    def remove_oauth2_client_credential(self, client_id: str) -> None:
+        """Remove an OAuth2 client credential and record the change."""
+        with self.lock:
+            super().remove_oauth2_client_credential(client_id=client_id)
+            if self._store is not None:
+                self._store.record_oauth2_client_credential_removed(
+                    client_id=client_id,
+                )
+
+
+TARGET_MANAGER = _JournaledTargetManager()
+
+
+@internal_beartype
 class _TargetRaterChoice(StrEnum):
     """Target rater choices."""
 
@@ -55,35 +471,65 @@ class _TargetRaterChoice(StrEnum):
                 assert_never(unreachable)
 
 
-@beartype
+@internal_beartype
 class TargetManagerSettings(BaseSettings):
     """Settings for the Target Manager Flask app."""
 
     target_manager_host: str = ""
     target_rater: _TargetRaterChoice = _TargetRaterChoice.BRISQUE
+    state_directory: Path | None = None
+    snapshot_interval_changes: int = 1000
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    @functools.cached_property
+    def target_tracking_rater(self) -> TargetTrackingRater:
+        """The rater for new targets."""
+        return self.target_rater.to_target_rater()
+
+
+# Settings are read once, and again only when the environment changes.
+TARGET_MANAGER_SETTINGS = SettingsCache(settings_class=TargetManagerSettings)
+
+
+@internal_beartype
+def _persist_target_manager() -> None:
+    """Load and keep the target manager's state in the configured state
+    directory, if there is one.
+    """
+    settings = TARGET_MANAGER_SETTINGS.get()
+    if settings.state_directory is None:
+        return
+    TARGET_MANAGER.persist(
+        store=TargetManagerStore(
+            target_manager=TARGET_MANAGER,
+            directory=settings.state_directory,
+            snapshot_interval_changes=settings.snapshot_interval_changes,
+        ),
+    )
+
+
+_persist_target_manager()
 
 
 @TARGET_MANAGER_FLASK_APP.route(
     rule="/cloud_databases/<string:database_name>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_cloud_database(database_name: str) -> Response:
     """Delete a cloud database.
 
     :status 200: The cloud database has been deleted.
     """
-    with TARGET_MANAGER.lock:
-        try:
-            (matching_database,) = {
-                database
-                for database in TARGET_MANAGER.cloud_databases
-                if database_name == database.database_name
-            }
-        except ValueError:
-            return Response(response="", status=HTTPStatus.NOT_FOUND)
+    try:
+        matching_database = TARGET_MANAGER.get_cloud_database(
+            database_name=database_name,
+        )
+    except KeyError:
+        return Response(response="", status=HTTPStatus.NOT_FOUND)
 
-        TARGET_MANAGER.remove_cloud_database(cloud_database=matching_database)
+    TARGET_MANAGER.remove_cloud_database(cloud_database=matching_database)
 
     return Response(response="", status=HTTPStatus.OK)
 
@@ -92,25 +538,20 @@ def delete_cloud_database(database_name: str) -> Response:
     rule="/vumark_databases/<string:database_name>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_vumark_database(database_name: str) -> Response:
     """Delete a VuMark database.
 
     :status 200: The VuMark database has been deleted.
     """
-    with TARGET_MANAGER.lock:
-        try:
-            (matching_database,) = {
-                database
-                for database in TARGET_MANAGER.vumark_databases
-                if database_name == database.database_name
-            }
-        except ValueError:
-            return Response(response="", status=HTTPStatus.NOT_FOUND)
-
-        TARGET_MANAGER.remove_vumark_database(
-            vumark_database=matching_database,
+    try:
+        matching_database = TARGET_MANAGER.get_vumark_database(
+            database_name=database_name,
         )
+    except KeyError:
+        return Response(response="", status=HTTPStatus.NOT_FOUND)
+
+    TARGET_MANAGER.remove_vumark_database(vumark_database=matching_database)
 
     return Response(response="", status=HTTPStatus.OK)
 
@@ -118,17 +559,260 @@ def delete_vumark_database(database_name: str) -> Response:
 @TARGET_MANAGER_FLASK_APP.route(
     rule="/cloud_databases", methods=[HTTPMethod.GET]
 )
-@beartype
+@internal_beartype
 def get_cloud_databases() -> Response:
-    """Return a list of all cloud databases."""
+    """Return a list of all cloud databases.
+
+    :reqheader Accept: ``application/vnd.mock-vws.binary`` for a binary
+      response rather than JSON.
+    """
+    wire_writer = _wire_writer()
+    databases = [
+        wire_writer.cloud_database_to_dict(database=database)
+        for database in TARGET_MANAGER.cloud_databases
+    ]
+
+    return Response(
+        response=wire_writer.dumps(document=databases),
+        status=HTTPStatus.OK,
+        mimetype=wire_writer.media_type,
+    )
+
+
+@internal_beartype
+def _wire_writer() -> WireWriter:
+    """Return a writer for the response format which the requester accepts.
+
+    JSON is used unless the requester prefers the binary format.
+    """
+    best_match = request.accept_mimetypes.best_match(
+        matches=[JSON_MEDIA_TYPE, BINARY_MEDIA_TYPE],
+        default=JSON_MEDIA_TYPE,
+    )
+    if best_match == BINARY_MEDIA_TYPE:
+        return BinaryWireWriter()
+    return JSONWireWriter()
+
+
+@internal_beartype
+def _include_images() -> bool:
+    """Return whether the requester asked for the images of targets.
+
+    Images are included unless the ``include_images`` query parameter is
+    ``false``.
+    """
+    include_images = request.args.get(key="include_images", default="true")
+    return include_images.lower() != "false"
+
+
+@internal_beartype
+def _cloud_database_response(
+    *,
+    get_database: Callable[[], CloudDatabase],
+) -> Response:
+    """Return the cloud database given by a callable, or a 404 response if
+    the callable raises a ``KeyError``.
+    """
+    try:
+        database = get_database()
+    except KeyError:
+        return Response(response="", status=HTTPStatus.NOT_FOUND)
+
+    wire_writer = _wire_writer()
+    database_dict = (
+        wire_writer.cloud_database_to_dict(database=database)
+        if _include_images()
+        else database.to_dict(include_images=False)
+    )
+    return Response(
+        response=wire_writer.dumps(document=database_dict),
+        status=HTTPStatus.OK,
+        mimetype=wire_writer.media_type,
+    )
+
+
+@TARGET_MANAGER_FLASK_APP.route(
+    rule="/cloud_databases/by_server_access_key/<string:server_access_key>",
+    methods=[HTTPMethod.GET],
+)
+@internal_beartype
+def get_cloud_database_by_server_access_key(
+    server_access_key: str,
+) -> Response:
+    """Return the cloud database with the given server access key.
+
+    :query include_images: ``false`` to leave out the images of targets.
+    :status 200: The cloud database is returned.
+    :status 404: There is no cloud database with the given server access key.
+    """
+    return _cloud_database_response(
+        get_database=functools.partial(
+            TARGET_MANAGER.get_cloud_database_by_server_access_key,
+            server_access_key=server_access_key,
+        ),
+    )
+
+
+@TARGET_MANAGER_FLASK_APP.route(
+    rule=(
+        "/cloud_databases/by_server_access_key/<string:server_access_key>"
+        "/requests"
+    ),
+    methods=[HTTPMethod.POST],
+)
+@internal_beartype
+def record_cloud_database_request(server_access_key: str) -> Response:
+    """Apply the request rate limits of the cloud database with the given
+    server access key to a request made to a VWS app instance.
+
+    Checking the limits and recording the request is one atomic step, so
+    VWS app instances share the request rate limits of each database.
+
+    :reqjson endpoint: The name of the endpoint group which the request
+        belongs to.
+    :status 200: The request is recorded.
+    :status 400: The request body does not give the name of an endpoint
+      group.
+    :status 404: There is no cloud database with the given server access key.
+    :status 429: A request rate limit for the request has been reached.
+    """
+    try:
+        # Request rate limits do not depend on the targets of a database.
+        database = TARGET_MANAGER.get_cloud_database_by_server_access_key(
+            server_access_key=server_access_key,
+            include_pending_targets=False,
+        )
+    except KeyError:
+        return Response(response="", status=HTTPStatus.NOT_FOUND)
+
+    # A body which is not JSON raises ``ValueError``, a body which is not an
+    # object raises ``TypeError``, and a missing or unknown endpoint group
+    # raises ``KeyError``.
+    try:
+        request_json = json.loads(s=request.data)
+        endpoint = RateLimitedEndpoint[request_json["endpoint"]]
+    except KeyError, TypeError, ValueError:
+        msg = "The request body does not give the name of an endpoint group."
+        return Response(response=msg, status=HTTPStatus.BAD_REQUEST)
+
+    try:
+        TARGET_MANAGER.request_rate_limiter.validate(
+            database=database,
+            endpoint=endpoint,
+        )
+    except TooManyRequestsError:
+        return Response(response="", status=HTTPStatus.TOO_MANY_REQUESTS)
+    return Response(response="", status=HTTPStatus.OK)
+
+
+@TARGET_MANAGER_FLASK_APP.route(
+    rule="/cloud_databases/by_client_access_key/<string:client_access_key>",
+    methods=[HTTPMethod.GET],
+)
+@internal_beartype
+def get_cloud_database_by_client_access_key(
+    client_access_key: str,
+) -> Response:
+    """Return the cloud database with the given client access key.
+
+    :query include_images: ``false`` to leave out the images of targets.
+    :status 200: The cloud database is returned.
+    :status 404: There is no cloud database with the given client access key.
+    """
+    return _cloud_database_response(
+        get_database=functools.partial(
+            TARGET_MANAGER.get_cloud_database_by_client_access_key,
+            client_access_key=client_access_key,
+        ),
+    )
+
+
+@TARGET_MANAGER_FLASK_APP.route(
+    rule="/cloud_database_changes",
+    methods=[HTTPMethod.GET],
+)
+@internal_beartype
+def get_cloud_database_changes() -> Response:
+    """Return the changes to cloud databases since a given version.
+
+    :query journal_id: The journal ID from the last response which the
+      requester saw, or an empty string.
+    :query since: The version from the last response which the requester
+      saw, or ``0``.
+
+    :resjson string journal_id: The ID of the journal of changes. This changes
+      when the target manager restarts.
+    :resjson int version: The version of the latest change.
+    :resjson databases: Every cloud database, when the requester cannot catch
+      up from the changes which are kept, otherwise null.
+    :resjson changes: The changes after the given version, oldest first.
+
+    :status 200: The changes are returned.
+    """
+    journal_id = request.args.get(key="journal_id", default="")
+    since = request.args.get(key="since", default=0, type=int)
+    wire_writer = _wire_writer()
+    # Only the databases and changes to send are found while the lock is
+    # held. They are never changed, so they are dumped after it is released.
     with TARGET_MANAGER.lock:
-        databases = [
-            database.to_dict() for database in TARGET_MANAGER.cloud_databases
-        ]
+        snapshot = changes_snapshot(
+            journal=TARGET_MANAGER.cloud_database_journal,
+            journal_id=journal_id,
+            since=since,
+            databases=TARGET_MANAGER.cloud_databases,
+        )
+    response_dict = changes_response(
+        snapshot=snapshot,
+        wire_writer=wire_writer,
+    )
 
     return Response(
-        response=json.dumps(obj=databases),
+        response=wire_writer.dumps(document=response_dict),
+        status=HTTPStatus.OK,
+        mimetype=wire_writer.media_type,
+    )
+
+
+@TARGET_MANAGER_FLASK_APP.route(
+    rule="/cloud_databases/<string:database_name>/export",
+    methods=[HTTPMethod.GET],
+)
+@internal_beartype
+def export_cloud_database(database_name: str) -> Response:
+    """Export a cloud database as newline-delimited JSON.
+
+    The first line is the cloud database, with no targets. Each following
+    line is one target, including its image. The response is streamed, so
+    the whole export is never held in memory.
+
+    :resheader Content-Type: application/x-ndjson
+    :status 200: The cloud database is returned.
+    :status 404: There is no cloud database with the given name.
+    """
+    try:
+        database = TARGET_MANAGER.get_cloud_database(
+            database_name=database_name,
+        )
+    except KeyError:
+        return Response(response="", status=HTTPStatus.NOT_FOUND)
+
+    # Databases are not changed once they are added, so this version of the
+    # database can be read without holding a lock.
+    database_without_targets: CloudDatabase = copy.replace(
+        database,  # pyrefly: ignore[bad-argument-type]
+        targets=set(),
+    )
+
+    def _lines() -> Iterator[str]:
+        """Yield each line of the export."""
+        yield json.dumps(obj=database_without_targets.to_dict()) + "\n"
+        for target in database.targets:
+            yield json.dumps(obj=target.to_dict()) + "\n"
+
+    return Response(
+        response=_lines(),
         status=HTTPStatus.OK,
+        mimetype=_NDJSON_MEDIA_TYPE,
     )
 
 
@@ -136,13 +820,12 @@ def get_cloud_databases() -> Response:
     rule="/vumark_databases",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def get_vumark_databases() -> Response:
     """Return a list of all VuMark databases."""
-    with TARGET_MANAGER.lock:
-        databases = [
-            database.to_dict() for database in TARGET_MANAGER.vumark_databases
-        ]
+    databases = [
+        database.to_dict() for database in TARGET_MANAGER.vumark_databases
+    ]
 
     return Response(
         response=json.dumps(obj=databases),
@@ -150,10 +833,39 @@ def get_vumark_databases() -> Response:
     )
 
 
+@TARGET_MANAGER_FLASK_APP.route(
+    rule="/vumark_databases/by_server_access_key/<string:server_access_key>",
+    methods=[HTTPMethod.GET],
+)
+@internal_beartype
+def get_vumark_database_by_server_access_key(
+    server_access_key: str,
+) -> Response:
+    """Return the VuMark database with the given server access key.
+
+    :status 200: The VuMark database is returned.
+    :status 404: There is no VuMark database with the given server access
+      key.
+    """
+    try:
+        database = TARGET_MANAGER.get_vumark_database_by_server_access_key(
+            server_access_key=server_access_key,
+        )
+    except KeyError:
+        return Response(response="", status=HTTPStatus.NOT_FOUND)
+
+    database_dict = database.to_dict()
+
+    return Response(
+        response=json.dumps(obj=database_dict),
+        status=HTTPStatus.OK,
+    )
+
+
 @TARGET_MANAGER_FLASK_APP.route(
     rule="/cloud_databases", methods=[HTTPMethod.POST]
 )
-@beartype
+@internal_beartype
 def create_cloud_database() -> Response:
     """Create a new cloud database.
 
@@ -312,11 +1024,124 @@ def create_cloud_database() -> Response:
     )
 
 
+@internal_beartype
+def _cloud_database_from_ndjson(
+    *,
+    database_line: bytes,
+    target_lines: Iterable[bytes],
+) -> CloudDatabase:
+    """Load a cloud database from newline-delimited JSON, as given by
+    :func:`export_cloud_database`.
+
+    Args:
+        database_line: The line which describes the database.
+        target_lines: The lines which each describe one of its targets.
+
+    Returns:
+        The database, with every target.
+
+    Raises:
+        ValueError: A line does not describe a database or a target.
+    """
+    # Loading a dictionary with missing keys, or values of the wrong type,
+    # raises any of these.
+    invalid_dictionary_errors = (
+        AttributeError,
+        BeartypeCallHintViolation,
+        KeyError,
+        TypeError,
+        ValueError,
+    )
+    try:
+        database = CloudDatabase.from_dict(
+            database_dict=json.loads(s=database_line),
+        )
+    except invalid_dictionary_errors as exc:
+        msg = "The first line is not a valid cloud database."
+        raise ValueError(msg) from exc
+
+    targets = set(database.targets)
+    for line_number, line in enumerate(target_lines, start=2):
+        try:
+            target = ImageTarget.from_dict(target_dict=json.loads(s=line))
+        except invalid_dictionary_errors as exc:
+            msg = f"Line {line_number} is not a valid target."
+            raise ValueError(msg) from exc
+        targets.add(target)
+
+    new_database: CloudDatabase = copy.replace(
+        database,  # pyrefly: ignore[bad-argument-type]
+        targets=targets,
+    )
+    return new_database
+
+
+@TARGET_MANAGER_FLASK_APP.route(
+    rule="/cloud_databases/import",
+    methods=[HTTPMethod.POST],
+)
+@internal_beartype
+def import_cloud_database() -> Response:
+    """Create a cloud database from newline-delimited JSON, as given by
+    :func:`export_cloud_database`.
+
+    The request body is read one line at a time, so the body is never held
+    in memory whole. Every target is loaded before the database is added,
+    so a body with an invalid line adds nothing. This means that all of the
+    imported targets are held in memory before the database is added, as
+    they are once it has been added, rather than only one at a time.
+
+    :reqheader Content-Type: application/x-ndjson
+
+    :resjson string database_name: The name of the imported cloud database.
+    :resjson int target_count: The number of imported targets.
+
+    :status 201: The cloud database has been successfully imported.
+    :status 400: The request body is empty, or a line of it does not
+      describe a cloud database or a target.
+    :status 409: A key of the cloud database matches a key of an existing
+      database.
+    """
+    lines = (line for line in request.stream if line.strip())
+    database_line = next(lines, None)
+    if database_line is None:
+        return Response(response="", status=HTTPStatus.BAD_REQUEST)
+
+    try:
+        database = _cloud_database_from_ndjson(
+            database_line=database_line,
+            target_lines=lines,
+        )
+    except ValueError as exc:
+        return Response(
+            response=str(object=exc),
+            status=HTTPStatus.BAD_REQUEST,
+        )
+
+    try:
+        TARGET_MANAGER.add_cloud_database(cloud_database=database)
+    except ValueError as exc:
+        return Response(
+            response=str(object=exc),
+            status=HTTPStatus.CONFLICT,
+        )
+
+    return Response(
+        response=json.dumps(
+            obj={
+                "database_name": database.database_name,
+                "target_count": len(database.targets),
+            },
+        ),
+        status=HTTPStatus.CREATED,
+    )
+
+
 @TARGET_MANAGER_FLASK_APP.route(
     rule="/vumark_databases",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_vumark_database() -> Response:
     """Create a new VuMark database.
 
@@ -365,7 +1190,7 @@ def create_vumark_database() -> Response:
     rule="/model_target_datasets",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def get_model_target_datasets() -> Response:
     """Return a list of all Model Target datasets."""
     datasets = [
@@ -382,7 +1207,7 @@ def get_model_target_datasets() -> Response:
     rule="/model_target_datasets",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_model_target_dataset() -> Response:
     """Create a new Model Target dataset.
 
@@ -401,7 +1226,7 @@ def create_model_target_dataset() -> Response:
     rule="/model_target_datasets/<string:dataset_uuid>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_model_target_dataset(dataset_uuid: str) -> Response:
     """Delete a Model Target dataset.
 
@@ -420,7 +1245,7 @@ def delete_model_target_dataset(dataset_uuid: str) -> Response:
     rule="/oauth2_client_credentials",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def get_oauth2_client_credentials() -> Response:
     """Return all OAuth2 client credentials."""
     credentials = [
@@ -441,7 +1266,7 @@ def get_oauth2_client_credentials() -> Response:
     rule="/oauth2_client_credentials",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def put_oauth2_client_credential() -> Response:
     """Add or replace an OAuth2 client credential."""
     value = json.loads(s=request.data)
@@ -458,7 +1283,7 @@ def put_oauth2_client_credential() -> Response:
     rule="/oauth2_client_credentials/<string:client_id>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def remove_oauth2_client_credential(client_id: str) -> Response:
     """Remove an OAuth2 client credential."""
     if client_id not in TARGET_MANAGER.oauth2_client_credentials:
@@ -471,14 +1296,24 @@ def remove_oauth2_client_credential(client_id: str) -> Response:
     rule="/cloud_databases/<string:database_name>/targets",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_target(database_name: str) -> Response:
-    """Create a new target in a given cloud database."""
-    request_json = json.loads(s=request.data)
-    settings = TargetManagerSettings.model_validate(obj={})
+    """Create a new target in a given cloud database.
 
-    image_bytes = base64.b64decode(s=request_json["image_base64"])
-    target_tracking_rater = settings.target_rater.to_target_rater()
+    :reqheader Content-Type: ``application/vnd.mock-vws.binary`` for a binary
+      request body rather than JSON.
+    :reqheader Accept: ``application/vnd.mock-vws.binary`` for a binary
+      response rather than JSON.
+    """
+    reader = wire_reader(
+        content=request.data,
+        content_type=request.content_type or "",
+    )
+    request_json = reader.document
+    settings = TARGET_MANAGER_SETTINGS.get()
+
+    image_bytes = reader.image_from_dict(target_dict=request_json)
+    target_tracking_rater = settings.target_tracking_rater
     target = ImageTarget(
         name=request_json["name"],
         width=request_json["width"],
@@ -489,17 +1324,15 @@ def create_target(database_name: str) -> Response:
         target_id=request_json["target_id"],
         target_tracking_rater=target_tracking_rater,
     )
-    with TARGET_MANAGER.lock:
-        (database,) = (
-            database
-            for database in TARGET_MANAGER.cloud_databases
-            if database.database_name == database_name
-        )
-        database.targets.add(target)
+    TARGET_MANAGER.put_target(database_name=database_name, target=target)
 
+    wire_writer = _wire_writer()
     return Response(
-        response=json.dumps(obj=target.to_dict()),
+        response=wire_writer.dumps(
+            document=wire_writer.target_to_dict(target=target),
+        ),
         status=HTTPStatus.CREATED,
+        mimetype=wire_writer.media_type,
     )
 
 
@@ -507,18 +1340,15 @@ def create_target(database_name: str) -> Response:
     rule="/vumark_databases/<string:database_name>/vumark_targets",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_vumark_target(database_name: str) -> Response:
     """Create a new VuMark target in a given database."""
     request_json = json.loads(s=request.data)
     target = VuMarkTarget.from_dict(target_dict=request_json)
-    with TARGET_MANAGER.lock:
-        (database,) = (
-            database
-            for database in TARGET_MANAGER.vumark_databases
-            if database.database_name == database_name
-        )
-        database.vumark_targets.add(target)
+    TARGET_MANAGER.add_vumark_target(
+        database_name=database_name,
+        target=target,
+    )
 
     return Response(
         response=json.dumps(obj=target.to_dict()),
@@ -530,14 +1360,12 @@ def create_vumark_target(database_name: str) -> Response:
     rule="/cloud_databases/<string:database_name>/targets/<string:target_id>",
     methods={HTTPMethod.DELETE},
 )
-@beartype
+@internal_beartype
 def delete_target(database_name: str, target_id: str) -> Response:
     """Delete a target."""
-    with TARGET_MANAGER.lock:
-        (database,) = (
-            database
-            for database in TARGET_MANAGER.cloud_databases
-            if database.database_name == database_name
+    with TARGET_MANAGER.database_lock(database_name=database_name):
+        database = TARGET_MANAGER.get_cloud_database(
+            database_name=database_name,
         )
         target = database.get_target(target_id=target_id)
         now = datetime.datetime.now(tz=target.upload_date.tzinfo)
@@ -546,12 +1374,18 @@ def delete_target(database_name: str, target_id: str) -> Response:
             target,  # pyrefly: ignore[bad-argument-type]
             delete_date=now,
         )
-        database.targets.remove(target)
-        database.targets.add(new_target)
+        TARGET_MANAGER.put_target(
+            database_name=database_name,
+            target=new_target,
+        )
 
+    wire_writer = _wire_writer()
     return Response(
-        response=json.dumps(obj=new_target.to_dict()),
+        response=wire_writer.dumps(
+            document=wire_writer.target_to_dict(target=new_target),
+        ),
         status=HTTPStatus.OK,
+        mimetype=wire_writer.media_type,
     )
 
 
@@ -559,16 +1393,14 @@ def delete_target(database_name: str, target_id: str) -> Response:
     rule="/cloud_databases/<string:database_name>/targets/<string:target_id>",
     methods=[HTTPMethod.PUT],
 )
-@beartype
+@internal_beartype
 def update_target(database_name: str, target_id: str) -> Response:
     """Update a target."""
     request_json = json.loads(s=request.data)
 
-    with TARGET_MANAGER.lock:
-        (database,) = (
-            database
-            for database in TARGET_MANAGER.cloud_databases
-            if database.database_name == database_name
+    with TARGET_MANAGER.database_lock(database_name=database_name):
+        database = TARGET_MANAGER.get_cloud_database(
+            database_name=database_name,
         )
         target = database.get_target(target_id=target_id)
 
@@ -595,17 +1427,25 @@ def update_target(database_name: str, target_id: str) -> Response:
             application_metadata=application_metadata,
             image_value=image_value,
             last_modified_date=last_modified_date,
+            # An updated target is processed again.
+            post_processing_status=None,
         )
 
-        database.targets.remove(target)
-        database.targets.add(new_target)
+        TARGET_MANAGER.put_target(
+            database_name=database_name,
+            target=new_target,
+        )
 
+    wire_writer = _wire_writer()
     return Response(
-        response=json.dumps(obj=new_target.to_dict()),
+        response=wire_writer.dumps(
+            document=wire_writer.target_to_dict(target=new_target),
+        ),
         status=HTTPStatus.OK,
+        mimetype=wire_writer.media_type,
     )
 
 
 if __name__ == "__main__":  # pragma: no cover
-    SETTINGS = TargetManagerSettings.model_validate(obj={})
+    SETTINGS = TARGET_MANAGER_SETTINGS.get()
     TARGET_MANAGER_FLASK_APP.run(host=SETTINGS.target_manager_host)
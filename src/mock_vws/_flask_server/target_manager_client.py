@@ -0,0 +1,303 @@
+"""A client for the target manager service.
+
+The VWS and VWQ applications make several requests to the target manager for
+each request which they handle. This client shares a pool of keep-alive
+connections between those requests, retries requests which fail to connect,
+and logs how long each request takes.
+
+The asyncio VWQ application uses :class:`AsyncTargetManagerClient`, which
+does the same for requests made from an event loop.
+
+When the target manager is served in the same process as the VWS and VWQ
+applications, requests to it are handled without a network connection, and
+the target manager's state can be read directly.
+"""
+
+import asyncio
+import io
+import logging
+import time
+import weakref
+from collections.abc import Mapping
+from http import HTTPMethod
+from typing import override
+
+import httpx
+import requests
+from flask import Flask
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+from werkzeug.test import Client
+
+from mock_vws._type_checks import internal_beartype
+from mock_vws.target_manager import TargetManager
+
+_LOGGER = logging.getLogger(name=__name__)
+
+# The VWS and VWQ applications serve each request on its own thread, so this
+# is the number of requests to the target manager which can be in flight at
+# once without opening a connection which is not kept alive.
+_POOL_MAX_SIZE = 32
+
+_TIMEOUT_SECONDS = 30
+
+
+@internal_beartype
+class _InProcessAdapter(BaseAdapter):
+    """A transport adapter which sends requests to a Flask application in
+    this process, rather than over a network connection.
+    """
+
+    def __init__(self, *, base_url: str, app: Flask) -> None:
+        """
+        Args:
+            base_url: The base URL which the application is served at.
+            app: The application to send requests to.
+        """
+        super().__init__()
+        self._base_url = base_url
+        self._client = Client(application=app)
+
+    @override
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: object = None,
+        verify: bool | str = True,
+        cert: object = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        """Send a request to the application.
+
+        The arguments other than the request are those which ``requests``
+        gives every adapter, and are not used.
+
+        Args:
+            request: The request to send.
+            stream: Whether to stream the response content.
+            timeout: The timeout of the request.
+            verify: Whether to verify TLS certificates.
+            cert: A client certificate.
+            proxies: Proxies to use.
+
+        Returns:
+            The response from the application.
+        """
+        del stream, timeout, verify, cert, proxies
+        url = request.url or ""
+        app_response = self._client.open(
+            path=url.removeprefix(self._base_url),
+            method=request.method or HTTPMethod.GET.value,
+            headers=dict(request.headers),
+            data=request.body,
+        )
+        response = requests.Response()
+        response.status_code = app_response.status_code
+        response.reason = app_response.status.partition(" ")[2]
+        response.headers = CaseInsensitiveDict(data=app_response.headers)
+        response.encoding = get_encoding_from_headers(
+            headers=response.headers,
+        )
+        response.raw = io.BytesIO(initial_bytes=app_response.get_data())
+        response.url = url
+        response.request = request
+        return response
+
+    @override
+    def close(self) -> None:
+        """Nothing needs to be closed."""
+
+
+@internal_beartype
+class TargetManagerClient:
+    """A client for the target manager service, shared between threads."""
+
+    def __init__(self) -> None:
+        """Create a client with an empty pool of connections."""
+        # Requests which fail to connect, and idempotent requests which get a
+        # response showing that the target manager is not available, are
+        # retried. Other requests are not retried, because the target
+        # manager may have made the change which was asked for.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=_POOL_MAX_SIZE,
+            max_retries=retry,
+        )
+        self._session = requests.Session()
+        self._session.mount(prefix="http://", adapter=adapter)
+        self._session.mount(prefix="https://", adapter=adapter)
+        self._in_process_target_managers: dict[str, TargetManager] = {}
+
+    def mount_in_process(
+        self,
+        *,
+        base_url: str,
+        app: Flask,
+        target_manager: TargetManager,
+    ) -> None:
+        """Handle requests to a target manager service in this process.
+
+        This must be called before this client is shared between threads.
+
+        Args:
+            base_url: The base URL of the target manager service.
+            app: The target manager application.
+            target_manager: The target manager which the application
+                serves, which is read directly rather than through requests.
+        """
+        self._session.mount(
+            prefix=base_url,
+            adapter=_InProcessAdapter(base_url=base_url, app=app),
+        )
+        self._in_process_target_managers[base_url] = target_manager
+
+    def in_process_target_manager(
+        self,
+        *,
+        base_url: str,
+    ) -> TargetManager | None:
+        """Get the target manager which is served in this process at a base
+        URL, if there is one.
+
+        Args:
+            base_url: The base URL of the target manager service.
+
+        Returns:
+            The target manager, or ``None`` if the target manager service at
+            the given URL is not in this process.
+        """
+        return self._in_process_target_managers.get(base_url)
+
+    def request(
+        self,
+        *,
+        method: HTTPMethod,
+        url: str,
+        params: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        data: bytes | None = None,
+        json: object = None,
+    ) -> requests.Response:
+        """Make a request to the target manager service.
+
+        Args:
+            method: The HTTP method of the request.
+            url: The URL to request.
+            params: Query parameters to add to the URL.
+            headers: Headers to send.
+            data: A body to send.
+            json: A body to send as JSON.
+
+        Returns:
+            The response from the target manager service.
+        """
+        start_time = time.perf_counter()
+        response = self._session.request(
+            method=method.value,
+            url=url,
+            params=params,
+            headers=headers,
+            data=data,
+            json=json,
+            timeout=_TIMEOUT_SECONDS,
+        )
+        elapsed_seconds = time.perf_counter() - start_time
+        _LOGGER.debug(
+            "%s %s returned %d in %.3f seconds.",
+            method.value,
+            url,
+            response.status_code,
+            elapsed_seconds,
+        )
+        return response
+
+
+@internal_beartype
+class AsyncTargetManagerClient:
+    """A client for the target manager service, shared between tasks.
+
+    Connections belong to the event loop which opened them, so each event
+    loop is given its own pool of connections.
+    """
+
+    def __init__(self) -> None:
+        """Create a client with no pools of connections yet."""
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            httpx.AsyncClient,
+        ] = weakref.WeakKeyDictionary()
+
+    def _client(self) -> httpx.AsyncClient:
+        """Get the ``httpx`` client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Only requests which fail to connect are retried, as ``httpx``
+            # does not retry requests based on the response status.
+            transport = httpx.AsyncHTTPTransport(
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=_POOL_MAX_SIZE),
+            )
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=_TIMEOUT_SECONDS,
+            )
+            self._clients[loop] = client
+        return client
+
+    async def request(
+        self,
+        *,
+        method: HTTPMethod,
+        url: str,
+        params: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> httpx.Response:
+        """Make a request to the target manager service.
+
+        Args:
+            method: The HTTP method of the request.
+            url: The URL to request.
+            params: Query parameters to add to the URL.
+            headers: Headers to send.
+
+        Returns:
+            The response from the target manager service.
+        """
+        start_time = time.perf_counter()
+        response = await self._client().request(
+            method=method.value,
+            url=url,
+            params=params,
+            headers=headers,
+        )
+        elapsed_seconds = time.perf_counter() - start_time
+        _LOGGER.debug(
+            "%s %s returned %d in %.3f seconds.",
+            method.value,
+            url,
+            response.status_code,
+            elapsed_seconds,
+        )
+        return response
+
+    async def aclose(self) -> None:
+        """Close the connections opened from the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+TARGET_MANAGER_CLIENT = TargetManagerClient()
+ASYNC_TARGET_MANAGER_CLIENT = AsyncTargetManagerClient()
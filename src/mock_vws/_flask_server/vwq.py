@@ -5,16 +5,18 @@ https://developer.vuforia.com/library/web-api/vuforia-query-web-api
 """
 
 import email.utils
+import functools
 import time
+from collections.abc import Set as AbstractSet
 from enum import StrEnum, auto
 from http import HTTPMethod, HTTPStatus
 from typing import assert_never
 
-import requests
-from beartype import beartype
 from flask import Flask, Response, request
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from mock_vws._flask_server.replication import CloudDatabaseReplica
+from mock_vws._flask_server.settings_cache import SettingsCache
 from mock_vws._query_tools import (
     get_query_match_response_text,
 )
@@ -22,6 +24,7 @@ from mock_vws._query_validators import run_query_validators
 from mock_vws._query_validators.exceptions import (
     ValidatorError,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 from mock_vws.image_matchers import (
     ExactMatcher,
@@ -32,8 +35,12 @@ from mock_vws.image_matchers import (
 CLOUDRECO_FLASK_APP = Flask(import_name=__name__, static_folder=None)
 CLOUDRECO_FLASK_APP.config["PROPAGATE_EXCEPTIONS"] = True
 
+# Each VWQ app instance keeps a replica of the cloud databases, and catches
+# up with the target manager's changes on each request.
+_CLOUD_DATABASE_REPLICA = CloudDatabaseReplica()
 
-@beartype
+
+@internal_beartype
 class _ImageMatcherChoice(StrEnum):
     """Image matcher choices."""
 
@@ -51,7 +58,7 @@ class _ImageMatcherChoice(StrEnum):
                 assert_never(unreachable)
 
 
-@beartype
+@internal_beartype
 class VWQSettings(BaseSettings):
     """Settings for the VWQ Flask app."""
 
@@ -62,23 +69,32 @@ class VWQSettings(BaseSettings):
     )
     response_delay_seconds: float = 0.0
 
+    model_config = SettingsConfigDict(frozen=True)
+
+    @functools.cached_property
+    def query_match_checker(self) -> ImageMatcher:
+        """The image matcher for the query endpoint."""
+        return self.query_image_matcher.to_image_matcher()
+
+
+# Settings are read once, and again only when the environment changes.
+VWQ_SETTINGS = SettingsCache(settings_class=VWQSettings)
 
-@beartype
-def get_all_cloud_databases() -> set[CloudDatabase]:
-    """Get all database objects from the target manager back-end."""
-    settings = VWQSettings.model_validate(obj={})
-    response = requests.get(
-        url=f"{settings.target_manager_base_url}/cloud_databases",
-        timeout=30,
+
+@internal_beartype
+def get_all_cloud_databases() -> AbstractSet[CloudDatabase]:
+    """Get all database objects from the target manager back-end.
+
+    Only the changes since the last call are fetched.
+    """
+    settings = VWQ_SETTINGS.get()
+    return _CLOUD_DATABASE_REPLICA.cloud_databases(
+        base_url=settings.target_manager_base_url,
     )
-    return {
-        CloudDatabase.from_dict(database_dict=database_dict)
-        for database_dict in response.json()
-    }
 
 
 @CLOUDRECO_FLASK_APP.before_request
-@beartype
+@internal_beartype
 def set_terminate_wsgi_input() -> None:
     """We set ``wsgi.input_terminated`` to ``True`` when going through
     ``requests`` in our tests, so that requests have the given ``Content-
@@ -105,16 +121,16 @@ def set_terminate_wsgi_input() -> None:
 
 
 @CLOUDRECO_FLASK_APP.after_request
-@beartype
+@internal_beartype
 def add_response_delay(response: Response) -> Response:
     """Add a delay to each response."""
-    settings = VWQSettings.model_validate(obj={})
+    settings = VWQ_SETTINGS.get()
     time.sleep(settings.response_delay_seconds)
     return response
 
 
 @CLOUDRECO_FLASK_APP.errorhandler(code_or_exception=ValidatorError)
-@beartype
+@internal_beartype
 def handle_exceptions(exc: ValidatorError) -> Response:
     """Return the error response associated with the given exception."""
     response = Response(
@@ -129,11 +145,11 @@ def handle_exceptions(exc: ValidatorError) -> Response:
 
 
 @CLOUDRECO_FLASK_APP.route(rule="/v1/query", methods=[HTTPMethod.POST])
-@beartype
+@internal_beartype
 def query() -> Response:
     """Perform an image recognition query."""
-    settings = VWQSettings.model_validate(obj={})
-    query_match_checker = settings.query_image_matcher.to_image_matcher()
+    settings = VWQ_SETTINGS.get()
+    query_match_checker = settings.query_match_checker
 
     databases = get_all_cloud_databases()
     request_body = request.stream.read()
@@ -169,5 +185,5 @@ def query() -> Response:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    SETTINGS = VWQSettings.model_validate(obj={})
+    SETTINGS = VWQ_SETTINGS.get()
     CLOUDRECO_FLASK_APP.run(host=SETTINGS.vwq_host)
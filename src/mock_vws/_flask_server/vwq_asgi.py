@@ -0,0 +1,288 @@
+"""A fake implementation of the Vuforia Web Query API as an asyncio ASGI
+application.
+
+This gives the same responses as the Flask application in
+:mod:`mock_vws._flask_server.vwq`, but a query does not hold a thread while
+it waits for the target manager or for its response delay. Image matching
+runs on a thread in the event loop's default executor.
+
+See
+https://developer.vuforia.com/library/web-api/vuforia-query-web-api
+"""
+
+import asyncio
+import email.utils
+import functools
+from collections.abc import Awaitable, Callable, Iterable, MutableMapping
+from collections.abc import Set as AbstractSet
+from http import HTTPMethod, HTTPStatus
+from typing import Any
+
+from werkzeug.exceptions import HTTPException, MethodNotAllowed, NotFound
+
+from mock_vws._flask_server.replication import CloudDatabaseReplica
+from mock_vws._flask_server.target_manager_client import (
+    ASYNC_TARGET_MANAGER_CLIENT,
+)
+from mock_vws._flask_server.vwq import VWQ_SETTINGS
+from mock_vws._query_tools import (
+    get_query_match_response_text,
+)
+from mock_vws._query_validators import run_query_validators
+from mock_vws._query_validators.exceptions import (
+    ValidatorError,
+)
+from mock_vws._type_checks import internal_beartype
+from mock_vws.database import CloudDatabase
+from mock_vws.image_matchers import ImageMatcher
+
+_Scope = MutableMapping[str, Any]
+_Message = MutableMapping[str, Any]
+_Receive = Callable[[], Awaitable[_Message]]
+_Send = Callable[[_Message], Awaitable[None]]
+
+_QUERY_PATH = "/v1/query"
+
+# Each VWQ app instance keeps a replica of the cloud databases, and catches
+# up with the target manager's changes on each request.
+_CLOUD_DATABASE_REPLICA = CloudDatabaseReplica()
+
+
+@internal_beartype
+def _request_headers(*, scope: _Scope) -> dict[str, str]:
+    """Get the headers of a request, named as Flask names them.
+
+    Args:
+        scope: The ASGI connection scope of the request.
+
+    Returns:
+        The request headers, with repeated headers joined by commas.
+    """
+    request_headers: dict[str, str] = {}
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode(encoding="latin-1").title()
+        value = raw_value.decode(encoding="latin-1")
+        if name in request_headers:
+            request_headers[name] = f"{request_headers[name]},{value}"
+        else:
+            request_headers[name] = value
+    return request_headers
+
+
+@internal_beartype
+async def _read_body(*, receive: _Receive) -> bytes:
+    """Read the whole body of a request.
+
+    Args:
+        receive: The ASGI callable which gives request messages.
+
+    Returns:
+        The request body.
+    """
+    chunks: list[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+@internal_beartype
+async def _send_response(
+    *,
+    send: _Send,
+    status: int,
+    body: bytes,
+    headers: Iterable[tuple[str, str]],
+) -> None:
+    """Send a response, after the configured response delay.
+
+    Args:
+        send: The ASGI callable which sends response messages.
+        status: The status code of the response.
+        body: The response body.
+        headers: The response headers.
+    """
+    settings = VWQ_SETTINGS.get()
+    await asyncio.sleep(delay=settings.response_delay_seconds)
+    response_headers = [
+        (
+            name.lower().encode(encoding="latin-1"),
+            value.encode(encoding="latin-1"),
+        )
+        for name, value in headers
+    ]
+    if not any(name == b"content-length" for name, _ in response_headers):
+        response_headers.append(
+            (b"content-length", str(object=len(body)).encode()),
+        )
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": response_headers,
+        },
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+@internal_beartype
+def _query_response_text(
+    *,
+    request_headers: dict[str, str],
+    request_body: bytes,
+    request_method: str,
+    request_path: str,
+    databases: AbstractSet[CloudDatabase],
+    query_match_checker: ImageMatcher,
+) -> str:
+    """Validate a query and find its matches.
+
+    This is slow for large databases, so it is run on an executor.
+
+    Args:
+        request_headers: The headers sent with the request.
+        request_body: The body of the request.
+        request_method: The HTTP method of the request.
+        request_path: The path of the request.
+        databases: All cloud databases.
+        query_match_checker: The matcher to compare images with.
+
+    Returns:
+        The body of a successful query response.
+
+    Raises:
+        ValidatorError: The query is not valid.
+    """
+    run_query_validators(
+        request_headers=request_headers,
+        request_body=request_body,
+        request_method=request_method,
+        request_path=request_path,
+        databases=databases,
+    )
+    return get_query_match_response_text(
+        request_headers=request_headers,
+        request_body=request_body,
+        request_method=request_method,
+        request_path=request_path,
+        databases=databases,
+        query_match_checker=query_match_checker,
+    )
+
+
+@internal_beartype
+async def _query(*, scope: _Scope, receive: _Receive, send: _Send) -> None:
+    """Perform an image recognition query.
+
+    Args:
+        scope: The ASGI connection scope of the request.
+        receive: The ASGI callable which gives request messages.
+        send: The ASGI callable which sends response messages.
+    """
+    settings = VWQ_SETTINGS.get()
+    query_match_checker = settings.query_match_checker
+
+    databases = await _CLOUD_DATABASE_REPLICA.cloud_databases_async(
+        base_url=settings.target_manager_base_url,
+    )
+    request_body = await _read_body(receive=receive)
+    loop = asyncio.get_running_loop()
+    try:
+        response_text = await loop.run_in_executor(
+            None,
+            functools.partial(
+                _query_response_text,
+                request_headers=_request_headers(scope=scope),
+                request_body=request_body,
+                request_method=scope["method"],
+                request_path=scope["path"],
+                databases=databases,
+                query_match_checker=query_match_checker,
+            ),
+        )
+    except ValidatorError as exc:
+        await _send_response(
+            send=send,
+            status=exc.status_code.value,
+            body=exc.response_text.encode(),
+            headers=exc.headers.items(),
+        )
+        return
+
+    date = email.utils.formatdate(timeval=None, localtime=False, usegmt=True)
+    headers = {
+        "Content-Type": "application/json",
+        "Date": date,
+        "Connection": "keep-alive",
+        "Server": "nginx",
+    }
+    await _send_response(
+        send=send,
+        status=HTTPStatus.OK,
+        body=response_text.encode(),
+        headers=headers.items(),
+    )
+
+
+@internal_beartype
+async def _lifespan(*, receive: _Receive, send: _Send) -> None:
+    """Handle the startup and shutdown of the application.
+
+    Args:
+        receive: The ASGI callable which gives lifespan messages.
+        send: The ASGI callable which sends lifespan messages.
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await ASYNC_TARGET_MANAGER_CLIENT.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+@internal_beartype
+class CloudRecoASGIApp:
+    """An ASGI application for the Vuforia Web Query API."""
+
+    async def __call__(
+        self,
+        scope: _Scope,
+        receive: _Receive,
+        send: _Send,
+    ) -> None:
+        """Handle an ASGI connection.
+
+        Args:
+            scope: The ASGI connection scope.
+            receive: The ASGI callable which gives messages.
+            send: The ASGI callable which sends messages.
+        """
+        if scope["type"] == "lifespan":
+            await _lifespan(receive=receive, send=send)
+            return
+
+        if scope["path"] == _QUERY_PATH and scope["method"] == HTTPMethod.POST:
+            await _query(scope=scope, receive=receive, send=send)
+            return
+
+        # Other requests get the same responses as they get from Flask.
+        error: HTTPException = (
+            MethodNotAllowed(valid_methods=[HTTPMethod.POST])
+            if scope["path"] == _QUERY_PATH
+            else NotFound()
+        )
+        await _send_response(
+            send=send,
+            status=error.code or HTTPStatus.INTERNAL_SERVER_ERROR,
+            body=error.get_body().encode(),
+            headers=error.get_headers(),
+        )
+
+
+CLOUDRECO_ASGI_APP = CloudRecoASGIApp()
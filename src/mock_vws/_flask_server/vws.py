@@ -5,22 +5,27 @@ https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api
 """
 
 import base64
+import contextlib
 import email.utils
+import functools
 import gzip
 import html
+import itertools
 import json
 import logging
 import threading
 import time
+import urllib.parse
 import uuid
+import weakref
+from collections.abc import Iterator
+from collections.abc import Set as AbstractSet
 from enum import StrEnum, auto
 from http import HTTPMethod, HTTPStatus
-from typing import assert_never
+from typing import Any, assert_never
 
-import requests
-from beartype import beartype
 from flask import Flask, Response, request
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from werkzeug.exceptions import MethodNotAllowed, NotFound
 
 from mock_vws._constants import (
@@ -30,8 +35,26 @@ from mock_vws._constants import (
     ResultCodes,
     TargetStatuses,
 )
-from mock_vws._database_matchers import get_database_matching_server_keys
-from mock_vws._mock_common import RequestData, json_dump, sorted_targets
+from mock_vws._database_matchers import (
+    access_key_from_auth_header,
+    get_database_matching_server_keys,
+)
+from mock_vws._flask_server.replication import CloudDatabaseReplica
+from mock_vws._flask_server.settings_cache import SettingsCache
+from mock_vws._flask_server.target_manager_client import (
+    TARGET_MANAGER_CLIENT,
+)
+from mock_vws._flask_server.wire_format import (
+    BINARY_MEDIA_TYPE,
+    BinaryWireWriter,
+)
+from mock_vws._mock_common import (
+    TARGET_LIST_NEXT_CURSOR_HEADER,
+    RequestData,
+    json_dump,
+    sorted_targets,
+    target_list_page,
+)
 from mock_vws._model_target_web_api import (
     create_model_target_dataset,
     delete_model_target_dataset,
@@ -64,11 +87,14 @@ from mock_vws._services_validators.exceptions import (
     InvalidTargetTypeError,
     TargetStatusNotSuccessError,
     TargetStatusProcessingError,
+    TooManyRequestsError,
     ValidatorError,
 )
 from mock_vws._services_validators.request_rate_validators import (
+    RequestRateLimitBackend,
     RequestRateLimiter,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase, VuMarkDatabase
 from mock_vws.image_matchers import (
     ExactMatcher,
@@ -81,6 +107,7 @@ from mock_vws.model_target import (
     OAuth2ClientCredential,
 )
 from mock_vws.reco_counts import RecoCountsReport
+from mock_vws.request_rate_limits import RateLimitedEndpoint
 from mock_vws.target import ImageTarget
 from mock_vws.target_raters import (
     HardcodedTargetTrackingRater,
@@ -90,16 +117,25 @@ VWS_FLASK_APP = Flask(import_name=__name__, static_folder=None)
 VWS_FLASK_APP.config["PROPAGATE_EXCEPTIONS"] = True
 
 # In the Docker deployment the target manager service owns all database and
-# target state, and each VWS app instance is otherwise stateless.
-# Request rate limit history is deliberately an exception: it is tracked per
-# VWS app instance, so it is lost when the app restarts.
-_REQUEST_RATE_LIMITER = RequestRateLimiter(time_function=time.monotonic)
+# target state, including request rate limit history, and each VWS app
+# instance is otherwise stateless.
+# With the ``LOCAL`` request rate limiter choice, request rate limit history
+# is instead tracked per VWS app instance, so it is lost when the app
+# restarts.
+_LOCAL_REQUEST_RATE_LIMITER = RequestRateLimiter(time_function=time.monotonic)
+
+# Each VWS app instance keeps a replica of the cloud databases, and catches
+# up with the target manager's changes on each request.
+_CLOUD_DATABASE_REPLICA = CloudDatabaseReplica()
+
+# The number of list items in each chunk of a streamed response body.
+_STREAMED_LIST_CHUNK_SIZE = 1000
 
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 class _ImageMatcherChoice(StrEnum):
     """Image matcher choices."""
 
@@ -117,7 +153,83 @@ class _ImageMatcherChoice(StrEnum):
                 assert_never(unreachable)
 
 
-@beartype
+@internal_beartype
+class _TargetManagerRequestRateLimiter:
+    """A request rate limiter which keeps request rate limit history in the
+    target manager, so that it is shared by all VWS app instances.
+    """
+
+    def validate(
+        self,
+        *,
+        database: CloudDatabase,
+        endpoint: RateLimitedEndpoint,
+    ) -> None:
+        """Record a request with the target manager, or raise an error if a
+        rate limit for the request is exhausted.
+
+        The target manager checks the limits and records the request in one
+        request.
+
+        Args:
+            database: The database which the request is made against.
+            endpoint: The endpoint group which the request belongs to.
+
+        Raises:
+            TooManyRequestsError: A limit which applies to the request has
+                been reached.
+            requests.HTTPError: The target manager did not record the
+                request, so it is not known whether a limit has been
+                reached.
+        """
+        # Most databases have no request rate limits, and requests made
+        # against them do not need to be recorded.
+        if (
+            database.requests_per_second_limit is None
+            and database.request_rate_limits is None
+        ):
+            return
+
+        settings = VWS_SETTINGS.get()
+        quoted_key = urllib.parse.quote(
+            string=database.server_access_key,
+            safe="",
+        )
+        response = TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.POST,
+            url=(
+                f"{settings.target_manager_base_url}/cloud_databases/"
+                f"by_server_access_key/{quoted_key}/requests"
+            ),
+            json={"endpoint": endpoint.name},
+        )
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            raise TooManyRequestsError
+        # Requests are not allowed when the limits cannot be checked.
+        response.raise_for_status()
+
+
+@internal_beartype
+class _RequestRateLimiterChoice(StrEnum):
+    """Choices of where request rate limit history is kept."""
+
+    TARGET_MANAGER = auto()
+    LOCAL = auto()
+
+    def to_request_rate_limiter(
+        self: _RequestRateLimiterChoice,
+    ) -> RequestRateLimitBackend:
+        """Get the request rate limiter."""
+        match self:
+            case _RequestRateLimiterChoice.TARGET_MANAGER:
+                return _TargetManagerRequestRateLimiter()
+            case _RequestRateLimiterChoice.LOCAL:
+                return _LOCAL_REQUEST_RATE_LIMITER
+            case _ as unreachable:
+                assert_never(unreachable)
+
+
+@internal_beartype
 class VWSSettings(BaseSettings):
     """Settings for the VWS Flask app."""
 
@@ -132,39 +244,182 @@ class VWSSettings(BaseSettings):
     )
     response_delay_seconds: float = 0.0
     model_target_training_allowance_exceeded: bool = False
+    # Stream the body of target list responses rather than sending it all at
+    # once with a ``Content-Length`` header.
+    stream_target_lists: bool = False
+    request_rate_limiter: _RequestRateLimiterChoice = (
+        _RequestRateLimiterChoice.TARGET_MANAGER
+    )
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    @functools.cached_property
+    def duplicates_match_checker(self) -> ImageMatcher:
+        """The image matcher for the duplicates endpoint."""
+        return self.duplicates_image_matcher.to_image_matcher()
+
+    @functools.cached_property
+    def request_rate_limit_backend(self) -> RequestRateLimitBackend:
+        """The store of request times which applies request rate limits."""
+        return self.request_rate_limiter.to_request_rate_limiter()
+
 
+# Settings are read once, and again only when the environment changes.
+VWS_SETTINGS = SettingsCache(settings_class=VWSSettings)
 
-@beartype
-def get_all_cloud_databases() -> set[CloudDatabase]:
-    """Get all database objects from the task manager back-end."""
-    settings = VWSSettings.model_validate(obj={})
-    timeout_seconds = 30
-    response = requests.get(
-        url=f"{settings.target_manager_base_url}/cloud_databases",
-        timeout=timeout_seconds,
+
+@internal_beartype
+def get_all_cloud_databases() -> AbstractSet[CloudDatabase]:
+    """Get all database objects from the target manager back-end.
+
+    Only the changes since the last call are fetched.
+    """
+    settings = VWS_SETTINGS.get()
+    return _CLOUD_DATABASE_REPLICA.cloud_databases(
+        base_url=settings.target_manager_base_url,
     )
-    return {
-        CloudDatabase.from_dict(database_dict=database_dict)
-        for database_dict in response.json()
-    }
 
 
-@beartype
-def get_all_vumark_databases() -> set[VuMarkDatabase]:
-    """Get all VuMark database objects from the task manager back-end."""
-    settings = VWSSettings.model_validate(obj={})
-    timeout_seconds = 30
-    response = requests.get(
-        url=f"{settings.target_manager_base_url}/vumark_databases",
-        timeout=timeout_seconds,
+# The not deleted targets of versions of cloud databases, in the order given
+# by ``sorted_targets``, keyed by the ``id`` of each version. Versions from
+# the replica are not changed, so the targets of each version are sorted at
+# most once. An entry is removed when its version is garbage collected.
+_SORTED_NOT_DELETED_TARGETS: dict[int, list[ImageTarget]] = {}
+
+
+@internal_beartype
+def _sorted_not_deleted_targets(
+    *,
+    database: CloudDatabase,
+) -> list[ImageTarget]:
+    """Get the targets of a version of a cloud database which have not been
+    deleted, in the order given by ``sorted_targets``.
+
+    Args:
+        database: A version of a cloud database from the replica.
+
+    Returns:
+        The targets, sorted.
+    """
+    database_id = id(database)
+    ordered_targets = _SORTED_NOT_DELETED_TARGETS.get(database_id)
+    if ordered_targets is None:
+        ordered_targets = sorted_targets(targets=database.not_deleted_targets)
+        _SORTED_NOT_DELETED_TARGETS[database_id] = ordered_targets
+        weakref.finalize(
+            database,
+            _SORTED_NOT_DELETED_TARGETS.pop,
+            database_id,
+            None,
+        )
+    return ordered_targets
+
+
+@internal_beartype
+def _streamed_json_chunks(
+    *,
+    body: dict[str, Any],
+    list_key: str,
+) -> Iterator[str]:
+    """Dump a JSON body in chunks, in the same way as ``json_dump``.
+
+    The items under the given key, which must be the last key in the body,
+    are dumped a chunk at a time, so that the whole body is never held in
+    memory as one string.
+
+    Args:
+        body: The body to dump.
+        list_key: The key of the items to dump in chunks. The items can be
+            given by an iterator, so that they are made only as they are
+            sent.
+
+    Yields:
+        Parts of the JSON dump of the body.
+    """
+    # Dump the body with an empty list, and then put the items between the
+    # brackets of that empty list.
+    body_with_empty_list = json_dump(body={**body, list_key: []})
+    list_end = body_with_empty_list.rindex("[]") + 1
+    yield body_with_empty_list[:list_end]
+    for index, batch in enumerate(
+        itertools.batched(
+            body[list_key],
+            _STREAMED_LIST_CHUNK_SIZE,
+            strict=False,
+        ),
+    ):
+        batch_json = json.dumps(obj=list(batch), separators=(",", ":"))
+        yield ("," if index else "") + batch_json[1:-1]
+    yield body_with_empty_list[list_end:]
+
+
+@internal_beartype
+def get_databases_by_server_access_key(
+    *,
+    server_access_key: str,
+) -> list[CloudDatabase | VuMarkDatabase]:
+    """Get the databases with the given server access key from the target
+    manager back-end.
+
+    Cloud databases are fetched without the images of their targets, so their
+    targets' statuses cannot be calculated.
+
+    Args:
+        server_access_key: The server access key given in a request.
+
+    Returns:
+        The cloud database and the VuMark database with the given server
+        access key, where there are any.
+    """
+    settings = VWS_SETTINGS.get()
+    quoted_key = urllib.parse.quote(string=server_access_key, safe="")
+    databases: list[CloudDatabase | VuMarkDatabase] = []
+    if not quoted_key:
+        return databases
+
+    target_manager = TARGET_MANAGER_CLIENT.in_process_target_manager(
+        base_url=settings.target_manager_base_url,
     )
-    return {
-        VuMarkDatabase.from_dict(database_dict=database_dict)
-        for database_dict in response.json()
-    }
+    if target_manager is not None:
+        for get_database in (
+            target_manager.get_cloud_database_by_server_access_key,
+            target_manager.get_vumark_database_by_server_access_key,
+        ):
+            with contextlib.suppress(KeyError):
+                databases.append(
+                    get_database(server_access_key=server_access_key),
+                )
+        return databases
+
+    cloud_response = TARGET_MANAGER_CLIENT.request(
+        method=HTTPMethod.GET,
+        url=(
+            f"{settings.target_manager_base_url}/cloud_databases/"
+            f"by_server_access_key/{quoted_key}"
+        ),
+        params={"include_images": "false"},
+    )
+    if cloud_response.status_code == HTTPStatus.OK:
+        databases.append(
+            CloudDatabase.from_dict(database_dict=cloud_response.json()),
+        )
+
+    vumark_response = TARGET_MANAGER_CLIENT.request(
+        method=HTTPMethod.GET,
+        url=(
+            f"{settings.target_manager_base_url}/vumark_databases/"
+            f"by_server_access_key/{quoted_key}"
+        ),
+    )
+    if vumark_response.status_code == HTTPStatus.OK:
+        databases.append(
+            VuMarkDatabase.from_dict(database_dict=vumark_response.json()),
+        )
+
+    return databases
 
 
-@beartype
+@internal_beartype
 def _flask_request_data() -> RequestData:
     """Return the current Flask request as shared request data."""
     return RequestData(
@@ -175,7 +430,7 @@ def _flask_request_data() -> RequestData:
     )
 
 
-@beartype
+@internal_beartype
 class _HTTPModelTargetDatasetStore:
     """Model Target dataset storage backed by the target manager
     service.
@@ -192,10 +447,9 @@ class _HTTPModelTargetDatasetStore:
     @property
     def model_target_datasets(self) -> dict[str, ModelTargetDataset]:
         """All Model Target datasets, keyed by UUID."""
-        timeout_seconds = 30
-        response = requests.get(
+        response = TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.GET,
             url=self._datasets_url,
-            timeout=timeout_seconds,
         )
         datasets = (
             ModelTargetDataset.from_dict(dataset_dict=dataset_dict)
@@ -208,25 +462,26 @@ class _HTTPModelTargetDatasetStore:
         model_target_dataset: ModelTargetDataset,
     ) -> None:
         """Add a Model Target dataset."""
-        timeout_seconds = 30
-        requests.post(
+        TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.POST,
             url=self._datasets_url,
             json=model_target_dataset.to_dict(),
-            timeout=timeout_seconds,
         )
 
     def remove_model_target_dataset(self, dataset_uuid: str) -> None:
         """Remove a Model Target dataset."""
-        timeout_seconds = 30
-        requests.delete(
+        TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.DELETE,
             url=f"{self._datasets_url}/{dataset_uuid}",
-            timeout=timeout_seconds,
         )
 
     @property
     def oauth2_client_credentials(self) -> dict[str, OAuth2ClientCredential]:
         """All dynamically created OAuth2 client credentials."""
-        response = requests.get(url=self._credentials_url, timeout=30)
+        response = TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.GET,
+            url=self._credentials_url,
+        )
         credentials = (
             OAuth2ClientCredential(
                 client_id=value["client_id"],
@@ -242,34 +497,34 @@ class _HTTPModelTargetDatasetStore:
         credential: OAuth2ClientCredential,
     ) -> None:
         """Add or replace an OAuth2 client credential."""
-        requests.post(
+        TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.POST,
             url=self._credentials_url,
             json={
                 "client_id": credential.client_id,
                 "client_secret": credential.client_secret,
                 "scopes": list(credential.scopes),
             },
-            timeout=30,
         )
 
     def remove_oauth2_client_credential(self, client_id: str) -> None:
         """Remove an OAuth2 client credential."""
-        requests.delete(
+        TARGET_MANAGER_CLIENT.request(
+            method=HTTPMethod.DELETE,
             url=f"{self._credentials_url}/{client_id}",
-            timeout=30,
         )
 
 
-@beartype
+@internal_beartype
 def _model_target_dataset_store() -> _HTTPModelTargetDatasetStore:
     """Return the dataset store backing the Model Target routes."""
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     return _HTTPModelTargetDatasetStore(
         base_url=settings.target_manager_base_url,
     )
 
 
-@beartype
+@internal_beartype
 class _InMemoryRecoCountsReportStore:
     """Reco counts report storage for this app instance.
 
@@ -304,7 +559,7 @@ class _InMemoryRecoCountsReportStore:
 _RECO_COUNTS_REPORT_STORE = _InMemoryRecoCountsReportStore()
 
 
-@beartype
+@internal_beartype
 def _to_flask_response(
     api_response: tuple[int, dict[str, str], str | bytes],
 ) -> Response:
@@ -314,7 +569,7 @@ def _to_flask_response(
 
 
 @VWS_FLASK_APP.before_request
-@beartype
+@internal_beartype
 def set_terminate_wsgi_input() -> None:
     """We set ``wsgi.input_terminated`` to ``True`` when going through
     ``requests`` in our tests, so that requests have the given ``Content-
@@ -341,7 +596,7 @@ def set_terminate_wsgi_input() -> None:
 
 
 @VWS_FLASK_APP.before_request
-@beartype
+@internal_beartype
 def validate_request() -> None:
     """Run validators on the request.
 
@@ -366,27 +621,28 @@ def validate_request() -> None:
         or request.path.startswith("/reports/recoCounts/")
     ):
         return
+    settings = VWS_SETTINGS.get()
     run_services_validators(
         request_headers=dict(request.headers),
         request_body=request.data,
         request_method=request.method,
         request_path=request.path,
         databases=get_all_cloud_databases(),
-        request_rate_limiter=_REQUEST_RATE_LIMITER,
+        request_rate_limiter=settings.request_rate_limit_backend,
     )
 
 
 @VWS_FLASK_APP.after_request
-@beartype
+@internal_beartype
 def add_response_delay(response: Response) -> Response:
     """Add a delay to each response."""
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     time.sleep(settings.response_delay_seconds)
     return response
 
 
 @VWS_FLASK_APP.errorhandler(code_or_exception=ValidatorError)
-@beartype
+@internal_beartype
 def handle_exceptions(exc: ValidatorError) -> Response:
     """Return the error response associated with the given exception."""
     response = Response(
@@ -402,7 +658,7 @@ def handle_exceptions(exc: ValidatorError) -> Response:
 
 @VWS_FLASK_APP.errorhandler(code_or_exception=HTTPStatus.NOT_FOUND)
 @VWS_FLASK_APP.errorhandler(code_or_exception=HTTPStatus.METHOD_NOT_ALLOWED)
-@beartype
+@internal_beartype
 def handle_unrouted_request(exc: NotFound | MethodNotAllowed) -> Response:
     """Return the real Vuforia 404 shape for an unrouted request.
 
@@ -443,7 +699,7 @@ def handle_unrouted_request(exc: NotFound | MethodNotAllowed) -> Response:
 
 
 @VWS_FLASK_APP.route(rule="/oauth2/token", methods=[HTTPMethod.POST])
-@beartype
+@internal_beartype
 def oauth2_token() -> Response:
     """Obtain an OAuth2 token for the Model Target Web API."""
     return _to_flask_response(
@@ -458,7 +714,7 @@ def oauth2_token() -> Response:
     rule="/oauth2/clientcredentials",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_oauth2_client_credential() -> Response:
     """Create an OAuth2 client credential."""
     return _to_flask_response(
@@ -473,7 +729,7 @@ def create_oauth2_client_credential() -> Response:
     rule="/oauth2/clientcredentials",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def list_oauth2_client_credentials() -> Response:
     """List OAuth2 client credentials."""
     return _to_flask_response(
@@ -488,7 +744,7 @@ def list_oauth2_client_credentials() -> Response:
     rule="/oauth2/clientcredentials/<string:client_id>/scopes",
     methods=[HTTPMethod.PUT],
 )
-@beartype
+@internal_beartype
 def update_oauth2_client_credential_scopes(client_id: str) -> Response:
     """Update an OAuth2 client credential's scopes."""
     return _to_flask_response(
@@ -504,7 +760,7 @@ def update_oauth2_client_credential_scopes(client_id: str) -> Response:
     rule="/oauth2/clientcredentials/<string:client_id>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_oauth2_client_credential(client_id: str) -> Response:
     """Delete an OAuth2 client credential."""
     return _to_flask_response(
@@ -520,10 +776,10 @@ def delete_oauth2_client_credential(client_id: str) -> Response:
     rule="/modeltargets/datasets",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_standard_model_target_dataset() -> Response:
     """Create a standard Model Target dataset."""
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     return _to_flask_response(
         api_response=create_model_target_dataset(
             request=_flask_request_data(),
@@ -543,10 +799,10 @@ def create_standard_model_target_dataset() -> Response:
     rule="/modeltargets/advancedDatasets",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def create_advanced_model_target_dataset() -> Response:
     """Create an advanced Model Target dataset."""
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     return _to_flask_response(
         api_response=create_model_target_dataset(
             request=_flask_request_data(),
@@ -566,7 +822,7 @@ def create_advanced_model_target_dataset() -> Response:
     rule="/modeltargets/datasets/<string:dataset_uuid>/status",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def get_standard_model_target_dataset_status(
     dataset_uuid: str,
 ) -> Response:
@@ -585,7 +841,7 @@ def get_standard_model_target_dataset_status(
     rule="/modeltargets/advancedDatasets/<string:dataset_uuid>/status",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def get_advanced_model_target_dataset_status(
     dataset_uuid: str,
 ) -> Response:
@@ -604,7 +860,7 @@ def get_advanced_model_target_dataset_status(
     rule="/modeltargets/datasets/<string:dataset_uuid>/dataset",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def download_standard_model_target_dataset(
     dataset_uuid: str,
 ) -> Response:
@@ -623,7 +879,7 @@ def download_standard_model_target_dataset(
     rule="/modeltargets/advancedDatasets/<string:dataset_uuid>/dataset",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def download_advanced_model_target_dataset(
     dataset_uuid: str,
 ) -> Response:
@@ -642,7 +898,7 @@ def download_advanced_model_target_dataset(
     rule="/modeltargets/datasets/<string:dataset_uuid>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_standard_model_target_dataset(dataset_uuid: str) -> Response:
     """Delete a standard Model Target dataset."""
     return _to_flask_response(
@@ -659,7 +915,7 @@ def delete_standard_model_target_dataset(dataset_uuid: str) -> Response:
     rule="/modeltargets/advancedDatasets/<string:dataset_uuid>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_advanced_model_target_dataset(dataset_uuid: str) -> Response:
     """Delete an advanced Model Target dataset."""
     return _to_flask_response(
@@ -676,7 +932,7 @@ def delete_advanced_model_target_dataset(dataset_uuid: str) -> Response:
     rule="/imagetargets/databases/<string:database_id>/reports/recoCounts",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def reco_counts_report(database_id: str) -> Response:
     """Request a reco counts report for a database.
 
@@ -686,7 +942,7 @@ def reco_counts_report(database_id: str) -> Response:
     # The database ID in the path is validated against the request's server
     # keys before the request reaches this route.
     del database_id
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     return _to_flask_response(
         api_response=create_reco_counts_report(
             request_body=request.data,
@@ -701,7 +957,7 @@ def reco_counts_report(database_id: str) -> Response:
     rule="/reports/recoCounts/<string:report_id>",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def download_reco_counts_report(report_id: str) -> Response:
     """Download a generated reco counts report.
 
@@ -717,14 +973,14 @@ def download_reco_counts_report(report_id: str) -> Response:
 
 
 @VWS_FLASK_APP.route(rule="/targets", methods=[HTTPMethod.POST])
-@beartype
+@internal_beartype
 def add_target() -> Response:
     """Add a target.
 
     Fake implementation of
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#add
     """
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     databases = get_all_cloud_databases()
     database = get_database_matching_server_keys(
         request_headers=dict(request.headers),
@@ -756,11 +1012,19 @@ def add_target() -> Response:
     )
 
     databases_url = f"{settings.target_manager_base_url}/cloud_databases"
-    timeout_seconds = 30
-    requests.post(
+    # The target is sent in the binary format so that its image is not
+    # inflated by base64 encoding.
+    wire_writer = BinaryWireWriter()
+    TARGET_MANAGER_CLIENT.request(
+        method=HTTPMethod.POST,
         url=f"{databases_url}/{database.database_name}/targets",
-        json=new_target.to_dict(),
-        timeout=timeout_seconds,
+        data=wire_writer.dumps(
+            document=wire_writer.target_to_dict(target=new_target),
+        ),
+        headers={
+            "Content-Type": wire_writer.media_type,
+            "Accept": BINARY_MEDIA_TYPE,
+        },
     )
 
     date = email.utils.formatdate(timeval=None, localtime=False, usegmt=True)
@@ -791,7 +1055,7 @@ def add_target() -> Response:
 @VWS_FLASK_APP.route(
     rule="/targets/<string:target_id>", methods=[HTTPMethod.GET]
 )
-@beartype
+@internal_beartype
 def get_target(target_id: str) -> Response:
     """Get details of a target.
 
@@ -851,14 +1115,14 @@ def get_target(target_id: str) -> Response:
     rule="/targets/<string:target_id>",
     methods=[HTTPMethod.DELETE],
 )
-@beartype
+@internal_beartype
 def delete_target(target_id: str) -> Response:
     """Delete a target.
 
     Fake implementation of
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#delete
     """
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     databases = get_all_cloud_databases()
     database = get_database_matching_server_keys(
         request_headers=dict(request.headers),
@@ -876,9 +1140,9 @@ def delete_target(target_id: str) -> Response:
         raise TargetStatusProcessingError
 
     databases_url = f"{settings.target_manager_base_url}/cloud_databases"
-    requests.delete(
+    TARGET_MANAGER_CLIENT.request(
+        method=HTTPMethod.DELETE,
         url=f"{databases_url}/{database.database_name}/targets/{target_id}",
-        timeout=30,
     )
 
     body = {
@@ -907,26 +1171,27 @@ def delete_target(target_id: str) -> Response:
     rule="/targets/<string:target_id>/instances",
     methods=[HTTPMethod.POST],
 )
-@beartype
+@internal_beartype
 def generate_vumark_instance(target_id: str) -> Response:
     """Generate a VuMark instance.
 
     Fake implementation of
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#generate-instance
     """
-    cloud_databases = get_all_cloud_databases()
-    vumark_databases = get_all_vumark_databases()
-    all_databases: list[CloudDatabase | VuMarkDatabase] = [
-        *cloud_databases,
-        *vumark_databases,
-    ]
+    all_databases = get_databases_by_server_access_key(
+        server_access_key=access_key_from_auth_header(
+            auth_header=request.headers.get(key="Authorization"),
+        )
+        or "",
+    )
+    settings = VWS_SETTINGS.get()
     run_services_validators(
         request_headers=dict(request.headers),
         request_body=request.data,
         request_method=request.method,
         request_path=request.path,
         databases=all_databases,
-        request_rate_limiter=_REQUEST_RATE_LIMITER,
+        request_rate_limiter=settings.request_rate_limit_backend,
     )
 
     database = get_database_matching_server_keys(
@@ -973,7 +1238,7 @@ def generate_vumark_instance(target_id: str) -> Response:
 
 
 @VWS_FLASK_APP.route(rule="/summary", methods=[HTTPMethod.GET])
-@beartype
+@internal_beartype
 def database_summary() -> Response:
     """Get a database summary report.
 
@@ -1029,7 +1294,7 @@ def database_summary() -> Response:
     rule="/summary/<string:target_id>",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def target_summary(target_id: str) -> Response:
     """Get a summary report for a target.
 
@@ -1087,7 +1352,7 @@ def target_summary(target_id: str) -> Response:
     rule="/duplicates/<string:target_id>",
     methods=[HTTPMethod.GET],
 )
-@beartype
+@internal_beartype
 def get_duplicates(target_id: str) -> Response:
     """Get targets which may be considered duplicates of a given target.
 
@@ -1095,7 +1360,7 @@ def get_duplicates(target_id: str) -> Response:
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#check
     """
     databases = get_all_cloud_databases()
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     database = get_database_matching_server_keys(
         request_headers=dict(request.headers),
         request_body=request.data,
@@ -1103,7 +1368,7 @@ def get_duplicates(target_id: str) -> Response:
         request_path=request.path,
         databases=databases,
     )
-    image_match_checker = settings.duplicates_image_matcher.to_image_matcher()
+    image_match_checker = settings.duplicates_match_checker
 
     (target,) = (
         target for target in database.targets if target.target_id == target_id
@@ -1147,7 +1412,7 @@ def get_duplicates(target_id: str) -> Response:
 
 
 @VWS_FLASK_APP.route(rule="/targets", methods=[HTTPMethod.GET])
-@beartype
+@internal_beartype
 def target_list() -> Response:
     """Get a list of all targets.
 
@@ -1162,15 +1427,17 @@ def target_list() -> Response:
         request_path=request.path,
         databases=databases,
     )
-    results = [
-        target.target_id
-        for target in sorted_targets(targets=database.not_deleted_targets)
-    ]
+    page = target_list_page(
+        ordered_targets=_sorted_not_deleted_targets(database=database),
+        request_headers=dict(request.headers),
+    )
 
+    # The target IDs are made only as they are sent.
+    target_ids = page.target_ids()
     body = {
         "transaction_id": uuid.uuid4().hex,
         "result_code": ResultCodes.SUCCESS.value,
-        "results": results,
+        "results": target_ids,
     }
     date = email.utils.formatdate(timeval=None, localtime=False, usegmt=True)
     headers = {
@@ -1183,9 +1450,20 @@ def target_list() -> Response:
         "x-aws-region": "us-east-2, us-west-2",
         "x-content-type-options": "nosniff",
     }
+    if page.next_cursor is not None:
+        headers[TARGET_LIST_NEXT_CURSOR_HEADER] = page.next_cursor
+
+    settings = VWS_SETTINGS.get()
+    if settings.stream_target_lists:
+        return Response(
+            status=HTTPStatus.OK,
+            response=_streamed_json_chunks(body=body, list_key="results"),
+            headers=headers,
+        )
+
     return Response(
         status=HTTPStatus.OK,
-        response=json_dump(body=body),
+        response=json_dump(body={**body, "results": list(target_ids)}),
         headers=headers,
     )
 
@@ -1193,14 +1471,14 @@ def target_list() -> Response:
 @VWS_FLASK_APP.route(
     rule="/targets/<string:target_id>", methods=[HTTPMethod.PUT]
 )
-@beartype
+@internal_beartype
 def update_target(target_id: str) -> Response:
     """Update a target.
 
     Fake implementation of
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#update
     """
-    settings = VWSSettings.model_validate(obj={})
+    settings = VWS_SETTINGS.get()
     # We do not use ``request.get_json(force=True)`` because this only works
     # when the content type is given as ``application/json``.
     request_json = json.loads(s=request.data)
@@ -1260,7 +1538,11 @@ def update_target(target_id: str) -> Response:
         f"{settings.target_manager_base_url}/cloud_databases/"
         f"{database.database_name}/targets/{target_id}"
     )
-    requests.put(url=put_url, json=update_values, timeout=30)
+    TARGET_MANAGER_CLIENT.request(
+        method=HTTPMethod.PUT,
+        url=put_url,
+        json=update_values,
+    )
 
     date = email.utils.formatdate(timeval=None, localtime=False, usegmt=True)
     headers = {
@@ -1285,5 +1567,5 @@ def update_target(target_id: str) -> Response:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    SETTINGS = VWSSettings.model_validate(obj={})
+    SETTINGS = VWS_SETTINGS.get()
     VWS_FLASK_APP.run(host=SETTINGS.vws_host)
@@ -0,0 +1,378 @@
+"""Formats for sending databases and targets to and from the target manager.
+
+JSON carries each target image as base64 text inside the document. The binary
+format carries the same document, but with each target's ``image_base64``
+replaced by the SHA-256 digest of the image, followed by each distinct image
+as raw bytes. This avoids inflating images by a third, and avoids encoding and
+decoding them.
+
+A binary body is a sequence of parts, each prefixed by its length as a 4 byte
+big-endian unsigned integer. The first part is the UTF-8 encoded JSON
+document. Each image then follows as two parts: its digest, and its content.
+"""
+
+import base64
+import copy
+import json
+import struct
+from collections.abc import Mapping
+from typing import Any, Protocol, runtime_checkable
+
+from mock_vws._type_checks import internal_beartype
+from mock_vws.database import CloudDatabase, CloudDatabaseDict
+from mock_vws.target import ImageTarget, ImageTargetDict
+
+JSON_MEDIA_TYPE = "application/json"
+BINARY_MEDIA_TYPE = "application/vnd.mock-vws.binary"
+
+_LENGTH_PREFIX = struct.Struct(">I")
+
+
+@runtime_checkable
+class WireWriter(Protocol):
+    """Protocol for a writer of one request or response body."""
+
+    @property
+    def media_type(self) -> str:
+        """The media type of the body."""
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def target_to_dict(self, target: ImageTarget) -> ImageTargetDict:
+        """Dump a target to a dictionary to include in the document.
+
+        Args:
+            target: The target to dump.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def cloud_database_to_dict(
+        self,
+        database: CloudDatabase,
+    ) -> CloudDatabaseDict:
+        """Dump a cloud database to a dictionary to include in the document.
+
+        Args:
+            database: The database to dump.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def dumps(self, document: object) -> bytes:
+        """Dump a document which includes dictionaries from this writer.
+
+        Args:
+            document: A document which can be dumped as JSON.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+
+@runtime_checkable
+class WireReader(Protocol):
+    """Protocol for a reader of one request or response body."""
+
+    @property
+    def document(self) -> Any:  # noqa: ANN401
+        """The document in the body."""
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def image_from_dict(self, target_dict: Mapping[str, Any]) -> bytes:
+        """Load only the image of a target from a dictionary in the document.
+
+        Args:
+            target_dict: A dictionary from the document which has an
+                ``image_base64`` key.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def target_from_dict(self, target_dict: ImageTargetDict) -> ImageTarget:
+        """Load a target from a dictionary in the document.
+
+        Args:
+            target_dict: A target dictionary from the document.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def cloud_database_from_dict(
+        self,
+        database_dict: CloudDatabaseDict,
+    ) -> CloudDatabase:
+        """Load a cloud database from a dictionary in the document.
+
+        Args:
+            database_dict: A cloud database dictionary from the document.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+
+@internal_beartype
+class JSONWireWriter:
+    """A writer of JSON bodies."""
+
+    @property
+    def media_type(self) -> str:
+        """The media type of the body."""
+        return JSON_MEDIA_TYPE
+
+    def target_to_dict(self, target: ImageTarget) -> ImageTargetDict:
+        """Dump a target to a dictionary to include in the document.
+
+        Args:
+            target: The target to dump.
+        """
+        return target.to_dict(include_post_processing_tracking_rating=True)
+
+    def cloud_database_to_dict(
+        self,
+        database: CloudDatabase,
+    ) -> CloudDatabaseDict:
+        """Dump a cloud database to a dictionary to include in the document.
+
+        Args:
+            database: The database to dump.
+        """
+        return database.to_dict(include_post_processing_tracking_ratings=True)
+
+    def dumps(self, document: object) -> bytes:
+        """Dump a document as JSON.
+
+        Args:
+            document: A document which can be dumped as JSON.
+        """
+        return json.dumps(obj=document).encode()
+
+
+@internal_beartype
+class BinaryWireWriter:
+    """A writer of binary bodies.
+
+    A writer collects the images of the targets which it dumps, so a new
+    writer must be used for each body.
+    """
+
+    def __init__(self) -> None:
+        """Create a writer which has no images yet."""
+        self._images: dict[str, bytes] = {}
+
+    @property
+    def media_type(self) -> str:
+        """The media type of the body."""
+        return BINARY_MEDIA_TYPE
+
+    def target_to_dict(self, target: ImageTarget) -> ImageTargetDict:
+        """Dump a target to a dictionary to include in the document.
+
+        Args:
+            target: The target to dump.
+        """
+        digest = target.image_digest
+        self._images[digest] = target.image_value
+        target_dict = target.to_dict(
+            include_image=False,
+            include_post_processing_tracking_rating=True,
+        )
+        target_dict["image_base64"] = digest
+        return target_dict
+
+    def cloud_database_to_dict(
+        self,
+        database: CloudDatabase,
+    ) -> CloudDatabaseDict:
+        """Dump a cloud database to a dictionary to include in the document.
+
+        Args:
+            database: The database to dump.
+        """
+        database_without_targets: CloudDatabase = copy.replace(
+            database,  # pyrefly: ignore[bad-argument-type]
+            targets=set[ImageTarget](),
+        )
+        database_dict = database_without_targets.to_dict()
+        database_dict["targets"] = [
+            self.target_to_dict(target=target) for target in database.targets
+        ]
+        return database_dict
+
+    def dumps(self, document: object) -> bytes:
+        """Dump a document, followed by the images of the targets in it.
+
+        Args:
+            document: A document which can be dumped as JSON.
+        """
+        parts = [json.dumps(obj=document).encode()]
+        for digest, image in self._images.items():
+            parts.extend((digest.encode(), image))
+        return b"".join(
+            _LENGTH_PREFIX.pack(len(part)) + part for part in parts
+        )
+
+
+@internal_beartype
+class JSONWireReader:
+    """A reader of JSON bodies."""
+
+    def __init__(self, *, content: bytes) -> None:
+        """
+        Args:
+            content: The body to read.
+        """
+        self._document = json.loads(s=content)
+
+    @property
+    def document(self) -> Any:  # noqa: ANN401
+        """The document in the body."""
+        return self._document
+
+    def image_from_dict(self, target_dict: Mapping[str, Any]) -> bytes:
+        """Load only the image of a target from a dictionary in the document.
+
+        Args:
+            target_dict: A dictionary from the document which has an
+                ``image_base64`` key.
+        """
+        return base64.b64decode(s=target_dict["image_base64"])
+
+    def target_from_dict(self, target_dict: ImageTargetDict) -> ImageTarget:
+        """Load a target from a dictionary in the document.
+
+        Args:
+            target_dict: A target dictionary from the document.
+        """
+        return ImageTarget.from_dict(target_dict=target_dict)
+
+    def cloud_database_from_dict(
+        self,
+        database_dict: CloudDatabaseDict,
+    ) -> CloudDatabase:
+        """Load a cloud database from a dictionary in the document.
+
+        Args:
+            database_dict: A cloud database dictionary from the document.
+        """
+        return CloudDatabase.from_dict(database_dict=database_dict)
+
+
+@internal_beartype
+class BinaryWireReader:
+    """A reader of binary bodies."""
+
+    def __init__(self, *, content: bytes) -> None:
+        """
+        Args:
+            content: The body to read.
+
+        Raises:
+            ValueError: The body is not a valid binary body.
+        """
+        parts: list[bytes] = []
+        offset = 0
+        while offset < len(content):
+            try:
+                (length,) = _LENGTH_PREFIX.unpack_from(content, offset)
+            except struct.error as exc:
+                msg = "The binary body is not complete."
+                raise ValueError(msg) from exc
+            offset += _LENGTH_PREFIX.size
+            parts.append(content[offset : offset + length])
+            offset += length
+
+        if not parts or len(parts) % 2 != 1 or offset != len(content):
+            msg = "The binary body is not complete."
+            raise ValueError(msg)
+
+        document_part, *image_parts = parts
+        self._document = json.loads(s=document_part)
+        self._images = {
+            digest.decode(): image
+            for digest, image in zip(
+                image_parts[::2],
+                image_parts[1::2],
+                strict=True,
+            )
+        }
+
+    @property
+    def document(self) -> Any:  # noqa: ANN401
+        """The document in the body."""
+        return self._document
+
+    def image_from_dict(self, target_dict: Mapping[str, Any]) -> bytes:
+        """Load only the image of a target from a dictionary in the document.
+
+        Args:
+            target_dict: A dictionary from the document which has an
+                ``image_base64`` key, which holds the digest of the image.
+
+        Raises:
+            KeyError: The body does not include an image with the digest.
+        """
+        return self._images[target_dict["image_base64"]]
+
+    def target_from_dict(self, target_dict: ImageTargetDict) -> ImageTarget:
+        """Load a target from a dictionary in the document.
+
+        Args:
+            target_dict: A target dictionary from the document.
+        """
+        image_value = self.image_from_dict(target_dict=target_dict)
+        target_without_image = ImageTarget.from_dict(
+            target_dict={**target_dict, "image_base64": ""},
+        )
+        target: ImageTarget = copy.replace(
+            target_without_image,  # pyrefly: ignore[bad-argument-type]
+            image_value=image_value,
+        )
+        return target
+
+    def cloud_database_from_dict(
+        self,
+        database_dict: CloudDatabaseDict,
+    ) -> CloudDatabase:
+        """Load a cloud database from a dictionary in the document.
+
+        Args:
+            database_dict: A cloud database dictionary from the document.
+        """
+        database_without_targets = CloudDatabase.from_dict(
+            database_dict={**database_dict, "targets": []},
+        )
+        database: CloudDatabase = copy.replace(
+            database_without_targets,  # pyrefly: ignore[bad-argument-type]
+            targets={
+                self.target_from_dict(target_dict=target_dict)
+                for target_dict in database_dict["targets"]
+            },
+        )
+        return database
+
+
+@internal_beartype
+def wire_reader(*, content: bytes, content_type: str) -> WireReader:
+    """Get a reader for a body of the given content type.
+
+    Args:
+        content: The body to read.
+        content_type: The ``Content-Type`` header given with the body.
+
+    Returns:
+        A binary reader for a binary body, otherwise a JSON reader.
+    """
+    media_type, _, _ = content_type.partition(";")
+    media_type = media_type.strip()
+    if media_type == BINARY_MEDIA_TYPE:
+        return BinaryWireReader(content=content)
+    return JSONWireReader(content=content)
@@ -1,15 +1,17 @@
 """Common utilities for creating mock routes."""
 
+import base64
+import bisect
+import datetime
 import email.utils
 import json
 import uuid
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
-from beartype import beartype
-
 from mock_vws._constants import ResultCodes
+from mock_vws._type_checks import internal_beartype
 from mock_vws.target import ImageTarget
 
 # A database ID as it appears in the path of a reco counts report request.
@@ -21,8 +23,15 @@ RECO_COUNTS_REPORT_PATH_PATTERN = (
 # The path which stands in for a reco counts report presigned URL.
 RECO_COUNTS_DOWNLOAD_PATH_PATTERN = "/reports/recoCounts/[A-Za-z0-9]+"
 
+# Request headers which clients can send to ``GET /targets`` to list targets a
+# page at a time. These are not part of the Vuforia Web Services API.
+TARGET_LIST_PAGE_SIZE_HEADER = "X-Mock-Page-Size"
+TARGET_LIST_CURSOR_HEADER = "X-Mock-Cursor"
+# The response header which gives the cursor for the next page of targets.
+TARGET_LIST_NEXT_CURSOR_HEADER = "X-Mock-Next-Cursor"
+
 
-@beartype
+@internal_beartype
 class MissingSchemeError(Exception):
     """Raised when a URL is missing a schema."""
 
@@ -45,7 +54,7 @@ class MissingSchemeError(Exception):
         )
 
 
-@beartype
+@internal_beartype
 @dataclass(frozen=True, kw_only=True)
 class RequestData:
     """A library-agnostic representation of an HTTP request.
@@ -63,7 +72,7 @@ class RequestData:
     body: bytes
 
 
-@beartype
+@internal_beartype
 @dataclass(frozen=True, kw_only=True)
 class Route:
     """A representation of a VWS route.
@@ -73,14 +82,17 @@ class Route:
         path_pattern: The end part of a URL pattern. E.g. `/targets` or
             `/targets/.+`.
         http_methods: HTTP methods that map to the route function.
+        changes_targets: Whether the route function changes the targets of
+            a database in place.
     """
 
     route_name: str
     path_pattern: str
     http_methods: Iterable[str]
+    changes_targets: bool = False
 
 
-@beartype
+@internal_beartype
 def sorted_targets(*, targets: Iterable[ImageTarget]) -> list[ImageTarget]:
     """Put targets into a deterministic order.
 
@@ -94,13 +106,149 @@ def sorted_targets(*, targets: Iterable[ImageTarget]) -> list[ImageTarget]:
     Returns:
         The given targets, ordered by upload date and then by target ID.
     """
-    return sorted(
-        targets,
-        key=lambda target: (target.upload_date, target.target_id),
+    return sorted(targets, key=_target_order_key)
+
+
+@internal_beartype
+@dataclass(frozen=True, kw_only=True)
+class TargetListPage:
+    """A page of the targets listed by ``GET /targets``.
+
+    Args:
+        ordered_targets: All targets which can be listed, in order.
+        start: The index in ``ordered_targets`` of the first target on the
+            page.
+        end: The index in ``ordered_targets`` after the last target on the
+            page.
+        next_cursor: The cursor to send to get the next page, or ``None`` if
+            this is the last page.
+    """
+
+    ordered_targets: Sequence[ImageTarget]
+    start: int
+    end: int
+    next_cursor: str | None
+
+    def target_ids(self) -> Iterator[str]:
+        """Iterate over the IDs of the targets on the page, in order.
+
+        The targets are not copied, so a page can be sent without holding
+        all of its target IDs at once.
+        """
+        for index in range(self.start, self.end):
+            yield self.ordered_targets[index].target_id
+
+
+@internal_beartype
+def _target_order_key(target: ImageTarget) -> tuple[datetime.datetime, str]:
+    """Return the key which :func:`sorted_targets` orders a target by."""
+    return (target.upload_date, target.target_id)
+
+
+@internal_beartype
+def _cursor_after(*, target: ImageTarget) -> str:
+    """Return a cursor for the targets which come after the given target."""
+    upload_date, target_id = _target_order_key(target=target)
+    cursor_json = json.dumps(obj=[upload_date.isoformat(), target_id])
+    return base64.urlsafe_b64encode(s=cursor_json.encode()).decode()
+
+
+@internal_beartype
+def _cursor_order_key(*, cursor: str) -> tuple[datetime.datetime, str] | None:
+    """Return the order key which a cursor was made from, or ``None`` if the
+    cursor was not made by :func:`_cursor_after`.
+    """
+    try:
+        upload_date_string, target_id = json.loads(
+            s=base64.urlsafe_b64decode(s=cursor.encode()),
+        )
+        upload_date = datetime.datetime.fromisoformat(upload_date_string)
+    except ValueError, TypeError:
+        return None
+    # Upload dates have time zones, and cannot be compared with dates which
+    # do not.
+    if upload_date.tzinfo is None:
+        return None
+    return (upload_date, str(object=target_id))
+
+
+@internal_beartype
+def _header_value(*, request_headers: Mapping[str, str], name: str) -> str:
+    """Return the value of a request header, or an empty string if it was not
+    sent.
+
+    Header names are matched without regard to case.
+    """
+    return next(
+        (
+            value
+            for key, value in request_headers.items()
+            if key.lower() == name.lower()
+        ),
+        "",
+    )
+
+
+@internal_beartype
+def target_list_page(
+    *,
+    ordered_targets: Sequence[ImageTarget],
+    request_headers: Mapping[str, str],
+) -> TargetListPage:
+    """Get the page of targets which a ``GET /targets`` request asks for.
+
+    Clients can send the :data:`TARGET_LIST_PAGE_SIZE_HEADER` header to get
+    at most that many targets, and the :data:`TARGET_LIST_CURSOR_HEADER`
+    header with a cursor from an earlier page to get the targets after that
+    page. Without these headers, which are not part of the Vuforia Web
+    Services API, every target is listed. Invalid values are ignored.
+
+    Args:
+        ordered_targets: All targets which can be listed, in the order given
+            by :func:`sorted_targets`. Callers which list the same targets
+            more than once can sort them once and give them here each time.
+        request_headers: The headers sent with the request.
+
+    Returns:
+        The page of targets.
+    """
+    start = 0
+    cursor = _header_value(
+        request_headers=request_headers,
+        name=TARGET_LIST_CURSOR_HEADER,
+    )
+    cursor_order_key = _cursor_order_key(cursor=cursor) if cursor else None
+    if cursor_order_key is not None:
+        start = bisect.bisect_right(
+            ordered_targets,
+            cursor_order_key,
+            key=_target_order_key,
+        )
+
+    end = len(ordered_targets)
+    page_size = _header_value(
+        request_headers=request_headers,
+        name=TARGET_LIST_PAGE_SIZE_HEADER,
+    )
+    # ``isdigit`` is true for characters such as superscript digits, which
+    # ``int`` does not accept.
+    if page_size.isascii() and page_size.isdecimal() and int(page_size) > 0:
+        end = min(end, start + int(page_size))
+
+    next_cursor = (
+        _cursor_after(target=ordered_targets[end - 1])
+        if start < end < len(ordered_targets)
+        else None
+    )
+    return TargetListPage(
+        ordered_targets=ordered_targets,
+        start=start,
+        end=end,
+        next_cursor=next_cursor,
     )
 
 
-@beartype
+@internal_beartype
 def result_code_response_text(*, result_code: ResultCodes) -> str:
     """
     Args:
@@ -116,7 +264,7 @@ def result_code_response_text(*, result_code: ResultCodes) -> str:
     return json_dump(body=body)
 
 
-@beartype
+@internal_beartype
 def http_date() -> str:
     """
     Returns:
@@ -125,7 +273,7 @@ def http_date() -> str:
     return email.utils.formatdate(timeval=None, localtime=False, usegmt=True)
 
 
-@beartype
+@internal_beartype
 def json_dump(*, body: dict[str, Any]) -> str:
     """
     Returns:
@@ -6,16 +6,16 @@ import json
 import secrets
 import uuid
 import zipfile
+from collections.abc import Mapping
 from http import HTTPStatus
 from typing import Any, Protocol, runtime_checkable
 from urllib.parse import parse_qs
 
-from beartype import beartype
-
 from mock_vws._mock_common import RequestData, json_dump
 from mock_vws._services_validators.exceptions import (
     ContentLengthHeaderNotIntError,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.model_target import (
     ModelTargetDataset,
     ModelTargetDatasetType,
@@ -32,7 +32,7 @@ class ModelTargetDatasetStore(Protocol):
     """Storage for Model Target datasets."""
 
     @property
-    def model_target_datasets(self) -> dict[str, ModelTargetDataset]:
+    def model_target_datasets(self) -> Mapping[str, ModelTargetDataset]:
         """All Model Target datasets, keyed by UUID."""
         # We disable a pylint warning here because the ellipsis is required
         # for pyright to recognize this as a protocol.
@@ -54,7 +54,9 @@ class ModelTargetDatasetStore(Protocol):
         ...  # pylint: disable=unnecessary-ellipsis
 
     @property
-    def oauth2_client_credentials(self) -> dict[str, OAuth2ClientCredential]:
+    def oauth2_client_credentials(
+        self,
+    ) -> Mapping[str, OAuth2ClientCredential]:
         """All dynamically created OAuth2 client credentials."""
         ...  # pylint: disable=unnecessary-ellipsis
 
@@ -140,7 +142,7 @@ _ADVANCED_MODEL_ENUM_FIELD_VALUES: dict[str, frozenset[str]] = {
 }
 
 
-@beartype
+@internal_beartype
 def _json_response(
     *,
     status_code: HTTPStatus,
@@ -158,7 +160,7 @@ def _json_response(
     )
 
 
-@beartype
+@internal_beartype
 def _error_response(
     *,
     status_code: HTTPStatus,
@@ -176,7 +178,7 @@ def _error_response(
     return _json_response(status_code=status_code, body={"error": error})
 
 
-@beartype
+@internal_beartype
 def _validation_error_response(
     *,
     details: list[dict[str, str]],
@@ -197,7 +199,7 @@ def _validation_error_response(
     )
 
 
-@beartype
+@internal_beartype
 def _oauth2_error_response(
     *,
     status_code: HTTPStatus,
@@ -207,7 +209,7 @@ def _oauth2_error_response(
     return _json_response(status_code=status_code, body=body)
 
 
-@beartype
+@internal_beartype
 def _get_header(request: RequestData, name: str) -> str | None:
     """Return a request header, case-insensitively."""
     lower_name = name.casefold()
@@ -217,7 +219,7 @@ def _get_header(request: RequestData, name: str) -> str | None:
     return None
 
 
-@beartype
+@internal_beartype
 def _content_length_error(request: RequestData) -> _ResponseType | None:
     """Return an error response if ``Content-Length`` is not an integer.
 
@@ -243,7 +245,7 @@ def _content_length_error(request: RequestData) -> _ResponseType | None:
     return None
 
 
-@beartype
+@internal_beartype
 def _basic_auth_credentials(auth_header: str | None) -> tuple[str, str] | None:
     """Return HTTP Basic credentials from an authorization header."""
     if auth_header is None or not auth_header.startswith("Basic "):
@@ -265,7 +267,7 @@ def _basic_auth_credentials(auth_header: str | None) -> tuple[str, str] | None:
     return client_id, client_secret
 
 
-@beartype
+@internal_beartype
 def _jwt_header_error(*, bearer_token: str) -> str | None:
     """Return the Vuforia error for an invalid JSON Web Token header."""
     encoded_header = bearer_token.partition(".")[0]
@@ -289,7 +291,7 @@ def _jwt_header_error(*, bearer_token: str) -> str | None:
     return None
 
 
-@beartype
+@internal_beartype
 def _jwt_payload_error(*, bearer_token: str) -> str | None:
     """Return the Vuforia error for an invalid JSON Web Token payload."""
     encoded_payload = bearer_token.split(sep=".")[1]
@@ -309,7 +311,7 @@ def _jwt_payload_error(*, bearer_token: str) -> str | None:
     return None
 
 
-@beartype
+@internal_beartype
 def _jwt_signature_error(*, bearer_token: str) -> str | None:
     """Return the Vuforia error for an invalid JSON Web Token
     signature.
@@ -331,7 +333,7 @@ def _jwt_signature_error(*, bearer_token: str) -> str | None:
     return None
 
 
-@beartype
+@internal_beartype
 def _jwt_scopes(*, bearer_token: str) -> frozenset[str]:
     """Return scopes from a valid mock JSON Web Token."""
     encoded_payload = bearer_token.split(sep=".")[1]
@@ -349,7 +351,7 @@ def _jwt_scopes(*, bearer_token: str) -> frozenset[str]:
     return frozenset(scope.split())
 
 
-@beartype
+@internal_beartype
 def _require_bearer_token(
     request: RequestData,
     dataset_type: ModelTargetDatasetType,
@@ -413,7 +415,7 @@ def _require_bearer_token(
     return None
 
 
-@beartype
+@internal_beartype
 def _require_state_based_scope(
     request: RequestData,
     dataset_type: ModelTargetDatasetType,
@@ -439,7 +441,7 @@ def _require_state_based_scope(
     )
 
 
-@beartype
+@internal_beartype
 def _fake_jwt(*, token_source: bytes, scopes: frozenset[str]) -> str:
     """Return a deterministic bearer token for the mock."""
 
@@ -473,7 +475,7 @@ def _fake_jwt(*, token_source: bytes, scopes: frozenset[str]) -> str:
     return f"{header}.{payload}.mock-signature"
 
 
-@beartype
+@internal_beartype
 def oauth2_token(  # noqa: PLR0911  # pylint: disable=too-many-return-statements
     *,
     request: RequestData,
@@ -578,7 +580,7 @@ def oauth2_token(  # noqa: PLR0911  # pylint: disable=too-many-return-statements
     )
 
 
-@beartype
+@internal_beartype
 def _require_client_credentials_scope(
     request: RequestData,
 ) -> _ResponseType | None:
@@ -631,7 +633,7 @@ def _require_client_credentials_scope(
     return None
 
 
-@beartype
+@internal_beartype
 def _client_credential_not_found(*, client_id: str) -> _ResponseType:
     """Return Vuforia's missing-client-credential response."""
     return _error_response(
@@ -643,7 +645,7 @@ def _client_credential_not_found(*, client_id: str) -> _ResponseType:
     )
 
 
-@beartype
+@internal_beartype
 def _string_list(value: object) -> list[str] | None:
     """Return a string list when ``value`` contains only strings."""
     if not isinstance(value, list):
@@ -656,7 +658,7 @@ def _string_list(value: object) -> list[str] | None:
     return strings
 
 
-@beartype
+@internal_beartype
 def create_oauth2_client_credential(
     *,
     request: RequestData,
@@ -704,7 +706,7 @@ def create_oauth2_client_credential(
     )
 
 
-@beartype
+@internal_beartype
 def list_oauth2_client_credentials(
     *,
     request: RequestData,
@@ -729,7 +731,7 @@ def list_oauth2_client_credentials(
     )
 
 
-@beartype
+@internal_beartype
 def update_oauth2_client_credential_scopes(
     *,
     request: RequestData,
@@ -769,7 +771,7 @@ def update_oauth2_client_credential_scopes(
     )
 
 
-@beartype
+@internal_beartype
 def delete_oauth2_client_credential(
     *,
     request: RequestData,
@@ -786,13 +788,13 @@ def delete_oauth2_client_credential(
     return HTTPStatus.NO_CONTENT, {"Content-Length": "0"}, ""
 
 
-@beartype
+@internal_beartype
 def _is_json_object(*, value: object) -> bool:
     """Return whether a decoded JSON value is an object."""
     return isinstance(value, dict)
 
 
-@beartype
+@internal_beartype
 def _load_request_json(request: RequestData) -> dict[str, Any] | _ResponseType:
     """Load a Model Target dataset creation request body."""
     content_type = _get_header(request=request, name="Content-Type") or ""
@@ -826,7 +828,7 @@ def _load_request_json(request: RequestData) -> dict[str, Any] | _ResponseType:
     return request_json
 
 
-@beartype
+@internal_beartype
 def _cad_data_source_details(*, models: list[Any]) -> list[dict[str, str]]:
     """Return validation details for each model's CAD data source.
 
@@ -859,7 +861,7 @@ def _cad_data_source_details(*, models: list[Any]) -> list[dict[str, str]]:
     ]
 
 
-@beartype
+@internal_beartype
 def _model_field_details(
     *,
     models: list[Any],
@@ -970,7 +972,7 @@ def _model_field_details(
     return enum_details + views_details
 
 
-@beartype
+@internal_beartype
 def _view_details(*, models: list[Any]) -> list[dict[str, str]]:
     """Return validation details for the guide views of each model."""
     views = [
@@ -1034,7 +1036,7 @@ def _view_details(*, models: list[Any]) -> list[dict[str, str]]:
     return name_details + position_details
 
 
-@beartype
+@internal_beartype
 def _is_json_number(*, value: object) -> bool:
     """Return whether a decoded JSON value is a number.
 
@@ -1044,7 +1046,7 @@ def _is_json_number(*, value: object) -> bool:
     return isinstance(value, int | float) and not isinstance(value, bool)
 
 
-@beartype
+@internal_beartype
 def _guide_view_position_details(
     *,
     models: list[Any],
@@ -1103,7 +1105,7 @@ def _guide_view_position_details(
     ]
 
 
-@beartype
+@internal_beartype
 def _configuration_states(
     *,
     model_index: int,
@@ -1142,7 +1144,7 @@ def _configuration_states(
     return state_names, None
 
 
-@beartype
+@internal_beartype
 def _state_based_details(*, models: list[Any]) -> list[dict[str, str]]:
     """Return validation details for State-Based Model Targets."""
     state_fields = [
@@ -1227,7 +1229,7 @@ def _state_based_details(*, models: list[Any]) -> list[dict[str, str]]:
     return details
 
 
-@beartype
+@internal_beartype
 def _model_count_details(
     *,
     models: list[Any],
@@ -1278,7 +1280,7 @@ def _model_count_details(
     return []
 
 
-@beartype
+@internal_beartype
 def _top_level_details(
     *,
     request_json: dict[str, Any],
@@ -1317,7 +1319,7 @@ def _top_level_details(
     return type_details
 
 
-@beartype
+@internal_beartype
 def _validate_dataset_request(
     *,
     request_json: dict[str, Any],
@@ -1355,7 +1357,7 @@ def _validate_dataset_request(
     return None
 
 
-@beartype
+@internal_beartype
 def create_model_target_dataset(
     *,
     request: RequestData,
@@ -1425,7 +1427,7 @@ def create_model_target_dataset(
     )
 
 
-@beartype
+@internal_beartype
 def _unknown_dataset_response(*, dataset_uuid: str) -> _ResponseType:
     """Return the error for a dataset which is not visible to a route."""
     return _error_response(
@@ -1439,7 +1441,7 @@ def _unknown_dataset_response(*, dataset_uuid: str) -> _ResponseType:
     )
 
 
-@beartype
+@internal_beartype
 def _find_dataset(
     *,
     dataset_store: ModelTargetDatasetStore,
@@ -1449,7 +1451,7 @@ def _find_dataset(
     return dataset_store.model_target_datasets.get(dataset_uuid)
 
 
-@beartype
+@internal_beartype
 def get_model_target_dataset_status(
     *,
     request: RequestData,
@@ -1480,7 +1482,7 @@ def get_model_target_dataset_status(
     )
 
 
-@beartype
+@internal_beartype
 def _dataset_zip_bytes(dataset: ModelTargetDataset) -> bytes:
     """Return a deterministic Vuforia-shaped generated dataset zip."""
     zip_buffer = io.BytesIO()
@@ -1516,7 +1518,7 @@ def _dataset_zip_bytes(dataset: ModelTargetDataset) -> bytes:
     return zip_buffer.getvalue()
 
 
-@beartype
+@internal_beartype
 def download_model_target_dataset(
     *,
     request: RequestData,
@@ -1566,7 +1568,7 @@ def download_model_target_dataset(
     )
 
 
-@beartype
+@internal_beartype
 def delete_model_target_dataset(
     *,
     request: RequestData,
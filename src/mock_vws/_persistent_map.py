@@ -0,0 +1,344 @@
+"""An immutable mapping which is changed by making new versions of it.
+
+A new version shares almost all of its structure with the version which it
+was made from, so making one takes time in proportion to the logarithm of the
+number of items, with a base of 32, rather than to the number of items.
+This is a hash array mapped trie, like the one which backs
+:mod:`contextvars`.
+"""
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Self, override
+
+from mock_vws._type_checks import internal_beartype
+
+# Each level of the trie uses this many bits of the hash of a key.
+_BITS_PER_LEVEL = 5
+_LEVEL_MASK = (1 << _BITS_PER_LEVEL) - 1
+# Hashes are made non-negative so that every level has bits to use. Keys
+# whose hashes are equal after this are kept in a collision node.
+_HASH_MASK = (1 << 64) - 1
+
+# The nodes of the trie, and the functions which change them, are not
+# decorated with ``beartype``. They are used only by ``PersistentMap``, whose
+# methods are checked, and they are called once for each level of the trie
+# on each change.
+
+
+@dataclass(frozen=True, slots=True)
+class _Leaf[K, V]:
+    """An item, with the hash of its key."""
+
+    key_hash: int
+    key: K
+    value: V
+
+
+@dataclass(frozen=True, slots=True)
+class _Collision[K, V]:
+    """Items whose keys have the same hash."""
+
+    key_hash: int
+    leaves: tuple[_Leaf[K, V], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class _Branch[K, V]:
+    """Nodes which are found by the bits of key hashes at one level.
+
+    Bit ``n`` of ``bitmap`` is set if there is a child for the hash bits
+    ``n``. Children are in the order of their bits.
+    """
+
+    bitmap: int
+    children: tuple[_Node[K, V], ...]
+
+
+type _Node[K, V] = _Leaf[K, V] | _Collision[K, V] | _Branch[K, V]
+
+
+def _bit(*, key_hash: int, shift: int) -> int:
+    """Get the bit of a branch bitmap for a key hash at a level."""
+    return 1 << ((key_hash >> shift) & _LEVEL_MASK)
+
+
+def _child_index(*, bitmap: int, bit: int) -> int:
+    """Get the index in a branch's children of the child for a bit."""
+    return (bitmap & (bit - 1)).bit_count()
+
+
+def _merge[K, V](
+    *,
+    first: _Leaf[K, V] | _Collision[K, V],
+    second: _Leaf[K, V] | _Collision[K, V],
+    shift: int,
+) -> _Node[K, V]:
+    """Make a node which holds two nodes with different key hashes."""
+    first_bit = _bit(key_hash=first.key_hash, shift=shift)
+    second_bit = _bit(key_hash=second.key_hash, shift=shift)
+    if first_bit == second_bit:
+        child = _merge(
+            first=first,
+            second=second,
+            shift=shift + _BITS_PER_LEVEL,
+        )
+        return _Branch(bitmap=first_bit, children=(child,))
+    children = (first, second) if first_bit < second_bit else (second, first)
+    return _Branch(bitmap=first_bit | second_bit, children=children)
+
+
+def _get[K, V](*, node: _Node[K, V], key_hash: int, key: K) -> V:
+    """Get the value of a key in a node.
+
+    Raises:
+        KeyError: The key is not in the node.
+    """
+    shift = 0
+    while isinstance(node, _Branch):
+        bit = _bit(key_hash=key_hash, shift=shift)
+        if not node.bitmap & bit:
+            raise KeyError(key)
+        node = node.children[_child_index(bitmap=node.bitmap, bit=bit)]
+        shift += _BITS_PER_LEVEL
+    leaves = (node,) if isinstance(node, _Leaf) else node.leaves
+    for leaf in leaves:
+        if leaf.key_hash == key_hash and leaf.key == key:
+            return leaf.value
+    raise KeyError(key)
+
+
+def _set[K, V](
+    *,
+    node: _Node[K, V],
+    leaf: _Leaf[K, V],
+    shift: int,
+) -> tuple[_Node[K, V], bool]:
+    """Make a version of a node with an item added or replaced.
+
+    Returns:
+        The new node, and whether the item was added rather than replaced.
+    """
+    if isinstance(node, _Branch):
+        bit = _bit(key_hash=leaf.key_hash, shift=shift)
+        index = _child_index(bitmap=node.bitmap, bit=bit)
+        children = node.children
+        if not node.bitmap & bit:
+            return (
+                _Branch(
+                    bitmap=node.bitmap | bit,
+                    children=(*children[:index], leaf, *children[index:]),
+                ),
+                True,
+            )
+        child, added = _set(
+            node=children[index],
+            leaf=leaf,
+            shift=shift + _BITS_PER_LEVEL,
+        )
+        return (
+            _Branch(
+                bitmap=node.bitmap,
+                children=(*children[:index], child, *children[index + 1 :]),
+            ),
+            added,
+        )
+
+    if node.key_hash != leaf.key_hash:
+        return _merge(first=node, second=leaf, shift=shift), True
+
+    leaves = (node,) if isinstance(node, _Leaf) else node.leaves
+    for index, existing_leaf in enumerate(leaves):
+        if existing_leaf.key == leaf.key:
+            new_leaves = (*leaves[:index], leaf, *leaves[index + 1 :])
+            if len(new_leaves) == 1:
+                return leaf, False
+            return (
+                _Collision(key_hash=leaf.key_hash, leaves=new_leaves),
+                False,
+            )
+    return _Collision(key_hash=leaf.key_hash, leaves=(*leaves, leaf)), True
+
+
+def _delete[K, V](
+    *,
+    node: _Node[K, V],
+    key_hash: int,
+    key: K,
+    shift: int,
+) -> _Node[K, V] | None:
+    """Make a version of a node without an item.
+
+    Returns:
+        The new node, or ``None`` if the node would be empty.
+
+    Raises:
+        KeyError: The key is not in the node.
+    """
+    if isinstance(node, _Branch):
+        bit = _bit(key_hash=key_hash, shift=shift)
+        if not node.bitmap & bit:
+            raise KeyError(key)
+        index = _child_index(bitmap=node.bitmap, bit=bit)
+        children = node.children
+        child = _delete(
+            node=children[index],
+            key_hash=key_hash,
+            key=key,
+            shift=shift + _BITS_PER_LEVEL,
+        )
+        if child is not None:
+            return _Branch(
+                bitmap=node.bitmap,
+                children=(*children[:index], child, *children[index + 1 :]),
+            )
+        remaining = (*children[:index], *children[index + 1 :])
+        if not remaining:
+            return None
+        # Leaves and collision nodes are found by comparing whole hashes,
+        # so a lone one can move up to where its branch was.
+        if len(remaining) == 1 and not isinstance(remaining[0], _Branch):
+            return remaining[0]
+        return _Branch(bitmap=node.bitmap & ~bit, children=remaining)
+
+    return _delete_leaf(node=node, key_hash=key_hash, key=key)
+
+
+def _delete_leaf[K, V](
+    *,
+    node: _Leaf[K, V] | _Collision[K, V],
+    key_hash: int,
+    key: K,
+) -> _Node[K, V] | None:
+    """Make a version of a leaf or collision node without an item.
+
+    Returns:
+        The new node, or ``None`` if the node would be empty.
+
+    Raises:
+        KeyError: The key is not in the node.
+    """
+    leaves = (node,) if isinstance(node, _Leaf) else node.leaves
+    remaining_leaves = tuple(
+        leaf
+        for leaf in leaves
+        if not (leaf.key_hash == key_hash and leaf.key == key)
+    )
+    if len(remaining_leaves) == len(leaves):
+        raise KeyError(key)
+    if not remaining_leaves:
+        return None
+    if len(remaining_leaves) == 1:
+        return remaining_leaves[0]
+    return _Collision(key_hash=key_hash, leaves=remaining_leaves)
+
+
+def _leaves[K, V](*, node: _Node[K, V]) -> Iterator[_Leaf[K, V]]:
+    """Get every item in a node."""
+    if isinstance(node, _Leaf):
+        yield node
+    elif isinstance(node, _Collision):
+        yield from node.leaves
+    else:
+        for child in node.children:
+            yield from _leaves(node=child)
+
+
+@internal_beartype
+class PersistentMap[K, V](Mapping[K, V]):
+    """An immutable mapping with methods which make changed versions of it.
+
+    Looking up a key, and making a version with one item added, replaced or
+    removed, take time in proportion to the logarithm of the number of
+    items, with a base of 32.
+    """
+
+    __slots__ = ("_length", "_root")
+
+    def __init__(self) -> None:
+        """Create an empty mapping."""
+        self._root: _Node[K, V] | None = None
+        self._length = 0
+
+    def _with_root(self, *, root: _Node[K, V] | None, length: int) -> Self:
+        """Make a mapping which has the given items."""
+        new_map = type(self)()
+        new_map._root = root  # noqa: SLF001
+        new_map._length = length  # noqa: SLF001
+        return new_map
+
+    def set(self, key: K, value: V) -> Self:
+        """Make a version of this mapping with an item added or replaced.
+
+        Args:
+            key: The key of the item.
+            value: The value of the item.
+
+        Returns:
+            The new version.
+        """
+        leaf = _Leaf(key_hash=hash(key) & _HASH_MASK, key=key, value=value)
+        if self._root is None:
+            return self._with_root(root=leaf, length=1)
+        root, added = _set(node=self._root, leaf=leaf, shift=0)
+        return self._with_root(root=root, length=self._length + added)
+
+    def delete(self, key: K) -> Self:
+        """Make a version of this mapping without an item.
+
+        Args:
+            key: The key of the item.
+
+        Returns:
+            The new version.
+
+        Raises:
+            KeyError: The key is not in this mapping.
+        """
+        if self._root is None:
+            raise KeyError(key)
+        root = _delete(
+            node=self._root,
+            key_hash=hash(key) & _HASH_MASK,
+            key=key,
+            shift=0,
+        )
+        return self._with_root(root=root, length=self._length - 1)
+
+    def discard(self, key: K) -> Self:
+        """Make a version of this mapping without an item, if the item is in
+        this mapping.
+
+        Args:
+            key: The key of the item.
+
+        Returns:
+            The new version, or this mapping if the key is not in it.
+        """
+        try:
+            return self.delete(key=key)
+        except KeyError:
+            return self
+
+    @override
+    def __getitem__(self, key: K) -> V:
+        """Get the value of a key.
+
+        Raises:
+            KeyError: The key is not in this mapping.
+        """
+        if self._root is None:
+            raise KeyError(key)
+        return _get(node=self._root, key_hash=hash(key) & _HASH_MASK, key=key)
+
+    @override
+    def __iter__(self) -> Iterator[K]:
+        """Iterate over the keys, in no particular order."""
+        if self._root is not None:
+            for leaf in _leaves(node=self._root):
+                yield leaf.key
+
+    @override
+    def __len__(self) -> int:
+        """The number of items."""
+        return self._length
@@ -7,18 +7,18 @@ from collections.abc import Iterable, Mapping
 from email.message import EmailMessage
 from typing import Any
 
-from beartype import beartype
 from werkzeug.formparser import MultiPartParser
 
 from mock_vws._base64_decoding import decode_base64
 from mock_vws._constants import ResultCodes, TargetStatuses
 from mock_vws._database_matchers import get_database_matching_client_keys
 from mock_vws._mock_common import json_dump, sorted_targets
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 from mock_vws.image_matchers import ImageMatcher
 
 
-@beartype
+@internal_beartype
 def get_query_match_response_text(
     *,
     request_headers: Mapping[str, str],
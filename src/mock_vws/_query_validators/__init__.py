@@ -2,8 +2,7 @@
 
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 
 from .accept_header_validators import validate_accept_header
@@ -38,7 +37,7 @@ from .num_results_validators import validate_max_num_results
 from .project_state_validators import validate_project_state
 
 
-@beartype
+@internal_beartype
 def run_query_validators(
     *,
     request_path: str,
@@ -3,14 +3,13 @@
 import logging
 from collections.abc import Mapping
 
-from beartype import beartype
-
 from mock_vws._query_validators.exceptions import InvalidAcceptHeaderError
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_accept_header(*, request_headers: Mapping[str, str]) -> None:
     """Validate the accept header.
 
@@ -3,20 +3,19 @@
 import logging
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
 from mock_vws._database_matchers import get_database_matching_client_keys
 from mock_vws._query_validators.exceptions import (
     AuthenticationFailureError,
     AuthHeaderMissingError,
     MalformedAuthHeaderError,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_auth_header_exists(*, request_headers: Mapping[str, str]) -> None:
     """Validate that there is an authorization header given to the query
     endpoint.
@@ -34,7 +33,7 @@ def validate_auth_header_exists(*, request_headers: Mapping[str, str]) -> None:
     raise AuthHeaderMissingError
 
 
-@beartype
+@internal_beartype
 def validate_auth_header_number_of_parts(
     *,
     request_headers: Mapping[str, str],
@@ -59,7 +58,7 @@ def validate_auth_header_number_of_parts(
     raise MalformedAuthHeaderError
 
 
-@beartype
+@internal_beartype
 def validate_client_key_exists(
     *,
     request_headers: Mapping[str, str],
@@ -86,7 +85,7 @@ def validate_client_key_exists(
     raise AuthenticationFailureError
 
 
-@beartype
+@internal_beartype
 def validate_auth_header_has_signature(
     *,
     request_headers: Mapping[str, str],
@@ -107,7 +106,7 @@ def validate_auth_header_has_signature(
     raise MalformedAuthHeaderError
 
 
-@beartype
+@internal_beartype
 def validate_authorization(
     *,
     request_path: str,
@@ -3,18 +3,17 @@
 import logging
 from collections.abc import Mapping
 
-from beartype import beartype
-
 from mock_vws._query_validators.exceptions import (
     AuthenticationFailureGoodFormattingError,
     ContentLengthHeaderNotIntError,
     ContentLengthHeaderTooLargeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_content_length_header_is_int(
     *,
     request_headers: Mapping[str, str],
@@ -37,7 +36,7 @@ def validate_content_length_header_is_int(
         raise ContentLengthHeaderNotIntError from exc
 
 
-@beartype
+@internal_beartype
 def validate_content_length_header_not_too_large(
     *,
     request_headers: Mapping[str, str],
@@ -63,7 +62,7 @@ def validate_content_length_header_not_too_large(
         raise ContentLengthHeaderTooLargeError
 
 
-@beartype
+@internal_beartype
 def validate_content_length_header_not_too_small(
     *,
     request_headers: Mapping[str, str],
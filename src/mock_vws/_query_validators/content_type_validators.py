@@ -4,19 +4,18 @@ import logging
 from collections.abc import Mapping
 from email.message import EmailMessage
 
-from beartype import beartype
-
 from mock_vws._query_validators.exceptions import (
     ImageNotGivenError,
     NoBoundaryFoundError,
     NoContentTypeError,
     UnsupportedMediaTypeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_content_type_header(
     *,
     request_headers: Mapping[str, str],
@@ -6,18 +6,17 @@ import logging
 from collections.abc import Mapping
 from zoneinfo import ZoneInfo
 
-from beartype import beartype
-
 from mock_vws._query_validators.exceptions import (
     DateFormatNotValidError,
     DateHeaderNotGivenError,
     RequestTimeTooSkewedError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_date_header_given(*, request_headers: Mapping[str, str]) -> None:
     """Validate the date header is given to the query endpoint.
 
@@ -34,7 +33,7 @@ def validate_date_header_given(*, request_headers: Mapping[str, str]) -> None:
     raise DateHeaderNotGivenError
 
 
-@beartype
+@internal_beartype
 def _accepted_date_formats() -> set[str]:
     """Return all known accepted date formats.
 
@@ -53,7 +52,7 @@ def _accepted_date_formats() -> set[str]:
     )
 
 
-@beartype
+@internal_beartype
 def validate_date_format(*, request_headers: Mapping[str, str]) -> None:
     """Validate the format of the date header given to the query endpoint.
 
@@ -74,7 +73,7 @@ def validate_date_format(*, request_headers: Mapping[str, str]) -> None:
     raise DateFormatNotValidError
 
 
-@beartype
+@internal_beartype
 def validate_date_in_range(*, request_headers: Mapping[str, str]) -> None:
     """Validate date in the date header given to the query endpoint.
 
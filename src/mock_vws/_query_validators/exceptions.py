@@ -6,10 +6,9 @@ from collections.abc import Mapping
 from http import HTTPStatus
 from typing import Final
 
-from beartype import beartype
-
 from mock_vws._constants import ResultCodes
 from mock_vws._mock_common import http_date, result_code_response_text
+from mock_vws._type_checks import internal_beartype
 
 # The headers which the cloud recognition API gives with an error response,
 # apart from those which depend on the response itself.
@@ -29,7 +28,7 @@ _TEXT_HEADERS: Final[Mapping[str, str]] = {
 }
 
 
-@beartype
+@internal_beartype
 def _unusual_separators_response_text(
     *,
     result_code: ResultCodes,
@@ -55,7 +54,7 @@ def _unusual_separators_response_text(
     )
 
 
-@beartype
+@internal_beartype
 class ValidatorError(Exception):
     """
     A base class for exceptions thrown from mock Vuforia cloud
@@ -68,7 +67,7 @@ class ValidatorError(Exception):
     headers: Mapping[str, str]
 
 
-@beartype
+@internal_beartype
 class DateHeaderNotGivenError(ValidatorError):
     """Exception raised when a date header is not given."""
 
@@ -84,7 +83,7 @@ class DateHeaderNotGivenError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class DateFormatNotValidError(ValidatorError):
     """Exception raised when the date format is not valid."""
 
@@ -101,7 +100,7 @@ class DateFormatNotValidError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class RequestTimeTooSkewedError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'RequestTimeTooSkewed'.
@@ -121,7 +120,7 @@ class RequestTimeTooSkewedError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class BadImageError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'BadImage'.
@@ -142,7 +141,7 @@ class BadImageError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class AuthenticationFailureError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'AuthenticationFailure'.
@@ -164,7 +163,7 @@ class AuthenticationFailureError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class AuthenticationFailureGoodFormattingError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'AuthenticationFailure' with a standard JSON formatting.
@@ -185,7 +184,7 @@ class AuthenticationFailureGoodFormattingError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ImageNotGivenError(ValidatorError):
     """Exception raised when an image is not given."""
 
@@ -201,7 +200,7 @@ class ImageNotGivenError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class AuthHeaderMissingError(ValidatorError):
     """Exception raised when an auth header is not given."""
 
@@ -218,7 +217,7 @@ class AuthHeaderMissingError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class MalformedAuthHeaderError(ValidatorError):
     """Exception raised when an auth header is not given."""
 
@@ -235,7 +234,7 @@ class MalformedAuthHeaderError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class UnknownParametersError(ValidatorError):
     """Exception raised when unknown parameters are given."""
 
@@ -251,7 +250,7 @@ class UnknownParametersError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InactiveProjectError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'InactiveProject'.
@@ -272,7 +271,7 @@ class InactiveProjectError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InvalidMaxNumResultsError(ValidatorError):
     """Exception raised when an invalid value is given as the
     "max_num_results"
@@ -297,7 +296,7 @@ class InvalidMaxNumResultsError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class MaxNumResultsOutOfRangeError(ValidatorError):
     """Exception raised when an integer value is given as the
     "max_num_results"
@@ -322,7 +321,7 @@ class MaxNumResultsOutOfRangeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InvalidIncludeTargetDataError(ValidatorError):
     """Exception raised when an invalid value is given as the
     "include_target_data" field.
@@ -348,7 +347,7 @@ class InvalidIncludeTargetDataError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class UnsupportedMediaTypeError(ValidatorError):
     """Exception raised when no boundary is found for multipart data."""
 
@@ -364,7 +363,7 @@ class UnsupportedMediaTypeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InvalidAcceptHeaderError(ValidatorError):
     """Exception raised when there is an invalid accept header given."""
 
@@ -380,7 +379,7 @@ class InvalidAcceptHeaderError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class NoBoundaryFoundError(ValidatorError):
     """Exception raised when an invalid media type is given."""
 
@@ -397,7 +396,7 @@ class NoBoundaryFoundError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ContentLengthHeaderTooLargeError(ValidatorError):
     """
     Exception raised when the given content length header is too
@@ -416,7 +415,7 @@ class ContentLengthHeaderTooLargeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ContentLengthHeaderNotIntError(ValidatorError):
     """
     Exception raised when the given content length header is not an
@@ -434,7 +433,7 @@ class ContentLengthHeaderNotIntError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class RequestEntityTooLargeError(ValidatorError):
     """Exception raised when the given image file size is too large."""
 
@@ -465,7 +464,7 @@ class RequestEntityTooLargeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class NoContentTypeError(ValidatorError):
     """
     Exception raised when a content type is either not given or is
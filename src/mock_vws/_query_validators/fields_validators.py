@@ -5,15 +5,15 @@ import logging
 from collections.abc import Mapping
 from email.message import EmailMessage
 
-from beartype import beartype
 from werkzeug.formparser import MultiPartParser
 
 from mock_vws._query_validators.exceptions import UnknownParametersError
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_extra_fields(
     *,
     request_headers: Mapping[str, str],
@@ -5,7 +5,6 @@ import logging
 from collections.abc import Mapping
 from email.message import EmailMessage
 
-from beartype import beartype
 from werkzeug.datastructures import FileStorage, MultiDict
 from werkzeug.formparser import MultiPartParser
 
@@ -15,11 +14,12 @@ from mock_vws._query_validators.exceptions import (
     ImageNotGivenError,
     RequestEntityTooLargeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def _parse_multipart_files(
     *,
     request_headers: Mapping[str, str],
@@ -46,7 +46,7 @@ def _parse_multipart_files(
     return files
 
 
-@beartype
+@internal_beartype
 def validate_image_field_given(
     *,
     request_headers: Mapping[str, str],
@@ -72,7 +72,7 @@ def validate_image_field_given(
     raise ImageNotGivenError
 
 
-@beartype
+@internal_beartype
 def validate_image_file_size(
     *,
     request_headers: Mapping[str, str],
@@ -107,7 +107,7 @@ def validate_image_file_size(
         raise RequestEntityTooLargeError
 
 
-@beartype
+@internal_beartype
 def validate_image_dimensions(
     *,
     request_headers: Mapping[str, str],
@@ -140,7 +140,7 @@ def validate_image_dimensions(
     raise BadImageError
 
 
-@beartype
+@internal_beartype
 def validate_image_format(
     *,
     request_headers: Mapping[str, str],
@@ -168,7 +168,7 @@ def validate_image_format(
     raise BadImageError
 
 
-@beartype
+@internal_beartype
 def validate_image_is_image(
     *,
     request_headers: Mapping[str, str],
@@ -5,18 +5,18 @@ import logging
 from collections.abc import Mapping
 from email.message import EmailMessage
 
-from beartype import beartype
 from werkzeug.formparser import MultiPartParser
 
 from mock_vws._query_validators.exceptions import (
     InvalidMaxNumResultsError,
     MaxNumResultsOutOfRangeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_max_num_results(
     *,
     request_headers: Mapping[str, str],
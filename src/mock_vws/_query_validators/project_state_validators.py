@@ -3,17 +3,16 @@
 import logging
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
 from mock_vws._database_matchers import get_database_matching_client_keys
 from mock_vws._query_validators.exceptions import InactiveProjectError
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 from mock_vws.states import States
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_project_state(
     *,
     request_path: str,
@@ -6,15 +6,15 @@ import json
 import logging
 import re
 import uuid
+from collections.abc import Mapping
 from http import HTTPStatus
 from typing import Any, Protocol, runtime_checkable
 from zoneinfo import ZoneInfo
 
-from beartype import beartype
-
 from mock_vws._constants import ResultCodes
 from mock_vws._mock_common import json_dump
 from mock_vws._services_validators.exceptions import FailError
+from mock_vws._type_checks import internal_beartype
 from mock_vws.reco_counts import RecoCountsReport
 
 _ResponseType = tuple[int, dict[str, str], str | bytes]
@@ -27,7 +27,7 @@ class RecoCountsReportStore(Protocol):
     """Storage for generated reco counts reports."""
 
     @property
-    def reco_counts_reports(self) -> dict[str, RecoCountsReport]:
+    def reco_counts_reports(self) -> Mapping[str, RecoCountsReport]:
         """All reco counts reports, keyed by report identifier."""
         # We disable a pylint warning here because the ellipsis is required
         # for pyright to recognize this as a protocol.
@@ -43,7 +43,7 @@ class RecoCountsReportStore(Protocol):
         ...  # pylint: disable=unnecessary-ellipsis
 
 
-@beartype
+@internal_beartype
 def _headers(*, content_type: str, content_length: int) -> dict[str, str]:
     """Return response headers which match other VWS endpoints."""
     date = email.utils.formatdate(timeval=None, localtime=False, usegmt=True)
@@ -60,7 +60,7 @@ def _headers(*, content_type: str, content_length: int) -> dict[str, str]:
     }
 
 
-@beartype
+@internal_beartype
 def _download_headers(
     *, content_type: str, content_length: int
 ) -> dict[str, str]:
@@ -77,7 +77,7 @@ def _download_headers(
     }
 
 
-@beartype
+@internal_beartype
 def _months_in_range() -> set[str]:
     """Return the months which a report can be requested for.
 
@@ -92,7 +92,7 @@ def _months_in_range() -> set[str]:
     }
 
 
-@beartype
+@internal_beartype
 def create_reco_counts_report(
     *,
     request_body: bytes,
@@ -151,7 +151,7 @@ def create_reco_counts_report(
     return HTTPStatus.OK, headers, body_json
 
 
-@beartype
+@internal_beartype
 def download_reco_counts_report(
     *,
     report_store: RecoCountsReportStore,
@@ -9,8 +9,6 @@ from collections.abc import Callable, Iterable, Mapping
 from http import HTTPMethod, HTTPStatus
 from typing import ParamSpec, Protocol, runtime_checkable
 
-from beartype import beartype
-
 from mock_vws._mock_common import RequestData, Route
 from mock_vws._query_tools import (
     get_query_match_response_text,
@@ -19,6 +17,8 @@ from mock_vws._query_validators import run_query_validators
 from mock_vws._query_validators.exceptions import (
     ValidatorError,
 )
+from mock_vws._route_table import RouteTable
+from mock_vws._type_checks import internal_beartype
 from mock_vws.cloud_query import CloudQueryFailureResponse
 from mock_vws.image_matchers import ImageMatcher
 from mock_vws.target_manager import TargetManager
@@ -40,7 +40,7 @@ class _RouteMethod(Protocol[_P]):
         ...  # pylint: disable=unnecessary-ellipsis
 
 
-@beartype
+@internal_beartype
 def route(
     *,
     path_pattern: str,
@@ -79,7 +79,7 @@ def route(
     return decorator
 
 
-@beartype
+@internal_beartype
 class MockVuforiaWebQueryAPI:
     """A fake implementation of the Vuforia Web Query API."""
 
@@ -149,3 +149,7 @@ class MockVuforiaWebQueryAPI:
             "Content-Length": str(object=len(response_text)),
         }
         return HTTPStatus.OK, headers, response_text
+
+
+# The routes are compiled once, and shared by every mock.
+ROUTE_TABLE = RouteTable(routes=_ROUTES)
@@ -28,10 +28,12 @@ from mock_vws._database_matchers import get_database_matching_server_keys
 from mock_vws._mock_common import (
     RECO_COUNTS_DOWNLOAD_PATH_PATTERN,
     RECO_COUNTS_REPORT_PATH_PATTERN,
+    TARGET_LIST_NEXT_CURSOR_HEADER,
     RequestData,
     Route,
     json_dump,
     sorted_targets,
+    target_list_page,
 )
 from mock_vws._model_target_web_api import (
     create_model_target_dataset,
@@ -48,6 +50,7 @@ from mock_vws._reco_counts_web_api import (
     create_reco_counts_report,
     download_reco_counts_report,
 )
+from mock_vws._route_table import RouteTable
 from mock_vws._services_validators import run_services_validators
 from mock_vws._services_validators.exceptions import (
     FailError,
@@ -57,6 +60,10 @@ from mock_vws._services_validators.exceptions import (
     TargetStatusProcessingError,
     ValidatorError,
 )
+from mock_vws._type_checks import (
+    INTERNAL_BEARTYPE_STRATEGY,
+    internal_beartype,
+)
 from mock_vws.database import VuMarkDatabase
 from mock_vws.image_matchers import ImageMatcher
 from mock_vws.model_target import (
@@ -93,11 +100,12 @@ class _RouteMethod(Protocol[_P]):
         ...  # pylint: disable=unnecessary-ellipsis
 
 
-@beartype
+@internal_beartype
 def route(
     *,
     path_pattern: str,
     http_methods: Iterable[HTTPMethod],
+    changes_targets: bool = False,
 ) -> Callable[[_RouteMethod[_P]], _RouteMethod[_P]]:
     """Register a decorated method so that it can be recognized as a route.
 
@@ -105,12 +113,14 @@ def route(
         path_pattern: The end part of a URL pattern. E.g. `/targets` or
           `/targets/.+`.
         http_methods: HTTP methods that map to the route function.
+        changes_targets: Whether the method changes the targets of a
+          database in place.
 
     Returns:
         A decorator which takes methods and makes them recognizable as routes.
     """
 
-    @beartype
+    @internal_beartype
     def decorator(
         method: _RouteMethod[_P],
     ) -> _RouteMethod[_P]:
@@ -125,6 +135,7 @@ def route(
             route_name=method.__name__,
             path_pattern=path_pattern,
             http_methods=frozenset(http_methods),
+            changes_targets=changes_targets,
         )
         _ROUTES.add(new_route)
 
@@ -133,7 +144,12 @@ def route(
     return decorator
 
 
-@beartype(conf=BeartypeConf(is_pep484_tower=True))
+@beartype(
+    conf=BeartypeConf(
+        is_pep484_tower=True,
+        strategy=INTERNAL_BEARTYPE_STRATEGY,
+    ),
+)
 class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
     """A fake implementation of the Vuforia Web Services API."""
 
@@ -472,6 +488,7 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
     @route(
         path_pattern="/targets",
         http_methods={HTTPMethod.POST},
+        changes_targets=True,
     )
     def add_target(self, request: RequestData) -> _ResponseType:
         """Add a target.
@@ -548,6 +565,7 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
     @route(
         path_pattern=f"/targets/{_TARGET_ID_PATTERN}",
         http_methods={HTTPMethod.DELETE},
+        changes_targets=True,
     )
     def delete_target(self, request: RequestData) -> _ResponseType:
         """Delete a target.
@@ -800,14 +818,18 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
             usegmt=True,
         )
 
-        response_results = [
-            target.target_id
-            for target in sorted_targets(targets=database.not_deleted_targets)
-        ]
+        # The targets of a database in this mock are changed in place, so
+        # there is no version of them to keep their order for.
+        page = target_list_page(
+            ordered_targets=sorted_targets(
+                targets=database.not_deleted_targets,
+            ),
+            request_headers=request.headers,
+        )
         body = {
             "transaction_id": uuid.uuid4().hex,
             "result_code": ResultCodes.SUCCESS.value,
-            "results": response_results,
+            "results": list(page.target_ids()),
         }
         body_json = json_dump(body=body)
         headers = {
@@ -821,6 +843,8 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
             "x-aws-region": "us-east-2, us-west-2",
             "x-content-type-options": "nosniff",
         }
+        if page.next_cursor is not None:
+            headers[TARGET_LIST_NEXT_CURSOR_HEADER] = page.next_cursor
         return HTTPStatus.OK, headers, body_json
 
     @route(
@@ -968,6 +992,7 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
     @route(
         path_pattern=f"/targets/{_TARGET_ID_PATTERN}",
         http_methods={HTTPMethod.PUT},
+        changes_targets=True,
     )
     def update_target(self, request: RequestData) -> _ResponseType:
         """Update a target.
@@ -1057,6 +1082,8 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
             application_metadata=application_metadata,
             image_value=image_value,
             last_modified_date=last_modified_date,
+            # An updated target is processed again.
+            post_processing_status=None,
         )
 
         database.targets.remove(target)
@@ -1148,3 +1175,7 @@ class MockVuforiaWebServicesAPI:  # pylint: disable=too-many-public-methods
         }
 
         return HTTPStatus.OK, headers, body_json
+
+
+# The routes are compiled once, and shared by every mock.
+ROUTE_TABLE = RouteTable(routes=_ROUTES)
@@ -1,22 +1,53 @@
 """Helpers for mocking Vuforia with httpx via respx."""
 
-import re
-from collections.abc import Callable, Mapping
-from typing import Protocol
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine, Mapping
+from contextvars import ContextVar
+from typing import Any, override
 from urllib.parse import urlparse
 
 import httpx
 import respx
 
-from mock_vws._mock_common import RequestData, Route
+from mock_vws._mock_common import RequestData
+from mock_vws._requests_mock_server.mock_web_query_api import (
+    ROUTE_TABLE as VWQ_ROUTE_TABLE,
+)
+from mock_vws._requests_mock_server.mock_web_services_api import (
+    ROUTE_TABLE as VWS_ROUTE_TABLE,
+)
 
 _ResponseType = tuple[int, Mapping[str, str], str | bytes]
 
+# Whether the request being handled was made with an asynchronous client.
+# respx calls side effects in the same way for both kinds of client, and
+# awaits what a side effect returns only for an asynchronous client.
+_HANDLING_ASYNC_REQUEST: ContextVar[bool] = ContextVar(
+    "_HANDLING_ASYNC_REQUEST",
+    default=False,
+)
 
-class _APIHandler(Protocol):
-    """An API handler with mock routes."""
 
-    routes: set[Route]
+class _MockRouter(respx.MockRouter):
+    """A router whose side effects can tell whether they are handling a
+    request made with an asynchronous client.
+    """
+
+    @override
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        """Handle a request made with an asynchronous client.
+
+        Args:
+            request: The request to handle.
+
+        Returns:
+            The mocked response.
+        """
+        token = _HANDLING_ASYNC_REQUEST.set(True)
+        try:
+            return await super().async_handler(request)
+        finally:
+            _HANDLING_ASYNC_REQUEST.reset(token)
 
 
 def _to_request_data(
@@ -60,28 +91,115 @@ def _block_unmatched(request: httpx.Request) -> httpx.Response:
     )
 
 
+def _read_timeout(request: httpx.Request) -> float | None:
+    """Get the read timeout of a request.
+
+    Args:
+        request: The httpx request.
+
+    Returns:
+        The read timeout, or ``None`` if there is none.
+    """
+    timeout_info: dict[str, float | None] = request.extensions.get(
+        "timeout", {}
+    )
+    return timeout_info.get("read")
+
+
+def _to_httpx_response(response: _ResponseType) -> httpx.Response:
+    """Convert a handler's return value to an httpx.Response.
+
+    Args:
+        response: The status code, headers and body of the response.
+
+    Returns:
+        The response as an httpx.Response.
+    """
+    status_code, headers, body = response
+    if isinstance(body, str):
+        body = body.encode()
+    return httpx.Response(
+        status_code=status_code,
+        headers=headers,
+        content=body,
+    )
+
+
+async def _handle_async(
+    *,
+    handler: Callable[[RequestData], _ResponseType],
+    request: httpx.Request,
+    request_data: RequestData,
+    delay_seconds: float,
+    async_sleep_fn: Callable[[float], Awaitable[None]],
+) -> httpx.Response:
+    """Handle a request made with an asynchronous client without blocking
+    the event loop.
+
+    The handler runs on the event loop's default executor, and the response
+    delay is awaited, so other requests are handled in the meantime.
+
+    Args:
+        handler: A handler that takes a RequestData and returns a
+            response tuple.
+        request: The httpx request to handle.
+        request_data: The request, converted for the handler.
+        delay_seconds: The number of seconds to delay the response by.
+        async_sleep_fn: The function to await for delays.
+
+    Returns:
+        An httpx.Response built from the handler's return value.
+
+    Raises:
+        Exception: A timeout error is raised when the response
+            delay exceeds the read timeout.
+    """
+    read_timeout = _read_timeout(request=request)
+    if read_timeout is not None and delay_seconds > read_timeout:
+        await async_sleep_fn(read_timeout)
+        raise httpx.ReadTimeout(
+            message="Response delay exceeded read timeout",
+            request=request,
+        )
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(None, handler, request_data)
+    await async_sleep_fn(delay_seconds)
+    return _to_httpx_response(response=response)
+
+
 def _make_respx_callback(
     *,
     handler: Callable[[RequestData], _ResponseType],
     base_path: str,
     delay_seconds: float,
     sleep_fn: Callable[[float], None],
-) -> Callable[[httpx.Request], httpx.Response]:
+    async_sleep_fn: Callable[[float], Awaitable[None]],
+) -> Callable[
+    [httpx.Request],
+    httpx.Response | Coroutine[Any, Any, httpx.Response],
+]:
     """Create a respx-compatible callback from a handler.
 
     Args:
         handler: A handler that takes a RequestData and returns a
-            response tuple.
+            response tuple. This must be safe to call from several threads
+            at once.
         base_path: The base path prefix to strip from the request path.
         delay_seconds: The number of seconds to delay the response by.
-        sleep_fn: The function to use for sleeping during delays.
+        sleep_fn: The function to use for sleeping during delays of
+            requests made with a synchronous client.
+        async_sleep_fn: The function to await for delays of requests made
+            with an asynchronous client.
 
     Returns:
         A callback that takes an httpx.Request and returns an
-        httpx.Response.
+        httpx.Response, or for a request made with an asynchronous client,
+        a coroutine which returns one.
     """
 
-    def callback(request: httpx.Request) -> httpx.Response:
+    def callback(
+        request: httpx.Request,
+    ) -> httpx.Response | Coroutine[Any, Any, httpx.Response]:
         """Handle an httpx request by converting it and calling the
         handler.
 
@@ -89,7 +207,8 @@ def _make_respx_callback(
             request: The httpx request to handle.
 
         Returns:
-            An httpx.Response built from the handler's return value.
+            An httpx.Response built from the handler's return value, or a
+            coroutine which returns one.
 
         Raises:
             Exception: A timeout error is raised when the response
@@ -99,88 +218,89 @@ def _make_respx_callback(
             request=request,
             base_path=base_path,
         )
-        timeout_info: dict[str, float | None] = request.extensions.get(
-            "timeout", {}
-        )
-        read_timeout = timeout_info.get("read")
+        if _HANDLING_ASYNC_REQUEST.get():
+            return _handle_async(
+                handler=handler,
+                request=request,
+                request_data=request_data,
+                delay_seconds=delay_seconds,
+                async_sleep_fn=async_sleep_fn,
+            )
+
+        read_timeout = _read_timeout(request=request)
         if read_timeout is not None and delay_seconds > read_timeout:
             sleep_fn(read_timeout)
             raise httpx.ReadTimeout(
                 message="Response delay exceeded read timeout",
                 request=request,
             )
-        status_code, headers, body = handler(request_data)
+        response = handler(request_data)
         sleep_fn(delay_seconds)
-        if isinstance(body, str):
-            body = body.encode()
-        return httpx.Response(
-            status_code=status_code,
-            headers=headers,
-            content=body,
-        )
+        return _to_httpx_response(response=response)
 
     return callback
 
 
-def start_respx_router(
+def build_respx_router(
     *,
-    mock_vws_api: _APIHandler,
-    mock_vwq_api: _APIHandler,
+    vws_handler: Callable[[RequestData], _ResponseType],
+    vwq_handler: Callable[[RequestData], _ResponseType],
     base_vws_url: str,
     base_vwq_url: str,
     response_delay_seconds: float,
     sleep_fn: Callable[[float], None],
+    async_sleep_fn: Callable[[float], Awaitable[None]],
     real_http: bool,
 ) -> respx.MockRouter:
-    """Configure and start a respx router with Vuforia routes.
+    """Configure a respx router with Vuforia routes.
+
+    The router can be started and stopped many times.
 
     Args:
-        mock_vws_api: The VWS API handler.
-        mock_vwq_api: The VWQ API handler.
+        vws_handler: A handler for every request to the VWS API.
+        vwq_handler: A handler for every request to the VWQ API.
         base_vws_url: The base URL for the VWS API.
         base_vwq_url: The base URL for the VWQ API.
         response_delay_seconds: The number of seconds to delay responses.
-        sleep_fn: The function to use for sleeping during delays.
+        sleep_fn: The function to use for sleeping during delays of
+            requests made with a synchronous client.
+        async_sleep_fn: The function to await for delays of requests made
+            with an asynchronous client.
         real_http: Whether to pass through unmatched requests.
 
     Returns:
-        A started respx router.
+        A router which has not been started.
     """
-    router = respx.MockRouter(
+    router = _MockRouter(
         assert_all_called=False,
         assert_all_mocked=False,
     )
 
-    for api, base_url in (
-        (mock_vws_api, base_vws_url),
-        (mock_vwq_api, base_vwq_url),
+    # Each API is routed once for each HTTP method, with a handler which
+    # finds the route for each request in a route table.
+    for route_table, handler, base_url in (
+        (VWS_ROUTE_TABLE, vws_handler, base_vws_url),
+        (VWQ_ROUTE_TABLE, vwq_handler, base_vwq_url),
     ):
-        base_path = urlparse(url=base_url).path.rstrip("/")
-        for route in api.routes:
-            url_pattern = base_url.rstrip("/") + route.path_pattern + "$"
-            compiled_url_pattern = re.compile(pattern=url_pattern)
-
-            for http_method in route.http_methods:
-                original_callback = getattr(  # pylint: disable=bad-builtin
-                    api,
-                    route.route_name,
-                )
-                router.route(
-                    method=http_method,
-                    url=compiled_url_pattern,
-                ).mock(
-                    side_effect=_make_respx_callback(
-                        handler=original_callback,
-                        base_path=base_path,
-                        delay_seconds=response_delay_seconds,
-                        sleep_fn=sleep_fn,
-                    ),
-                )
+        side_effect = _make_respx_callback(
+            handler=handler,
+            base_path=urlparse(url=base_url).path.rstrip("/"),
+            delay_seconds=response_delay_seconds,
+            sleep_fn=sleep_fn,
+            async_sleep_fn=async_sleep_fn,
+        )
+        for http_method in route_table.http_methods:
+            router.route(
+                method=http_method,
+                url=route_table.url_pattern(
+                    base_url=base_url,
+                    http_method=http_method,
+                ),
+            ).mock(side_effect=side_effect)
 
     if real_http:
         router.route().pass_through()
     else:
         router.route().mock(side_effect=_block_unmatched)
 
-    router.start()
     return router
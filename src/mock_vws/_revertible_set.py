@@ -0,0 +1,152 @@
+"""A set whose changes can be undone."""
+
+from collections.abc import Iterable
+from collections.abc import Set as AbstractSet
+from typing import Self, override
+
+from mock_vws._type_checks import internal_beartype
+
+
+@internal_beartype
+class RevertibleSet[T](set[T]):
+    """A set whose changes since a checkpoint can be undone.
+
+    Taking a checkpoint does not copy the set, and reverting to it takes
+    time in proportion to the number of changes made since it was taken,
+    not to the size of the set. Changes are recorded only while there is a
+    checkpoint.
+
+    Checkpoints are a stack: :meth:`revert` undoes the changes since the
+    latest checkpoint which has not yet been reverted to.
+    """
+
+    def __init__(self, elements: Iterable[T] = ()) -> None:
+        """
+        Args:
+            elements: The elements which the set starts with.
+        """
+        super().__init__(elements)
+        self._checkpoints: list[int] = []
+        # Each change is recorded as whether the element was added, and the
+        # element.
+        self._undo_log: list[tuple[bool, T]] = []
+
+    def checkpoint(self) -> None:
+        """Take a checkpoint which the set can be reverted to."""
+        self._checkpoints.append(len(self._undo_log))
+
+    def revert(self) -> None:
+        """Undo the changes made since the latest checkpoint, and discard
+        that checkpoint.
+        """
+        start = self._checkpoints.pop()
+        while len(self._undo_log) > start:
+            was_added, element = self._undo_log.pop()
+            if was_added:
+                super().discard(element)
+            else:
+                super().add(element)
+
+    @override
+    def add(self, element: T) -> None:
+        """Add an element."""
+        if self._checkpoints and element not in self:
+            self._undo_log.append((True, element))
+        super().add(element)
+
+    @override
+    def discard(self, element: T) -> None:
+        """Remove an element if it is in the set."""
+        if self._checkpoints and element in self:
+            self._undo_log.append((False, element))
+        super().discard(element)
+
+    @override
+    def remove(self, element: T) -> None:
+        """Remove an element.
+
+        Raises:
+            KeyError: The element is not in the set.
+        """
+        if element not in self:
+            raise KeyError(element)
+        self.discard(element=element)
+
+    @override
+    def pop(self) -> T:
+        """Remove and return an arbitrary element.
+
+        Raises:
+            KeyError: The set is empty.
+        """
+        if not self:
+            msg = "pop from an empty set"
+            raise KeyError(msg)
+        element = next(iter(self))
+        self.discard(element=element)
+        return element
+
+    @override
+    def clear(self) -> None:
+        """Remove all elements."""
+        for element in tuple(self):
+            self.discard(element=element)
+
+    @override
+    def update(self, *others: Iterable[T]) -> None:
+        """Add the elements of other iterables."""
+        for other in others:
+            for element in other:
+                self.add(element=element)
+
+    @override
+    def difference_update(self, *others: Iterable[T]) -> None:
+        """Remove the elements of other iterables."""
+        for other in others:
+            for element in tuple(other):
+                self.discard(element=element)
+
+    @override
+    def intersection_update(self, *others: Iterable[T]) -> None:
+        """Keep only the elements which are also in other iterables."""
+        kept = set(self).intersection(*others)
+        for element in tuple(self):
+            if element not in kept:
+                self.discard(element=element)
+
+    @override
+    def symmetric_difference_update(self, other: Iterable[T]) -> None:
+        """Keep only the elements which are in exactly one of this set and
+        another iterable.
+        """
+        for element in set(other):
+            if element in self:
+                self.discard(element=element)
+            else:
+                self.add(element=element)
+
+    @override
+    def __ior__(self, other: AbstractSet[T]) -> Self:
+        """Add the elements of another set."""
+        self.update(other)
+        return self
+
+    @override
+    def __isub__(self, other: AbstractSet[T]) -> Self:
+        """Remove the elements of another set."""
+        self.difference_update(other)
+        return self
+
+    @override
+    def __iand__(self, other: AbstractSet[T]) -> Self:
+        """Keep only the elements which are also in another set."""
+        self.intersection_update(other)
+        return self
+
+    @override
+    def __ixor__(self, other: AbstractSet[T]) -> Self:
+        """Keep only the elements which are in exactly one of this set and
+        another set.
+        """
+        self.symmetric_difference_update(other)
+        return self
@@ -0,0 +1,186 @@
+"""Tables which find the route for a request to a mock API."""
+
+import re
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+
+from mock_vws._mock_common import RequestData, Route
+from mock_vws._type_checks import internal_beartype
+
+_ResponseType = tuple[int, Mapping[str, str], str | bytes]
+
+# Named groups are given by the path patterns of some routes, and a name can
+# be used only once in a pattern.
+_NAMED_GROUP_PATTERN = re.compile(pattern=r"\(\?P<[^>]+>")
+
+
+@internal_beartype
+def _first_segment(*, path: str) -> str:
+    """Get the first segment of a path, which is literal in every route's
+    path pattern.
+
+    Args:
+        path: A path or path pattern, which starts with ``/``.
+
+    Returns:
+        The part of the path between the first ``/`` and the next ``/``,
+        ``?`` or the end of the path.
+    """
+    segment, _, _ = path[1:].partition("/")
+    segment, _, _ = segment.partition("?")
+    return segment
+
+
+@internal_beartype
+@dataclass(frozen=True, kw_only=True)
+class _CompiledRoute:
+    """A route with its path pattern compiled.
+
+    Args:
+        route: The route.
+        path_regex: The compiled path pattern, which must match the whole
+            path.
+    """
+
+    route: Route
+    path_regex: re.Pattern[str]
+
+
+@internal_beartype
+class RouteTable:
+    """The routes of a mock API, indexed by HTTP method and by the first
+    segment of their paths.
+
+    Finding the route for a request tests only the few routes which share
+    the request's method and the first segment of its path, rather than
+    every route.
+    """
+
+    def __init__(self, *, routes: Iterable[Route]) -> None:
+        """
+        Args:
+            routes: The routes of the mock API.
+        """
+        self._routes_by_key: defaultdict[
+            tuple[str, str],
+            list[_CompiledRoute],
+        ] = defaultdict(list)
+        path_patterns_by_method: defaultdict[str, list[str]] = defaultdict(
+            list,
+        )
+        for route in routes:
+            compiled_route = _CompiledRoute(
+                route=route,
+                path_regex=re.compile(pattern=route.path_pattern + "$"),
+            )
+            first_segment = _first_segment(path=route.path_pattern)
+            for http_method in route.http_methods:
+                key = (http_method, first_segment)
+                self._routes_by_key[key].append(compiled_route)
+                path_patterns_by_method[http_method].append(
+                    _NAMED_GROUP_PATTERN.sub(
+                        repl="(?:",
+                        string=route.path_pattern,
+                    ),
+                )
+        self._path_patterns_by_method = {
+            http_method: "|".join(sorted(path_patterns))
+            for http_method, path_patterns in path_patterns_by_method.items()
+        }
+        # URL patterns are compiled once for each base URL and HTTP method,
+        # and then shared by every mock which uses this table.
+        self._url_patterns: dict[tuple[str, str], re.Pattern[str]] = {}
+
+    @property
+    def http_methods(self) -> frozenset[str]:
+        """The HTTP methods which at least one route handles."""
+        return frozenset(self._path_patterns_by_method)
+
+    def url_pattern(
+        self,
+        *,
+        base_url: str,
+        http_method: str,
+    ) -> re.Pattern[str]:
+        """Get one pattern which matches the URL of every route for an HTTP
+        method.
+
+        Args:
+            base_url: The base URL which the mock API is served from.
+            http_method: The HTTP method.
+
+        Returns:
+            A compiled pattern which matches exactly the URLs which one of
+            the routes for the given method matches.
+        """
+        key = (base_url, http_method)
+        url_pattern = self._url_patterns.get(key)
+        if url_pattern is None:
+            path_patterns = self._path_patterns_by_method[http_method]
+            url_pattern = re.compile(
+                pattern=f"{base_url.rstrip('/')}(?:{path_patterns})$",
+            )
+            self._url_patterns[key] = url_pattern
+        return url_pattern
+
+    def route(self, *, http_method: str, path: str) -> Route:
+        """Get the route which handles a request.
+
+        Args:
+            http_method: The HTTP method of the request.
+            path: The path of the request, after the base URL's path.
+
+        Returns:
+            The route whose method of the mock API handles the request.
+
+        Raises:
+            KeyError: No route matches the request.
+        """
+        key = (http_method, _first_segment(path=path))
+        for compiled_route in self._routes_by_key.get(key, ()):
+            if compiled_route.path_regex.match(string=path):
+                return compiled_route.route
+        raise KeyError(key)
+
+    def dispatcher(
+        self,
+        *,
+        get_api: Callable[[], object],
+        route_lock: Callable[[Route], AbstractContextManager[object]],
+    ) -> Callable[[RequestData], _ResponseType]:
+        """Get a callback which handles every request to a mock API.
+
+        Args:
+            get_api: A callable which returns the mock API to handle each
+                request with. The mock API has a method for each route.
+            route_lock: A callable which takes a route and returns a lock
+                to hold while the route's method handles a request.
+
+        Returns:
+            A callback which passes each request to the method which handles
+            it.
+        """
+
+        def dispatch(request_data: RequestData) -> _ResponseType:
+            """Pass a request to the method which handles it.
+
+            Args:
+                request_data: The request.
+
+            Returns:
+                The response from the method.
+            """
+            route = self.route(
+                http_method=request_data.method,
+                path=request_data.path,
+            )
+            handler: Callable[[RequestData], _ResponseType] = getattr(  # pylint: disable=bad-builtin
+                get_api(),
+                route.route_name,
+            )
+            with route_lock(route):
+                return handler(request_data)
+
+        return dispatch
@@ -2,9 +2,8 @@
 
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
 from mock_vws._database_matchers import AnyDatabase
+from mock_vws._type_checks import internal_beartype
 
 from .active_flag_validators import validate_active_flag
 from .auth_validators import (
@@ -56,7 +55,7 @@ from .name_validators import (
 from .project_state_validators import validate_project_state
 from .request_quota_validators import validate_request_quota
 from .request_rate_validators import (
-    RequestRateLimiter,
+    RequestRateLimitBackend,
     validate_request_rate,
 )
 from .target_quota_validators import validate_target_quota
@@ -64,7 +63,7 @@ from .target_validators import validate_target_id_exists
 from .width_validators import validate_width
 
 
-@beartype
+@internal_beartype
 def run_services_validators(
     *,
     request_path: str,
@@ -72,7 +71,7 @@ def run_services_validators(
     request_body: bytes,
     request_method: str,
     databases: Iterable[AnyDatabase],
-    request_rate_limiter: RequestRateLimiter,
+    request_rate_limiter: RequestRateLimitBackend,
 ) -> None:
     """Run all validators.
 
@@ -4,14 +4,13 @@ import json
 import logging
 from http import HTTPStatus
 
-from beartype import beartype
-
 from mock_vws._services_validators.exceptions import FailError
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_active_flag(*, request_body: bytes) -> None:
     """Validate the active flag data given to the endpoint.
 
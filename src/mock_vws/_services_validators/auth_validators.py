@@ -4,8 +4,6 @@ import logging
 from collections.abc import Iterable, Mapping
 from http import HTTPStatus
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
@@ -14,11 +12,12 @@ from mock_vws._services_validators.exceptions import (
     AuthenticationFailureError,
     FailError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_auth_header_exists(*, request_headers: Mapping[str, str]) -> None:
     """Validate that there is an authorization header given to a VWS
     endpoint.
@@ -34,7 +33,7 @@ def validate_auth_header_exists(*, request_headers: Mapping[str, str]) -> None:
         raise AuthenticationFailureError
 
 
-@beartype
+@internal_beartype
 def validate_access_key_exists(
     *,
     request_headers: Mapping[str, str],
@@ -64,7 +63,7 @@ def validate_access_key_exists(
     raise FailError(status_code=HTTPStatus.BAD_REQUEST)
 
 
-@beartype
+@internal_beartype
 def validate_auth_header_has_signature(
     *,
     request_headers: Mapping[str, str],
@@ -87,7 +86,7 @@ def validate_auth_header_has_signature(
     raise FailError(status_code=HTTPStatus.BAD_REQUEST)
 
 
-@beartype
+@internal_beartype
 def validate_authorization(
     *,
     request_path: str,
@@ -3,18 +3,17 @@
 import logging
 from collections.abc import Mapping
 
-from beartype import beartype
-
 from mock_vws._services_validators.exceptions import (
     AuthenticationFailureError,
     ContentLengthHeaderNotIntError,
     ContentLengthHeaderTooLargeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_content_length_header_is_int(
     *,
     request_headers: Mapping[str, str],
@@ -44,7 +43,7 @@ def validate_content_length_header_is_int(
         raise ContentLengthHeaderNotIntError from exc
 
 
-@beartype
+@internal_beartype
 def validate_content_length_header_not_too_large(
     *,
     request_headers: Mapping[str, str],
@@ -73,7 +72,7 @@ def validate_content_length_header_not_too_large(
         raise ContentLengthHeaderTooLargeError
 
 
-@beartype
+@internal_beartype
 def validate_content_length_header_not_too_small(
     *,
     request_headers: Mapping[str, str],
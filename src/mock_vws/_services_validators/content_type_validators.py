@@ -4,14 +4,13 @@ import logging
 from collections.abc import Mapping
 from http import HTTPMethod
 
-from beartype import beartype
-
 from mock_vws._services_validators.exceptions import AuthenticationFailureError
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_content_type_header_given(
     *,
     request_headers: Mapping[str, str],
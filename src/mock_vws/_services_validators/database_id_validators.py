@@ -4,8 +4,6 @@ import logging
 import re
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
@@ -14,6 +12,7 @@ from mock_vws._mock_common import RECO_COUNTS_REPORT_PATH_PATTERN
 from mock_vws._services_validators.exceptions import (
     AuthenticationFailureError,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 
 _LOGGER = logging.getLogger(name=__name__)
@@ -22,7 +21,7 @@ _LOGGER = logging.getLogger(name=__name__)
 _DATABASE_ID_PATH_INDEX = 3
 
 
-@beartype
+@internal_beartype
 def validate_database_id_matches_keys(
     *,
     request_path: str,
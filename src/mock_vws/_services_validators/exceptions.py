@@ -5,10 +5,9 @@ from collections.abc import Mapping
 from http import HTTPStatus
 from typing import Final
 
-from beartype import beartype
-
 from mock_vws._constants import ResultCodes
 from mock_vws._mock_common import http_date, result_code_response_text
+from mock_vws._type_checks import internal_beartype
 
 # The headers which VWS gives with a JSON error response, apart from those
 # which depend on the response itself.
@@ -23,7 +22,7 @@ _STANDARD_HEADERS: Final[Mapping[str, str]] = {
 }
 
 
-@beartype
+@internal_beartype
 class ValidatorError(Exception):
     """
     A base class for exceptions thrown from mock Vuforia services
@@ -35,7 +34,7 @@ class ValidatorError(Exception):
     headers: Mapping[str, str]
 
 
-@beartype
+@internal_beartype
 class UnknownTargetError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'UnknownTarget'.
@@ -55,7 +54,7 @@ class UnknownTargetError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ProjectInactiveError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'ProjectInactive'.
@@ -75,7 +74,7 @@ class ProjectInactiveError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class RequestQuotaReachedError(ValidatorError):
     """Exception raised when a database's request quota is exhausted.
 
@@ -98,7 +97,7 @@ class RequestQuotaReachedError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class TooManyRequestsError(ValidatorError):
     """Exception raised when a database exceeds its request rate limit."""
 
@@ -116,7 +115,7 @@ class TooManyRequestsError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class TargetQuotaReachedError(ValidatorError):
     """Exception raised when a database's target quota is exhausted."""
 
@@ -134,7 +133,7 @@ class TargetQuotaReachedError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ProjectSuspendedError(ValidatorError):
     """Exception raised when a database has been suspended."""
 
@@ -152,7 +151,7 @@ class ProjectSuspendedError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ProjectHasNoApiAccessError(ValidatorError):
     """Exception raised when a database cannot make API requests."""
 
@@ -170,7 +169,7 @@ class ProjectHasNoApiAccessError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class AuthenticationFailureError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'AuthenticationFailure'.
@@ -190,7 +189,7 @@ class AuthenticationFailureError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class FailError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'Fail'.
@@ -214,7 +213,7 @@ class FailError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class BadRequestError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'BadRequest'.
@@ -234,7 +233,7 @@ class BadRequestError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class MetadataTooLargeError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'MetadataTooLarge'.
@@ -254,7 +253,7 @@ class MetadataTooLargeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class TargetNameExistError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'TargetNameExist'.
@@ -274,7 +273,7 @@ class TargetNameExistError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class BadImageError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'BadImage'.
@@ -294,7 +293,7 @@ class BadImageError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ImageTooLargeError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'ImageTooLarge'.
@@ -314,7 +313,7 @@ class ImageTooLargeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class RequestTimeTooSkewedError(ValidatorError):
     """Exception raised when Vuforia returns a response with a result code
     'RequestTimeTooSkewed'.
@@ -334,7 +333,7 @@ class RequestTimeTooSkewedError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ContentLengthHeaderTooLargeError(ValidatorError):
     """
     Exception raised when the given content length header is too
@@ -356,7 +355,7 @@ class ContentLengthHeaderTooLargeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class ContentLengthHeaderNotIntError(ValidatorError):
     """
     Exception raised when the given content length header is not an
@@ -386,7 +385,7 @@ class ContentLengthHeaderNotIntError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class UnnecessaryRequestBodyError(ValidatorError):
     """Exception raised when a request body is given but not necessary."""
 
@@ -403,7 +402,7 @@ class UnnecessaryRequestBodyError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class TargetStatusNotSuccessError(ValidatorError):
     """
     Exception raised when trying to update a target that does not have a
@@ -424,7 +423,7 @@ class TargetStatusNotSuccessError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InvalidAcceptHeaderError(ValidatorError):
     """Exception raised when an unsupported Accept header is given."""
 
@@ -442,7 +441,7 @@ class InvalidAcceptHeaderError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InvalidInstanceIdError(ValidatorError):
     """Exception raised when an invalid instance_id is given."""
 
@@ -460,7 +459,7 @@ class InvalidInstanceIdError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class InvalidTargetTypeError(ValidatorError):
     """Exception raised when the target type is not valid for the
     operation.
@@ -480,7 +479,7 @@ class InvalidTargetTypeError(ValidatorError):
         }
 
 
-@beartype
+@internal_beartype
 class TargetStatusProcessingError(ValidatorError):
     """Exception raised when trying to delete a target which is processing."""
 
@@ -6,8 +6,6 @@ import json
 import logging
 from http import HTTPStatus
 
-from beartype import beartype
-
 from mock_vws._base64_decoding import decode_base64
 from mock_vws._image_opening import open_image
 from mock_vws._services_validators.exceptions import (
@@ -15,11 +13,12 @@ from mock_vws._services_validators.exceptions import (
     FailError,
     ImageTooLargeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_image_integrity(*, request_body: bytes) -> None:
     """Validate the integrity of the image given to a VWS endpoint.
 
@@ -48,7 +47,7 @@ def validate_image_integrity(*, request_body: bytes) -> None:
             raise BadImageError from exc
 
 
-@beartype
+@internal_beartype
 def validate_image_format(*, request_body: bytes) -> None:
     """Validate the format of the image given to a VWS endpoint.
 
@@ -77,7 +76,7 @@ def validate_image_format(*, request_body: bytes) -> None:
     raise BadImageError
 
 
-@beartype
+@internal_beartype
 def validate_image_color_space(*, request_body: bytes) -> None:
     """Validate the color space of the image given to a VWS endpoint.
 
@@ -109,7 +108,7 @@ def validate_image_color_space(*, request_body: bytes) -> None:
     raise BadImageError
 
 
-@beartype
+@internal_beartype
 def validate_image_size(*, request_body: bytes) -> None:
     """Validate the file size of the image given to a VWS endpoint.
 
@@ -139,7 +138,7 @@ def validate_image_size(*, request_body: bytes) -> None:
     raise ImageTooLargeError
 
 
-@beartype
+@internal_beartype
 def validate_image_pixel_count(*, request_body: bytes) -> None:
     """Validate the number of pixels of the image given to a VWS endpoint.
 
@@ -177,7 +176,7 @@ def validate_image_pixel_count(*, request_body: bytes) -> None:
     raise ImageTooLargeError
 
 
-@beartype
+@internal_beartype
 def validate_image_is_image(*, request_body: bytes) -> None:
     """Validate that the given image data is actually an image file.
 
@@ -207,7 +206,7 @@ def validate_image_is_image(*, request_body: bytes) -> None:
         raise BadImageError from exc
 
 
-@beartype
+@internal_beartype
 def validate_image_encoding(*, request_body: bytes) -> None:
     """Validate that the given image data can be base64 decoded.
 
@@ -233,7 +232,7 @@ def validate_image_encoding(*, request_body: bytes) -> None:
         raise FailError(status_code=HTTPStatus.UNPROCESSABLE_ENTITY) from exc
 
 
-@beartype
+@internal_beartype
 def validate_image_data_type(*, request_body: bytes) -> None:
     """Validate that the given image data is a string.
 
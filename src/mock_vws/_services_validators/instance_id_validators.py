@@ -3,17 +3,16 @@
 import json
 import logging
 
-from beartype import beartype
-
 from mock_vws._services_validators.exceptions import (
     BadRequestError,
     InvalidInstanceIdError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_instance_id_type(*, request_body: bytes) -> None:
     """Validate the type of the instance_id data given to the VuMark
     instance generation endpoint.
@@ -43,7 +42,7 @@ def validate_instance_id_type(*, request_body: bytes) -> None:
     raise BadRequestError
 
 
-@beartype
+@internal_beartype
 def validate_instance_id_not_empty(*, request_body: bytes) -> None:
     """Validate that the instance_id data given to the VuMark instance
     generation endpoint is not empty.
@@ -5,18 +5,17 @@ import logging
 from http import HTTPMethod, HTTPStatus
 from json.decoder import JSONDecodeError
 
-from beartype import beartype
-
 from mock_vws._services_validators.exceptions import (
     BadRequestError,
     FailError,
     UnnecessaryRequestBodyError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_body_given(*, request_body: bytes, request_method: str) -> None:
     """Validate that no JSON is given for requests other than ``POST`` and
     ``PUT`` requests.
@@ -43,7 +42,7 @@ def validate_body_given(*, request_body: bytes, request_method: str) -> None:
         raise UnnecessaryRequestBodyError
 
 
-@beartype
+@internal_beartype
 def validate_json(*, request_body: bytes, request_path: str) -> None:
     """Validate that any given body is valid JSON.
 
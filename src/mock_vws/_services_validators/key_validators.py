@@ -7,16 +7,15 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from http import HTTPMethod, HTTPStatus
 
-from beartype import beartype
-
 from mock_vws._mock_common import RECO_COUNTS_REPORT_PATH_PATTERN
+from mock_vws._type_checks import internal_beartype
 
 from .exceptions import FailError
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 @dataclass(frozen=True, kw_only=True)
 class _Route:
     """A representation of a VWS route.
@@ -36,7 +35,7 @@ class _Route:
     optional_keys: Iterable[str]
 
 
-@beartype
+@internal_beartype
 def validate_keys(
     *,
     request_body: bytes,
@@ -5,18 +5,17 @@ import json
 import logging
 from http import HTTPStatus
 
-from beartype import beartype
-
 from mock_vws._base64_decoding import decode_base64
 from mock_vws._services_validators.exceptions import (
     FailError,
     MetadataTooLargeError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_metadata_size(*, request_body: bytes) -> None:
     """Validate that the given application metadata is a string or 1024 *
     1024
@@ -47,7 +46,7 @@ def validate_metadata_size(*, request_body: bytes) -> None:
     raise MetadataTooLargeError
 
 
-@beartype
+@internal_beartype
 def validate_metadata_encoding(*, request_body: bytes) -> None:
     """Validate that the given application metadata can be base64 decoded.
 
@@ -78,7 +77,7 @@ def validate_metadata_encoding(*, request_body: bytes) -> None:
         raise FailError(status_code=HTTPStatus.UNPROCESSABLE_ENTITY) from exc
 
 
-@beartype
+@internal_beartype
 def validate_metadata_type(*, request_body: bytes) -> None:
     """Validate that the given application metadata is a string or NULL.
 
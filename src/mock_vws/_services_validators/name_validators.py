@@ -5,8 +5,6 @@ import logging
 from collections.abc import Iterable, Mapping
 from http import HTTPMethod, HTTPStatus
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
@@ -15,11 +13,12 @@ from mock_vws._services_validators.exceptions import (
     FailError,
     TargetNameExistError,
 )
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_name_characters_in_range(
     *,
     request_body: bytes,
@@ -61,7 +60,7 @@ def validate_name_characters_in_range(
     raise TargetNameExistError
 
 
-@beartype
+@internal_beartype
 def validate_name_type(*, request_body: bytes) -> None:
     """Validate the type of the name argument given to a VWS endpoint.
 
@@ -87,7 +86,7 @@ def validate_name_type(*, request_body: bytes) -> None:
     raise FailError(status_code=HTTPStatus.BAD_REQUEST)
 
 
-@beartype
+@internal_beartype
 def validate_name_length(*, request_body: bytes) -> None:
     """Validate the length of the name argument given to a VWS endpoint.
 
@@ -115,7 +114,7 @@ def validate_name_length(*, request_body: bytes) -> None:
     raise FailError(status_code=HTTPStatus.BAD_REQUEST)
 
 
-@beartype
+@internal_beartype
 def validate_name_does_not_exist_new_target(
     *,
     databases: Iterable[AnyDatabase],
@@ -171,7 +170,7 @@ def validate_name_does_not_exist_new_target(
     raise TargetNameExistError
 
 
-@beartype
+@internal_beartype
 def validate_name_does_not_exist_existing_target(
     *,
     request_headers: Mapping[str, str],
@@ -4,8 +4,6 @@ import logging
 from collections.abc import Iterable, Mapping
 from http import HTTPMethod
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
@@ -16,13 +14,14 @@ from mock_vws._services_validators.exceptions import (
     ProjectSuspendedError,
     ValidatorError,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase, VuMarkDatabase
 from mock_vws.states import States
 
 _LOGGER = logging.getLogger(name=__name__)
 
 
-@beartype
+@internal_beartype
 def validate_project_state(
     *,
     request_path: str,
@@ -8,18 +8,17 @@ quota-error handling with the mock.
 
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 
 from .exceptions import RequestQuotaReachedError
 
 
-@beartype
+@internal_beartype
 def validate_request_quota(
     *,
     request_headers: Mapping[str, str],
@@ -5,13 +5,13 @@ import threading
 from collections import deque
 from collections.abc import Callable, Iterable, Mapping
 from http import HTTPMethod
-
-from beartype import beartype
+from typing import Protocol, runtime_checkable
 
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 from mock_vws.request_rate_limits import (
     RateLimitedEndpoint,
@@ -26,7 +26,7 @@ _GET_TARGET_PATH_PATTERN = re.compile(pattern=r"^/targets/[^/]+$")
 _GET_DUPLICATES_PATH_PATTERN = re.compile(pattern=r"^/duplicates/[^/]+$")
 
 
-@beartype
+@internal_beartype
 def _rate_limited_endpoint(
     *,
     request_method: str,
@@ -44,7 +44,39 @@ def _rate_limited_endpoint(
     return RateLimitedEndpoint.OTHER
 
 
-@beartype
+@runtime_checkable
+class RequestRateLimitBackend(Protocol):
+    """Protocol for a store of request times which applies request rate
+    limits.
+    """
+
+    def validate(
+        self,
+        *,
+        database: CloudDatabase,
+        endpoint: RateLimitedEndpoint,
+    ) -> None:
+        """Record a request, or raise an error if a rate limit for the
+        request is exhausted.
+
+        Checking the limits and recording the request must be one atomic
+        step, so that concurrent requests cannot all pass the last free
+        place in a window.
+
+        Args:
+            database: The database which the request is made against.
+            endpoint: The endpoint group which the request belongs to.
+
+        Raises:
+            TooManyRequestsError: A limit which applies to the request has
+                been reached.
+        """
+        # We disable a pylint warning here because the ellipsis is required
+        # for pyright to recognize this as a protocol.
+        ...  # pylint: disable=unnecessary-ellipsis
+
+
+@internal_beartype
 class RequestRateLimiter:
     """Track request times independently for each cloud database."""
 
@@ -127,7 +159,7 @@ class RequestRateLimiter:
             }
 
 
-@beartype
+@internal_beartype
 def validate_request_rate(
     *,
     request_headers: Mapping[str, str],
@@ -135,7 +167,7 @@ def validate_request_rate(
     request_method: str,
     request_path: str,
     databases: Iterable[AnyDatabase],
-    request_rate_limiter: RequestRateLimiter,
+    request_rate_limiter: RequestRateLimitBackend,
 ) -> None:
     """Apply the configured request rates to the matching cloud
     database.
@@ -3,18 +3,17 @@
 from collections.abc import Iterable, Mapping
 from http import HTTPMethod
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
 )
+from mock_vws._type_checks import internal_beartype
 from mock_vws.database import CloudDatabase
 
 from .exceptions import TargetQuotaReachedError
 
 
-@beartype
+@internal_beartype
 def validate_target_quota(
     *,
     request_headers: Mapping[str, str],
@@ -4,20 +4,19 @@ import logging
 import re
 from collections.abc import Iterable, Mapping
 
-from beartype import beartype
-
 from mock_vws._database_matchers import (
     AnyDatabase,
     get_database_matching_server_keys,
 )
 from mock_vws._mock_common import RECO_COUNTS_REPORT_PATH_PATTERN
 from mock_vws._services_validators.exceptions import UnknownTargetError
+from mock_vws._type_checks import internal_beartype
 
 _LOGGER = logging.getLogger(name=__name__)
 _TARGETS_WITH_INSTANCE_PATH_LENGTH = 4
 
 
-@beartype
+@internal_beartype
 def validate_target_id_exists(
     *,
     request_path: str,
@@ -0,0 +1,43 @@
+"""Runtime type checks for the internals of the mock.
+
+Public classes and functions are decorated with ``beartype``, so that a
+wrong argument given by a user is reported where it is given. Private modules
+use :func:`internal_beartype` instead. By default, it checks types as
+``beartype`` does. When the ``MOCK_VWS_SKIP_INTERNAL_TYPE_CHECKS``
+environment variable is set to ``1`` or ``true``, it returns the decorated
+object unchanged, so that calls made while handling each request are not
+checked.
+
+Decorators are applied when modules are imported, so the environment
+variable must be set before ``mock_vws`` is imported.
+"""
+
+import os
+
+from beartype import BeartypeConf, BeartypeStrategy, beartype
+
+SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE = (
+    "MOCK_VWS_SKIP_INTERNAL_TYPE_CHECKS"
+)
+
+
+@beartype
+def _skip_internal_type_checks() -> bool:
+    """Whether internal type checks are skipped, as set in the
+    environment.
+    """
+    value = os.environ.get(SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE, "")
+    return value.strip().lower() in {"1", "true"}
+
+
+# ``O0`` makes ``beartype`` return the decorated object unchanged, so
+# skipped checks cost nothing at call time.
+INTERNAL_BEARTYPE_STRATEGY = (
+    BeartypeStrategy.O0
+    if _skip_internal_type_checks()
+    else BeartypeStrategy.O1
+)
+
+internal_beartype = beartype(
+    conf=BeartypeConf(strategy=INTERNAL_BEARTYPE_STRATEGY),
+)
@@ -127,10 +127,29 @@ class CloudDatabase:
     requests_per_second_limit: int | None = None
     request_rate_limits: RequestRateLimits | None = None
 
-    def to_dict(self) -> CloudDatabaseDict:
-        """Dump a target to a dictionary which can be loaded as JSON."""
+    def to_dict(
+        self,
+        *,
+        include_images: bool = True,
+        include_post_processing_tracking_ratings: bool = False,
+    ) -> CloudDatabaseDict:
+        """Dump a target to a dictionary which can be loaded as JSON.
+
+        Args:
+            include_images: Whether to include the images of targets. See
+                ``ImageTarget.to_dict``.
+            include_post_processing_tracking_ratings: Whether to include the
+                tracking ratings which targets will have after processing.
+                See ``ImageTarget.to_dict``.
+        """
         targets: list[ImageTargetDict] = [
-            target.to_dict() for target in self.targets
+            target.to_dict(
+                include_image=include_images,
+                include_post_processing_tracking_rating=(
+                    include_post_processing_tracking_ratings
+                ),
+            )
+            for target in self.targets
         ]
         request_rate_limits: RequestRateLimitsDict | None = (
             None
@@ -1,10 +1,19 @@
 """Decorators for using the mock."""
 
+import asyncio
 import functools
 import re
+import threading
 import time
-from collections.abc import Callable, Generator, Mapping
-from contextlib import contextmanager
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    Mapping,
+)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal, Self
 from urllib.parse import urlparse
@@ -14,14 +23,20 @@ from beartype import BeartypeConf, beartype
 from requests import PreparedRequest
 from responses import RequestsMock
 
-from mock_vws._mock_common import MissingSchemeError, RequestData
+from mock_vws._mock_common import MissingSchemeError, RequestData, Route
+from mock_vws._requests_mock_server.mock_web_query_api import (
+    ROUTE_TABLE as VWQ_ROUTE_TABLE,
+)
 from mock_vws._requests_mock_server.mock_web_query_api import (
     MockVuforiaWebQueryAPI,
 )
+from mock_vws._requests_mock_server.mock_web_services_api import (
+    ROUTE_TABLE as VWS_ROUTE_TABLE,
+)
 from mock_vws._requests_mock_server.mock_web_services_api import (
     MockVuforiaWebServicesAPI,
 )
-from mock_vws._respx_mock_server.decorators import start_respx_router
+from mock_vws._revertible_set import RevertibleSet
 from mock_vws.cloud_query import CloudQueryFailureResponse
 from mock_vws.database import CloudDatabase, VuMarkDatabase
 from mock_vws.image_matchers import (
@@ -32,6 +47,7 @@ from mock_vws.model_target import (
     ModelTargetGenerationFailure,
     ModelTargetGenerationWarning,
 )
+from mock_vws.target import ImageTarget, ImageTargetSeed
 from mock_vws.target_manager import TargetManager
 from mock_vws.target_raters import (
     BrisqueTargetTrackingRater,
@@ -50,6 +66,104 @@ _STRUCTURAL_SIMILARITY_MATCHER = StructuralSimilarityMatcher()
 _BRISQUE_TRACKING_RATER = BrisqueTargetTrackingRater()
 
 
+@beartype
+def _make_revertible(
+    *,
+    database: CloudDatabase | VuMarkDatabase,
+    field_name: Literal["targets", "vumark_targets"],
+) -> RevertibleSet[Any]:
+    """Keep the targets of a database in a set whose changes can be undone.
+
+    The set is replaced with a :class:`RevertibleSet` of the same targets,
+    unless it is one already. This is called only when the mock takes a
+    database, and :meth:`MockVWS.add_cloud_database` and
+    :meth:`MockVWS.add_vumark_database` document the replacement.
+
+    Args:
+        database: The database.
+        field_name: The name of the field which holds the database's
+            targets.
+
+    Returns:
+        The set which now holds the database's targets.
+    """
+    targets = getattr(database, field_name)  # pylint: disable=bad-builtin
+    if isinstance(targets, RevertibleSet):
+        return targets
+    revertible_targets: RevertibleSet[Any] = RevertibleSet(targets)
+    # The database is frozen, but its targets are meant to change in place,
+    # and the caller's database object is what shows those changes, so the
+    # set is replaced on that object rather than on a copy of it.
+    object.__setattr__(database, field_name, revertible_targets)
+    return revertible_targets
+
+
+@beartype
+class _TargetsLock:
+    """A lock which is held while the targets of databases are read or
+    changed in place.
+
+    It is held shared while targets are only read, so that requests which
+    only read targets are handled at the same time as each other. It is held
+    exclusively while targets are changed in place, so that no request reads
+    a set of targets while it is changed. A thread which is waiting to hold
+    the lock exclusively is not kept waiting by threads which start reading
+    after it.
+
+    The lock is not re-entrant.
+    """
+
+    def __init__(self) -> None:
+        """Create a lock which is not held."""
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writing = False
+
+    @contextmanager
+    def shared(self) -> Generator[None]:
+        """Hold the lock along with any other readers.
+
+        Yields:
+            ``None``.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                predicate=lambda: (
+                    not self._writing and not self._writers_waiting
+                ),
+            )
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Generator[None]:
+        """Hold the lock with no other reader or writer.
+
+        Yields:
+            ``None``.
+        """
+        with self._condition:
+            self._writers_waiting += 1
+            self._condition.wait_for(
+                predicate=lambda: not self._writing and not self._readers,
+            )
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
 @beartype(conf=BeartypeConf(is_pep484_tower=True))
 @dataclass(eq=True, frozen=True, kw_only=True)
 class _MockVWSOptions:
@@ -72,6 +186,7 @@ class _MockVWSOptions:
     real_http: bool
     response_delay_seconds: float
     sleep_fn: Callable[[float], None]
+    async_sleep_fn: Callable[[float], Awaitable[None]]
     vumark_generation_failure: VuMarkGenerationFailure | None
 
 
@@ -113,6 +228,7 @@ class MockVWS:
         real_http: bool = False,
         response_delay_seconds: float = 0.0,
         sleep_fn: Callable[[float], None] = time.sleep,
+        async_sleep_fn: Callable[[float], Awaitable[None]] = asyncio.sleep,
         vumark_generation_failure: VuMarkGenerationFailure | None = None,
     ) -> None:
         """Route requests to Vuforia's Web Service APIs to fakes of those
@@ -160,6 +276,10 @@ class MockVWS:
                 delays. Defaults to ``time.sleep``. Inject a custom
                 function to control virtual time in tests without
                 monkey-patching.
+            async_sleep_fn: The function to await during response delays of
+                requests made with ``httpx.AsyncClient``. Defaults to
+                ``asyncio.sleep``, so that the event loop can handle other
+                work while a response is delayed.
 
         Raises:
             MissingSchemeError: There is no scheme in a given URL.
@@ -200,18 +320,32 @@ class MockVWS:
             real_http=real_http,
             response_delay_seconds=response_delay_seconds,
             sleep_fn=sleep_fn,
+            async_sleep_fn=async_sleep_fn,
             vumark_generation_failure=vumark_generation_failure,
         )
+        # The ``responses`` mock and the ``respx`` router are built the first
+        # time that this instance is started, and then only started and
+        # stopped. They find the fakes to use for each request when it is
+        # made, so they keep working when the fakes are swapped.
+        self._mocks: tuple[RequestsMock, respx.MockRouter] | None = None
         # A mock can be started while it is already started, for example
-        # when a decorated function calls another decorated function, so the
-        # started mocks are kept as a stack.
-        self._started: list[tuple[RequestsMock, respx.MockRouter]] = []
+        # when a decorated function calls another decorated function. It is
+        # stopped when the outermost start ends.
+        self._start_count = 0
+        self._start_lock = threading.Lock()
         self._added_cloud_databases: list[CloudDatabase] = []
         self._added_vumark_databases: list[VuMarkDatabase] = []
+        # The targets of the added databases, which decorated functions put
+        # back as they were after each call.
+        self._revertible_target_sets: list[RevertibleSet[Any]] = []
         self._target_manager = TargetManager()
         self._mock_vws_api, self._mock_vwq_api = self._build_apis(
             target_manager=self._target_manager,
         )
+        # Requests which only read targets are handled at the same time as
+        # each other. Targets are changed in place, so a request which
+        # changes them waits for readers to finish.
+        self._targets_lock = _TargetsLock()
 
     def _build_apis(
         self,
@@ -288,6 +422,12 @@ class MockVWS:
     def add_cloud_database(self, cloud_database: CloudDatabase) -> None:
         """Add a cloud database.
 
+        The mock changes the database's targets in place. So that changes
+        made during a decorated call can be undone, adding the database
+        replaces its ``targets`` with a set of the same targets which
+        records its changes. Read ``cloud_database.targets`` after adding
+        the database, rather than keeping the set from before.
+
         Args:
             cloud_database: The cloud database to add.
 
@@ -298,11 +438,20 @@ class MockVWS:
         self._target_manager.add_cloud_database(
             cloud_database=cloud_database,
         )
+        self._revertible_target_sets.append(
+            _make_revertible(database=cloud_database, field_name="targets"),
+        )
         self._added_cloud_databases.append(cloud_database)
 
     def add_vumark_database(self, vumark_database: VuMarkDatabase) -> None:
         """Add a VuMark database.
 
+        The mock changes the database's targets in place. So that changes
+        made during a decorated call can be undone, adding the database
+        replaces its ``vumark_targets`` with a set of the same targets which
+        records its changes. Read ``vumark_database.vumark_targets`` after
+        adding the database, rather than keeping the set from before.
+
         Args:
             vumark_database: The VuMark database to add.
 
@@ -313,8 +462,104 @@ class MockVWS:
         self._target_manager.add_vumark_database(
             vumark_database=vumark_database,
         )
+        self._revertible_target_sets.append(
+            _make_revertible(
+                database=vumark_database,
+                field_name="vumark_targets",
+            ),
+        )
         self._added_vumark_databases.append(vumark_database)
 
+    def add_image_targets(
+        self,
+        *,
+        cloud_database: CloudDatabase,
+        seeds: Iterable[ImageTargetSeed],
+        max_workers: int | None = None,
+    ) -> list[str]:
+        """Add image targets which have finished processing to a cloud
+        database.
+
+        This is faster than adding targets with requests: the targets do not
+        wait to be processed, and what is calculated from their images, such
+        as their tracking ratings, is calculated on several threads at once.
+        The targets are added to the database together, so a request sees
+        either all of them or none of them.
+
+        Args:
+            cloud_database: The cloud database to add the targets to.
+            seeds: Descriptions of the targets to add.
+            max_workers: The greatest number of threads to prepare targets
+                on. Defaults to the default of
+                :class:`concurrent.futures.ThreadPoolExecutor`.
+
+        Returns:
+            The IDs of the new targets, in the order of the given seeds.
+        """
+        targets = [
+            seed.to_target(
+                target_tracking_rater=self._options.target_tracking_rater,
+            )
+            for seed in seeds
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # ``list`` waits for every target to be prepared, and raises any
+            # exception from preparing one.
+            list(executor.map(ImageTarget.prepare, targets))
+
+        with self._changing_targets():
+            cloud_database.targets.update(targets)
+        return [target.target_id for target in targets]
+
+    @contextmanager
+    def isolated(self) -> Generator[Self]:
+        """Start the mock with databases and targets which are used only in
+        this block.
+
+        The databases added to this instance are available in the block,
+        and their targets are what they were before the block again once it
+        ends. Databases added in the block are not available after it. This
+        is what a decorated function gets for each call.
+
+        The targets are not copied, so a target created before the block
+        keeps anything computed for it, such as its tracking rating, from
+        one block to the next.
+
+        Yields:
+            ``self``, started.
+        """
+        # The targets of a database are stored on the database object
+        # itself, and that object belongs to the caller, so a new target
+        # manager is not enough to isolate one block from the next. We
+        # therefore put the targets back as they were afterwards.
+        #
+        # The targets of added databases are kept in revertible sets, so
+        # this does not copy them. Putting them back undoes only the
+        # changes made during the block.
+        #
+        # Reading and writing the targets in a database is guarded by the
+        # target manager's lock, as documented on that lock, and by the lock
+        # which requests hold while they read targets.
+        target_sets = list(self._revertible_target_sets)
+        num_cloud_databases = len(self._added_cloud_databases)
+        num_vumark_databases = len(self._added_vumark_databases)
+        with self._changing_targets():
+            for target_set in target_sets:
+                target_set.checkpoint()
+
+        try:
+            with self._fresh_state(), self:
+                yield self
+        finally:
+            with self._changing_targets():
+                for target_set in target_sets:
+                    target_set.revert()
+            # Databases added during the block are not added to later
+            # blocks.
+            del self._revertible_target_sets[len(target_sets) :]
+            del self._added_cloud_databases[num_cloud_databases:]
+            del self._added_vumark_databases[num_vumark_databases:]
+
     def __call__[**P, T](
         self,
         function: Callable[P, T],
@@ -340,38 +585,8 @@ class MockVWS:
             Returns:
                 The return value of the given function.
             """
-            # The targets of a database are stored on the database object
-            # itself, and that object belongs to the caller, so a new target
-            # manager is not enough to isolate one call from the next. We
-            # therefore put the targets back as they were afterwards.
-            #
-            # ``CloudDatabase`` equality includes the targets, which change
-            # during the call, so the snapshots are held in a list rather
-            # than in a dictionary keyed by database.
-            #
-            # Reading and writing the targets in a database is guarded by
-            # the target manager's lock, as documented on that lock.
-            with self._target_manager.lock:
-                cloud_snapshots = [
-                    (database, set(database.targets))
-                    for database in self._added_cloud_databases
-                ]
-                vumark_snapshots = [
-                    (database, set(database.vumark_targets))
-                    for database in self._added_vumark_databases
-                ]
-
-            try:
-                with self._fresh_state(), self:
-                    return function(*args, **kwargs)
-            finally:
-                with self._target_manager.lock:
-                    for cloud_database, cloud_targets in cloud_snapshots:
-                        cloud_database.targets.clear()
-                        cloud_database.targets.update(cloud_targets)
-                    for vumark_database, vumark_targets in vumark_snapshots:
-                        vumark_database.vumark_targets.clear()
-                        vumark_database.vumark_targets.update(vumark_targets)
+            with self.isolated():
+                return function(*args, **kwargs)
 
         return wrapper
 
@@ -438,57 +653,113 @@ class MockVWS:
 
         return wrapped
 
-    def __enter__(self) -> Self:
-        """Start an instance of a Vuforia mock.
+    @contextmanager
+    def _changing_targets(self) -> Generator[None]:
+        """Hold the locks which are needed to change targets in place.
+
+        Yields:
+            ``None``.
+        """
+        with self._targets_lock.exclusive(), self._target_manager.lock:
+            yield
+
+    def _route_lock(self, route: Route) -> AbstractContextManager[object]:
+        """Get the lock to hold while a route's method handles a request.
+
+        Requests can be handled on several threads at once, for example when
+        requests from an asynchronous client are handled on an executor.
+        Only requests which change targets in place are handled one at a
+        time. Other changes to the target manager publish new versions of
+        its state, which can be read at any time.
+
+        Args:
+            route: The route which handles the request.
 
         Returns:
-            ``self``.
+            A lock which is held exclusively if the route changes targets,
+            and shared otherwise.
+        """
+        if route.changes_targets:
+            return self._changing_targets()
+        return self._targets_lock.shared()
+
+    def _build_mocks(self) -> tuple[RequestsMock, respx.MockRouter]:
+        """Build a ``responses`` mock and a ``respx`` router which send
+        requests to this instance's fakes.
+
+        Returns:
+            The ``responses`` mock and the ``respx`` router, neither of which
+            has been started.
         """
         mock = RequestsMock(assert_all_requests_are_fired=False)
+        vws_handler = VWS_ROUTE_TABLE.dispatcher(
+            get_api=lambda: self._mock_vws_api,
+            route_lock=self._route_lock,
+        )
+        vwq_handler = VWQ_ROUTE_TABLE.dispatcher(
+            get_api=lambda: self._mock_vwq_api,
+            route_lock=self._route_lock,
+        )
 
-        for api, base_url in (
-            (self._mock_vws_api, self._options.base_vws_url),
-            (self._mock_vwq_api, self._options.base_vwq_url),
+        # Each API is registered once for each HTTP method, with a callback
+        # which finds the route for each request in a route table.
+        for route_table, handler, base_url in (
+            (VWS_ROUTE_TABLE, vws_handler, self._options.base_vws_url),
+            (VWQ_ROUTE_TABLE, vwq_handler, self._options.base_vwq_url),
         ):
-            base_path = urlparse(url=base_url).path.rstrip("/")
-            for route in api.routes:
-                url_pattern = base_url.rstrip("/") + route.path_pattern + "$"
-                compiled_url_pattern = re.compile(pattern=url_pattern)
-
-                for http_method in route.http_methods:
-                    original_callback = getattr(  # pylint: disable=bad-builtin
-                        api,
-                        route.route_name,
-                    )
-                    mock.add_callback(
-                        method=http_method,
-                        url=compiled_url_pattern,
-                        callback=self._wrap_callback(
-                            callback=original_callback,
-                            delay_seconds=self._options.response_delay_seconds,
-                            sleep_fn=self._options.sleep_fn,
-                            base_path=base_path,
-                        ),
-                        content_type=None,
-                    )
+            callback = self._wrap_callback(
+                callback=handler,
+                delay_seconds=self._options.response_delay_seconds,
+                sleep_fn=self._options.sleep_fn,
+                base_path=urlparse(url=base_url).path.rstrip("/"),
+            )
+            for http_method in route_table.http_methods:
+                mock.add_callback(
+                    method=http_method,
+                    url=route_table.url_pattern(
+                        base_url=base_url,
+                        http_method=http_method,
+                    ),
+                    callback=callback,
+                    content_type=None,
+                )
 
         if self._options.real_http:
             all_requests_pattern = re.compile(pattern=".*")
             mock.add_passthru(prefix=all_requests_pattern)
 
-        mock.start()
+        # ``respx`` and ``httpx`` are imported only when a mock is first
+        # started, so that importing this package does not import them.
+        from mock_vws._respx_mock_server.decorators import (  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+            build_respx_router,
+        )
 
-        router = start_respx_router(
-            mock_vws_api=self._mock_vws_api,
-            mock_vwq_api=self._mock_vwq_api,
+        router = build_respx_router(
+            vws_handler=vws_handler,
+            vwq_handler=vwq_handler,
             base_vws_url=self._options.base_vws_url,
             base_vwq_url=self._options.base_vwq_url,
             response_delay_seconds=self._options.response_delay_seconds,
             sleep_fn=self._options.sleep_fn,
+            async_sleep_fn=self._options.async_sleep_fn,
             real_http=self._options.real_http,
         )
+        return mock, router
+
+    def __enter__(self) -> Self:
+        """Start an instance of a Vuforia mock.
 
-        self._started.append((mock, router))
+        Returns:
+            ``self``.
+        """
+        with self._start_lock:
+            if self._start_count == 0:
+                if self._mocks is None:
+                    self._mocks = self._build_mocks()
+                mock, router = self._mocks
+                mock.start()
+                router.start()
+            self._start_count += 1
         return self
 
     def __exit__(self, *exc: object) -> Literal[False]:
@@ -501,7 +772,13 @@ class MockVWS:
         # unused, so we "use" it here.
         del exc
 
-        mock, router = self._started.pop()
-        mock.stop()
-        router.stop()
+        with self._start_lock:
+            self._start_count -= 1
+            if self._start_count == 0 and self._mocks is not None:
+                mock, router = self._mocks
+                mock.stop()
+                # The calls are recorded by ``responses``, and they would
+                # otherwise be kept for as long as this instance.
+                mock.calls.reset()
+                router.stop()
         return False
@@ -1,11 +1,14 @@
-"""Matchers for query and duplicate requests."""
+"""Matchers for query and duplicate requests.
+
+OpenCV and NumPy are imported when a structural similarity matcher is first
+called, rather than when this module is imported, as importing them is slow
+and many uses of the mock never compare images.
+"""
 
 import io
 import statistics
 from typing import Protocol, runtime_checkable
 
-import cv2
-import numpy as np
 from beartype import beartype
 
 from mock_vws._image_opening import open_image
@@ -67,6 +70,9 @@ class StructuralSimilarityMatcher:
             first_image_content: One image's content.
             second_image_content: Another image's content.
         """
+        import cv2  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        import numpy as np  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
         first_image_file = io.BytesIO(initial_bytes=first_image_content)
         second_image_file = io.BytesIO(initial_bytes=second_image_content)
         with (
@@ -0,0 +1,48 @@
+"""A ``pytest`` plugin which gives each test the same mock, with its
+databases and targets put back as they were after each test.
+
+Enable the plugin in a ``conftest.py`` file:
+
+.. code-block:: python
+
+   pytest_plugins = ["mock_vws.pytest_plugin"]
+
+Each test which uses the :func:`mock_vws` fixture gets a started mock. The
+mock is created once per test session by the :func:`mock_vws_session`
+fixture, which can be overridden to configure the mock and to add
+databases to it. Targets created by one test are gone in the next, but
+targets which were in the added databases before the session's first test
+are kept, along with anything computed for them, such as their tracking
+ratings.
+
+With ``pytest-xdist``, each worker process has its own session, and so its
+own mock.
+"""
+
+from collections.abc import Generator
+
+import pytest
+
+from mock_vws.decorators import MockVWS
+
+# These fixtures are not decorated with ``beartype``, as ``pytest`` inspects
+# fixture functions to find out whether they are generators.
+
+
+@pytest.fixture(name="mock_vws_session", scope="session")
+def fixture_mock_vws_session() -> MockVWS:
+    """A mock which is shared by every test in the session.
+
+    Override this fixture to configure the mock, or to add databases to it.
+    This mock is not started; use the ``mock_vws`` fixture in tests.
+    """
+    return MockVWS()
+
+
+@pytest.fixture(name="mock_vws")
+def fixture_mock_vws(*, mock_vws_session: MockVWS) -> Generator[MockVWS]:
+    """The session's mock, started, with its databases and targets put back
+    as they were after the test.
+    """
+    with mock_vws_session.isolated() as mock:
+        yield mock
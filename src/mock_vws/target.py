@@ -2,11 +2,13 @@
 
 import base64
 import datetime
+import functools
+import hashlib
 import io
 import statistics
 import uuid
 from dataclasses import dataclass, field
-from typing import NotRequired, Self, TypedDict
+from typing import Literal, NotRequired, Self, TypedDict
 from zoneinfo import ZoneInfo
 
 from beartype import BeartypeConf, beartype
@@ -44,6 +46,7 @@ class ImageTargetDict(TypedDict):
     delete_date_optional: str | None
     upload_date: str
     tracking_rating: int
+    post_processing_tracking_rating: NotRequired[int]
     current_month_recos: NotRequired[int]
     previous_month_recos: NotRequired[int]
     total_recos: NotRequired[int]
@@ -78,13 +81,16 @@ class ImageTarget:
     current_month_recos: int = 0
     delete_date: datetime.datetime | None = None
     last_modified_date: datetime.datetime = field(default_factory=_time_now)
+    # The status after processing. If this is not given, it is calculated
+    # from the image.
+    post_processing_status: TargetStatuses | None = None
     previous_month_recos: int = 0
     reco_rating: str = ""
     target_id: str = field(default_factory=_random_hex)
     total_recos: int = 0
     upload_date: datetime.datetime = field(default_factory=_time_now)
 
-    @property
+    @functools.cached_property
     def _post_processing_status(self) -> TargetStatuses:
         """Return the status of the target, or what it will be when
         processing
@@ -93,7 +99,13 @@ class ImageTarget:
         The status depends on the standard deviation of the color bands.
         How VWS determines this is unknown, but it relates to how
         suitable the target is for detection.
+
+        Targets are not changed once they are made, so the image is decoded
+        only once for each target, and only when the status is needed.
         """
+        if self.post_processing_status is not None:
+            return self.post_processing_status
+
         image_file = io.BytesIO(initial_bytes=self.image_value)
         with open_image(fp=image_file) as image:
             image_stat = ImageStat.Stat(image_or_list=image)
@@ -130,9 +142,13 @@ class ImageTarget:
 
         return self._post_processing_status.value
 
-    @property
+    @functools.cached_property
     def _post_processing_target_rating(self) -> int:
-        """The rating of the target after processing."""
+        """The rating of the target after processing.
+
+        Targets are not changed once they are made, so each target is rated
+        only once.
+        """
         return self.target_tracking_rater(image_content=self.image_value)
 
     @property
@@ -181,8 +197,13 @@ class ImageTarget:
             target_dict["upload_date"],
         ).replace(tzinfo=timezone)
 
+        # A dictionary which was dumped without the rating after processing
+        # gives the rating at the time it was dumped.
         target_tracking_rater = HardcodedTargetTrackingRater(
-            rating=target_dict["tracking_rating"],
+            rating=target_dict.get(
+                "post_processing_tracking_rating",
+                target_dict["tracking_rating"],
+            ),
         )
         return cls(
             target_id=target_id,
@@ -202,18 +223,40 @@ class ImageTarget:
             reco_rating=target_dict.get("reco_rating", ""),
         )
 
-    def to_dict(self) -> ImageTargetDict:
-        """Dump a target to a dictionary which can be loaded as JSON."""
+    @functools.cached_property
+    def _image_base64(self) -> str:
+        """The target image, base64 encoded.
+
+        Targets are not changed once they are made, so the image is encoded
+        only once for each target.
+        """
+        return base64.encodebytes(s=self.image_value).decode()
+
+    @functools.cached_property
+    def image_digest(self) -> str:
+        """The SHA-256 digest of the target image, as a hex string.
+
+        Targets are not changed once they are made, so the image is hashed
+        only once for each target.
+        """
+        return hashlib.sha256(self.image_value).hexdigest()
+
+    @functools.cached_property
+    def _dict_without_image(self) -> ImageTargetDict:
+        """The target as a dictionary, without the target image or the
+        tracking rating, which changes over time.
+
+        This is made only once for each target, and is copied by
+        :meth:`to_dict`.
+        """
         delete_date: str | None = None
         if self.delete_date:
             delete_date = self.delete_date.isoformat()
 
-        image_base64 = base64.encodebytes(s=self.image_value).decode()
-
         return {
             "name": self.name,
             "width": self.width,
-            "image_base64": image_base64,
+            "image_base64": "",
             "active_flag": self.active_flag,
             "processing_time_seconds": float(self.processing_time_seconds),
             "application_metadata": self.application_metadata,
@@ -221,13 +264,116 @@ class ImageTarget:
             "last_modified_date": self.last_modified_date.isoformat(),
             "delete_date_optional": delete_date,
             "upload_date": self.upload_date.isoformat(),
-            "tracking_rating": self.tracking_rating,
+            "tracking_rating": -1,
             "current_month_recos": self.current_month_recos,
             "previous_month_recos": self.previous_month_recos,
             "total_recos": self.total_recos,
             "reco_rating": self.reco_rating,
         }
 
+    def prepare(self) -> None:
+        """Calculate what the target's status and tracking rating will be
+        after processing.
+
+        These are calculated from the target's image the first time that
+        they are needed, which is usually during a request. Preparing a
+        target does that work ahead of time.
+        """
+        _ = (
+            self._post_processing_status,
+            self._post_processing_target_rating,
+        )
+
+    def to_dict(
+        self,
+        *,
+        include_image: bool = True,
+        include_post_processing_tracking_rating: bool = False,
+    ) -> ImageTargetDict:
+        """Dump a target to a dictionary which can be loaded as JSON.
+
+        Args:
+            include_image: Whether to include the target image. A target
+                loaded from a dictionary without an image has an empty image,
+                so its status cannot be calculated and it cannot be matched.
+            include_post_processing_tracking_rating: Whether to include the
+                tracking rating which the target will have after processing,
+                as well as the current rating. A target loaded from a
+                dictionary with this rating gives a rating of -1 for as long
+                as this target would. Getting this rating may mean rating the
+                target image.
+        """
+        target_dict = self._dict_without_image.copy()
+        target_dict["tracking_rating"] = self.tracking_rating
+        if include_post_processing_tracking_rating:
+            target_dict["post_processing_tracking_rating"] = (
+                self._post_processing_target_rating
+            )
+        if include_image:
+            target_dict["image_base64"] = self._image_base64
+        return target_dict
+
+
+@beartype(conf=BeartypeConf(is_pep484_tower=True))
+@dataclass(frozen=True, eq=True, kw_only=True)
+class ImageTargetSeed:
+    """An image target to add to a database, which has finished processing.
+
+    Args:
+        image_value: The target image.
+        name: The name of the target. Defaults to a random string.
+        width: The width of the target.
+        active_flag: Whether the target is active.
+        application_metadata: The base64 encoded application metadata of
+            the target.
+        tracking_rating: The tracking rating of the target. By default, the
+            target is rated by the mock's target tracking rater.
+        status: The status of the target, ``"success"`` or ``"failed"``. By
+            default, the status is calculated from the image, as it is for
+            targets added with a request. A given status is kept until the
+            target is updated.
+    """
+
+    image_value: bytes
+    name: str = field(default_factory=_random_hex)
+    width: float = 1.0
+    active_flag: bool = True
+    application_metadata: str | None = None
+    tracking_rating: int | None = None
+    status: Literal["success", "failed"] | None = None
+
+    def to_target(
+        self,
+        *,
+        target_tracking_rater: TargetTrackingRater,
+    ) -> ImageTarget:
+        """Make a target which has finished processing.
+
+        Args:
+            target_tracking_rater: The rater to rate the target with if no
+                tracking rating is given.
+
+        Returns:
+            The new target.
+        """
+        if self.tracking_rating is not None:
+            target_tracking_rater = HardcodedTargetTrackingRater(
+                rating=self.tracking_rating,
+            )
+        post_processing_status = None
+        if self.status is not None:
+            post_processing_status = TargetStatuses(self.status)
+        return ImageTarget(
+            active_flag=self.active_flag,
+            application_metadata=self.application_metadata,
+            image_value=self.image_value,
+            name=self.name,
+            post_processing_status=post_processing_status,
+            processing_time_seconds=0,
+            target_tracking_rater=target_tracking_rater,
+            width=self.width,
+        )
+
 
 @beartype(conf=BeartypeConf(is_pep484_tower=True))
 @dataclass(frozen=True, eq=True, kw_only=True)
@@ -1,12 +1,19 @@
 """A fake implementation of a Vuforia target manager."""
 
+import copy
+import functools
 import threading
 import time
+from collections.abc import Iterable, Iterator, Mapping
+from collections.abc import Set as AbstractSet
 from contextlib import AbstractContextManager
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from enum import StrEnum, unique
+from typing import override
 
 from beartype import beartype
 
+from mock_vws._persistent_map import PersistentMap
 from mock_vws._services_validators.request_rate_validators import (
     RequestRateLimiter,
 )
@@ -14,8 +21,232 @@ from mock_vws.database import CloudDatabase, VuMarkDatabase
 from mock_vws.model_target import ModelTargetDataset, OAuth2ClientCredential
 from mock_vws.reco_counts import RecoCountsReport
 
-if TYPE_CHECKING:
-    from mock_vws._database_matchers import AnyDatabase
+
+@unique
+class _KeyName(StrEnum):
+    """Names of the keys which must be unique among all databases."""
+
+    SERVER_ACCESS_KEY = "server access key"
+    SERVER_SECRET_KEY = "server secret key"  # noqa: S105
+    NAME = "name"
+    CLIENT_ACCESS_KEY = "client access key"
+    CLIENT_SECRET_KEY = "client secret key"  # noqa: S105
+
+
+@beartype
+def _unique_keys(
+    *,
+    database: CloudDatabase | VuMarkDatabase,
+) -> list[tuple[_KeyName, str]]:
+    """Get the keys of a database which must be unique among all databases.
+
+    Only cloud databases have client keys.
+
+    Args:
+        database: The database.
+
+    Returns:
+        The name and value of each key.
+    """
+    keys = [
+        (_KeyName.SERVER_ACCESS_KEY, database.server_access_key),
+        (_KeyName.SERVER_SECRET_KEY, database.server_secret_key),
+        (_KeyName.NAME, database.database_name),
+    ]
+    if isinstance(database, CloudDatabase):
+        keys += [
+            (_KeyName.CLIENT_ACCESS_KEY, database.client_access_key),
+            (_KeyName.CLIENT_SECRET_KEY, database.client_secret_key),
+        ]
+    return keys
+
+
+@beartype
+class _DatabaseSet[DatabaseT: CloudDatabase | VuMarkDatabase](
+    AbstractSet[DatabaseT],
+):
+    """A read-only set of the databases in a mapping of databases by name.
+
+    Making one does not copy the databases.
+    """
+
+    def __init__(self, *, databases_by_name: Mapping[str, DatabaseT]) -> None:
+        """
+        Args:
+            databases_by_name: The databases, keyed by name.
+        """
+        self._databases_by_name = databases_by_name
+
+    @classmethod
+    @override
+    def _from_iterable(cls, it: Iterable[DatabaseT]) -> frozenset[DatabaseT]:
+        """Make the result of a set operation, such as a union."""
+        return frozenset(it)
+
+    @override
+    def __contains__(self, item: object) -> bool:
+        """Whether a database is in this set.
+
+        A database is in this set only if it is the database with its name,
+        not if it is equal to that database, so that whole sets of targets
+        are not compared.
+        """
+        if not isinstance(item, CloudDatabase | VuMarkDatabase):
+            return False
+        return self._databases_by_name.get(item.database_name) is item
+
+    @override
+    def __iter__(self) -> Iterator[DatabaseT]:
+        """Iterate over the databases, in no particular order."""
+        return iter(self._databases_by_name.values())
+
+    @override
+    def __len__(self) -> int:
+        """The number of databases."""
+        return len(self._databases_by_name)
+
+
+@beartype
+@dataclass(frozen=True, kw_only=True)
+class _TargetManagerState:
+    """A version of the state of a target manager.
+
+    A version is not changed once it is published. A change to the state
+    publishes a new version, which shares all but a few nodes of each
+    mapping with the version before it.
+    """
+
+    cloud_databases: PersistentMap[str, CloudDatabase] = field(
+        default_factory=PersistentMap,
+    )
+    vumark_databases: PersistentMap[str, VuMarkDatabase] = field(
+        default_factory=PersistentMap,
+    )
+    model_target_datasets: PersistentMap[str, ModelTargetDataset] = field(
+        default_factory=PersistentMap,
+    )
+    oauth2_client_credentials: PersistentMap[str, OAuth2ClientCredential] = (
+        field(
+            default_factory=PersistentMap,
+        )
+    )
+    reco_counts_reports: PersistentMap[str, RecoCountsReport] = field(
+        default_factory=PersistentMap,
+    )
+    # The name of the database which has each key which must be unique, so
+    # that a key can be checked or looked up without going through every
+    # database.
+    database_names_by_key: PersistentMap[tuple[_KeyName, str], str] = field(
+        default_factory=PersistentMap,
+    )
+
+    @functools.cached_property
+    def cloud_database_set(self) -> AbstractSet[CloudDatabase]:
+        """All cloud databases in this version."""
+        return _DatabaseSet(databases_by_name=self.cloud_databases)
+
+    @functools.cached_property
+    def vumark_database_set(self) -> AbstractSet[VuMarkDatabase]:
+        """All VuMark databases in this version."""
+        return _DatabaseSet(databases_by_name=self.vumark_databases)
+
+
+@beartype
+def _with_database_keys(
+    *,
+    database_names_by_key: PersistentMap[tuple[_KeyName, str], str],
+    database: CloudDatabase | VuMarkDatabase,
+) -> PersistentMap[tuple[_KeyName, str], str]:
+    """Get a version of an index of database keys with the keys of a new
+    database.
+
+    Args:
+        database_names_by_key: The index of database keys.
+        database: The new database.
+
+    Returns:
+        The new index of database keys.
+
+    Raises:
+        ValueError: One of the keys of the database is already used by
+            another database.
+    """
+    new_database_names_by_key = database_names_by_key
+    for key_name, value in _unique_keys(database=database):
+        if (key_name, value) in new_database_names_by_key:
+            message = (
+                f"All {key_name}s must be unique. "
+                f'There is already a database with the {key_name} "{value}".'
+            )
+            raise ValueError(message)
+        new_database_names_by_key = new_database_names_by_key.set(
+            key=(key_name, value),
+            value=database.database_name,
+        )
+    return new_database_names_by_key
+
+
+@beartype
+def _without_database_keys(
+    *,
+    database_names_by_key: PersistentMap[tuple[_KeyName, str], str],
+    database: CloudDatabase | VuMarkDatabase | None,
+) -> PersistentMap[tuple[_KeyName, str], str]:
+    """Get a version of an index of database keys without the keys of a
+    database.
+
+    Args:
+        database_names_by_key: The index of database keys.
+        database: The database, or ``None`` if there is no database to
+            remove.
+
+    Returns:
+        The new index of database keys.
+    """
+    new_database_names_by_key = database_names_by_key
+    if database is not None:
+        for key in _unique_keys(database=database):
+            new_database_names_by_key = new_database_names_by_key.delete(
+                key=key,
+            )
+    return new_database_names_by_key
+
+
+@beartype
+def _with_replaced_database_keys(
+    *,
+    database_names_by_key: PersistentMap[tuple[_KeyName, str], str],
+    old_database: CloudDatabase | VuMarkDatabase,
+    new_database: CloudDatabase | VuMarkDatabase,
+) -> PersistentMap[tuple[_KeyName, str], str]:
+    """Get an index of database keys with the keys of one database replaced
+    by the keys of a new version of it.
+
+    Args:
+        database_names_by_key: The index of database keys.
+        old_database: The database which is being replaced.
+        new_database: The new version of the database.
+
+    Returns:
+        The new index of database keys.
+
+    Raises:
+        ValueError: One of the keys of the new version of the database is
+            already used by another database.
+    """
+    # A new version of a database usually has the same keys, for example
+    # when only its targets have changed.
+    if _unique_keys(database=old_database) == _unique_keys(
+        database=new_database,
+    ):
+        return database_names_by_key
+    return _with_database_keys(
+        database_names_by_key=_without_database_keys(
+            database_names_by_key=database_names_by_key,
+            database=old_database,
+        ),
+        database=new_database,
+    )
 
 
 @beartype
@@ -24,15 +255,20 @@ class TargetManager:
     A target manager.
 
     See https://developer.vuforia.com/library/vuforia-engine/getting-started/engine-developer-portal/vuforia-target-manager/.
+
+    The state of a target manager is published as versions which are not
+    changed. Reading the state gets the latest version without taking a
+    lock and without copying it, so reads on many threads do not wait for
+    each other. A change makes a new version and publishes it in one
+    assignment, while holding :attr:`lock`. Versions are persistent maps, so
+    making a new version takes time in proportion to the logarithm of the
+    number of items, not to the number of items.
     """
 
     def __init__(self) -> None:
         """Create a target manager with no databases."""
-        self._cloud_databases: set[CloudDatabase] = set()
-        self._vumark_databases: set[VuMarkDatabase] = set()
-        self._model_target_datasets: dict[str, ModelTargetDataset] = {}
-        self._oauth2_client_credentials: dict[str, OAuth2ClientCredential] = {}
-        self._reco_counts_reports: dict[str, RecoCountsReport] = {}
+        # Databases are keyed by name, which is unique across all databases.
+        self._state = _TargetManagerState()
         self._lock = threading.RLock()
         self._request_rate_limiter = RequestRateLimiter(
             time_function=time.monotonic,
@@ -40,13 +276,19 @@ class TargetManager:
 
     @property
     def lock(self) -> AbstractContextManager[bool]:
-        """A re-entrant lock which guards this target manager's state.
-
-        Every method of this class takes this lock.  Applications which are
-        served on multiple threads, such as the Flask applications, must also
-        take it around any other access to the databases in this target
-        manager, including reading and writing the targets in a database, so
-        that no request sees a database while another request is changing it.
+        """A re-entrant lock which is held while the state of this target
+        manager is changed.
+
+        Every method of this class which changes the state takes this lock.
+        Reading the state does not need it.
+
+        Take this lock to make a change which depends on what was read, such
+        as adding a database only if no database has the same name, so that
+        no other change is made in between. The targets in a database can be
+        changed in place, so applications which are served on multiple
+        threads must also take this lock around reading and writing the
+        targets in a database, unless, like the Flask applications, they
+        replace a database rather than change its targets.
         """
         return self._lock
 
@@ -56,44 +298,157 @@ class TargetManager:
         return self._request_rate_limiter
 
     @property
-    def cloud_databases(self) -> set[CloudDatabase]:
-        """All cloud databases."""
-        with self._lock:
-            return set(self._cloud_databases)
+    def cloud_databases(self) -> AbstractSet[CloudDatabase]:
+        """All cloud databases, as a read-only set which is not a copy."""
+        return self._state.cloud_database_set
 
     @property
-    def vumark_databases(self) -> set[VuMarkDatabase]:
-        """All VuMark databases."""
-        with self._lock:
-            return set(self._vumark_databases)
+    def vumark_databases(self) -> AbstractSet[VuMarkDatabase]:
+        """All VuMark databases, as a read-only set which is not a copy."""
+        return self._state.vumark_database_set
+
+    def get_cloud_database(self, database_name: str) -> CloudDatabase:
+        """Get the cloud database with the given name.
+
+        Args:
+            database_name: The name of the cloud database.
+
+        Returns:
+            The cloud database with the given name.
+
+        Raises:
+            KeyError: There is no cloud database with the given name.
+        """
+        return self._state.cloud_databases[database_name]
+
+    def get_vumark_database(self, database_name: str) -> VuMarkDatabase:
+        """Get the VuMark database with the given name.
+
+        Args:
+            database_name: The name of the VuMark database.
+
+        Returns:
+            The VuMark database with the given name.
+
+        Raises:
+            KeyError: There is no VuMark database with the given name.
+        """
+        return self._state.vumark_databases[database_name]
+
+    def get_cloud_database_by_server_access_key(
+        self,
+        server_access_key: str,
+    ) -> CloudDatabase:
+        """Get the cloud database with the given server access key.
+
+        Args:
+            server_access_key: The server access key of the cloud database.
+
+        Returns:
+            The cloud database with the given server access key.
+
+        Raises:
+            KeyError: There is no cloud database with the given server access
+                key.
+        """
+        state = self._state
+        database_name = state.database_names_by_key[
+            _KeyName.SERVER_ACCESS_KEY,
+            server_access_key,
+        ]
+        return state.cloud_databases[database_name]
+
+    def get_vumark_database_by_server_access_key(
+        self,
+        server_access_key: str,
+    ) -> VuMarkDatabase:
+        """Get the VuMark database with the given server access key.
+
+        Args:
+            server_access_key: The server access key of the VuMark database.
+
+        Returns:
+            The VuMark database with the given server access key.
+
+        Raises:
+            KeyError: There is no VuMark database with the given server
+                access key.
+        """
+        state = self._state
+        database_name = state.database_names_by_key[
+            _KeyName.SERVER_ACCESS_KEY,
+            server_access_key,
+        ]
+        return state.vumark_databases[database_name]
+
+    def get_cloud_database_by_client_access_key(
+        self,
+        client_access_key: str,
+    ) -> CloudDatabase:
+        """Get the cloud database with the given client access key.
+
+        Args:
+            client_access_key: The client access key of the cloud database.
+
+        Returns:
+            The cloud database with the given client access key.
+
+        Raises:
+            KeyError: There is no cloud database with the given client access
+                key.
+        """
+        state = self._state
+        database_name = state.database_names_by_key[
+            _KeyName.CLIENT_ACCESS_KEY,
+            client_access_key,
+        ]
+        return state.cloud_databases[database_name]
 
     @property
-    def model_target_datasets(self) -> dict[str, ModelTargetDataset]:
+    def model_target_datasets(self) -> Mapping[str, ModelTargetDataset]:
         """All Model Target datasets, keyed by UUID."""
-        with self._lock:
-            return dict(self._model_target_datasets)
+        return self._state.model_target_datasets
 
     @property
-    def reco_counts_reports(self) -> dict[str, RecoCountsReport]:
+    def reco_counts_reports(self) -> Mapping[str, RecoCountsReport]:
         """All reco counts reports, keyed by report identifier."""
-        with self._lock:
-            return dict(self._reco_counts_reports)
+        return self._state.reco_counts_reports
 
     @property
-    def oauth2_client_credentials(self) -> dict[str, OAuth2ClientCredential]:
+    def oauth2_client_credentials(
+        self,
+    ) -> Mapping[str, OAuth2ClientCredential]:
         """All dynamically created OAuth2 client credentials."""
-        return dict(self._oauth2_client_credentials)
+        return self._state.oauth2_client_credentials
 
     def add_oauth2_client_credential(
         self,
         credential: OAuth2ClientCredential,
     ) -> None:
         """Add an OAuth2 client credential."""
-        self._oauth2_client_credentials[credential.client_id] = credential
+        with self._lock:
+            credentials = self._state.oauth2_client_credentials
+            self._state = copy.replace(
+                self._state,  # pyrefly: ignore[bad-argument-type]
+                oauth2_client_credentials=credentials.set(
+                    key=credential.client_id,
+                    value=credential,
+                ),
+            )
 
     def remove_oauth2_client_credential(self, client_id: str) -> None:
-        """Remove an OAuth2 client credential."""
-        del self._oauth2_client_credentials[client_id]
+        """Remove an OAuth2 client credential.
+
+        Raises:
+            KeyError: There is no credential with the given client ID.
+        """
+        with self._lock:
+            self._state = copy.replace(
+                self._state,  # pyrefly: ignore[bad-argument-type]
+                oauth2_client_credentials=(
+                    self._state.oauth2_client_credentials.delete(key=client_id)
+                ),
+            )
 
     def add_reco_counts_report(
         self,
@@ -101,8 +456,12 @@ class TargetManager:
     ) -> None:
         """Add a reco counts report."""
         with self._lock:
-            self._reco_counts_reports[reco_counts_report.uuid_] = (
-                reco_counts_report
+            self._state = copy.replace(
+                self._state,  # pyrefly: ignore[bad-argument-type]
+                reco_counts_reports=self._state.reco_counts_reports.set(
+                    key=reco_counts_report.uuid_,
+                    value=reco_counts_report,
+                ),
             )
 
     def remove_cloud_database(self, cloud_database: CloudDatabase) -> None:
@@ -115,11 +474,47 @@ class TargetManager:
             KeyError: The cloud database is not in the target manager.
         """
         with self._lock:
-            self._cloud_databases = {
-                db for db in self._cloud_databases if db != cloud_database
-            }
+            state = self._state
+            self._state = copy.replace(
+                state,  # pyrefly: ignore[bad-argument-type]
+                cloud_databases=state.cloud_databases.discard(
+                    key=cloud_database.database_name,
+                ),
+                database_names_by_key=_without_database_keys(
+                    database_names_by_key=state.database_names_by_key,
+                    database=state.cloud_databases.get(
+                        cloud_database.database_name,
+                    ),
+                ),
+            )
         self._request_rate_limiter.remove_database(database=cloud_database)
 
+    def replace_cloud_database(self, cloud_database: CloudDatabase) -> None:
+        """Replace the cloud database which has the same name as the given
+        database.
+
+        Args:
+            cloud_database: The new version of the cloud database.
+
+        Raises:
+            KeyError: There is no cloud database with the given name.
+        """
+        database_name = cloud_database.database_name
+        with self._lock:
+            state = self._state
+            self._state = copy.replace(
+                state,  # pyrefly: ignore[bad-argument-type]
+                cloud_databases=state.cloud_databases.set(
+                    key=database_name,
+                    value=cloud_database,
+                ),
+                database_names_by_key=_with_replaced_database_keys(
+                    database_names_by_key=state.database_names_by_key,
+                    old_database=state.cloud_databases[database_name],
+                    new_database=cloud_database,
+                ),
+            )
+
     def remove_vumark_database(self, vumark_database: VuMarkDatabase) -> None:
         """Remove a VuMark database.
 
@@ -127,9 +522,45 @@ class TargetManager:
             vumark_database: The VuMark database to remove.
         """
         with self._lock:
-            self._vumark_databases = {
-                db for db in self._vumark_databases if db != vumark_database
-            }
+            state = self._state
+            self._state = copy.replace(
+                state,  # pyrefly: ignore[bad-argument-type]
+                vumark_databases=state.vumark_databases.discard(
+                    key=vumark_database.database_name,
+                ),
+                database_names_by_key=_without_database_keys(
+                    database_names_by_key=state.database_names_by_key,
+                    database=state.vumark_databases.get(
+                        vumark_database.database_name,
+                    ),
+                ),
+            )
+
+    def replace_vumark_database(self, vumark_database: VuMarkDatabase) -> None:
+        """Replace the VuMark database which has the same name as the given
+        database.
+
+        Args:
+            vumark_database: The new version of the VuMark database.
+
+        Raises:
+            KeyError: There is no VuMark database with the given name.
+        """
+        database_name = vumark_database.database_name
+        with self._lock:
+            state = self._state
+            self._state = copy.replace(
+                state,  # pyrefly: ignore[bad-argument-type]
+                vumark_databases=state.vumark_databases.set(
+                    key=database_name,
+                    value=vumark_database,
+                ),
+                database_names_by_key=_with_replaced_database_keys(
+                    database_names_by_key=state.database_names_by_key,
+                    old_database=state.vumark_databases[database_name],
+                    new_database=vumark_database,
+                ),
+            )
 
     def add_model_target_dataset(
         self,
@@ -137,14 +568,28 @@ class TargetManager:
     ) -> None:
         """Add a Model Target dataset."""
         with self._lock:
-            self._model_target_datasets[model_target_dataset.uuid_] = (
-                model_target_dataset
+            datasets = self._state.model_target_datasets
+            self._state = copy.replace(
+                self._state,  # pyrefly: ignore[bad-argument-type]
+                model_target_datasets=datasets.set(
+                    key=model_target_dataset.uuid_,
+                    value=model_target_dataset,
+                ),
             )
 
     def remove_model_target_dataset(self, dataset_uuid: str) -> None:
-        """Remove a Model Target dataset."""
+        """Remove a Model Target dataset.
+
+        Raises:
+            KeyError: There is no dataset with the given UUID.
+        """
         with self._lock:
-            del self._model_target_datasets[dataset_uuid]
+            self._state = copy.replace(
+                self._state,  # pyrefly: ignore[bad-argument-type]
+                model_target_datasets=(
+                    self._state.model_target_datasets.delete(key=dataset_uuid)
+                ),
+            )
 
     def add_cloud_database(self, cloud_database: CloudDatabase) -> None:
         """Add a cloud database.
@@ -156,61 +601,19 @@ class TargetManager:
             ValueError: One of the given cloud database keys matches a key for
                 an existing cloud database.
         """
-        message_fmt = (
-            "All {key_name}s must be unique. "
-            'There is already a database with the {key_name} "{value}".'
-        )
         with self._lock:
-            all_databases: list[AnyDatabase] = [
-                *self._cloud_databases,
-                *self._vumark_databases,
-            ]
-            for existing_db in all_databases:
-                for existing, new, key_name in (
-                    (
-                        existing_db.server_access_key,
-                        cloud_database.server_access_key,
-                        "server access key",
-                    ),
-                    (
-                        existing_db.server_secret_key,
-                        cloud_database.server_secret_key,
-                        "server secret key",
-                    ),
-                    (
-                        existing_db.database_name,
-                        cloud_database.database_name,
-                        "name",
-                    ),
-                ):
-                    if existing == new:
-                        message = message_fmt.format(
-                            key_name=key_name,
-                            value=new,
-                        )
-                        raise ValueError(message)
-
-            for existing_cloud_db in self._cloud_databases:
-                for existing, new, key_name in (
-                    (
-                        existing_cloud_db.client_access_key,
-                        cloud_database.client_access_key,
-                        "client access key",
-                    ),
-                    (
-                        existing_cloud_db.client_secret_key,
-                        cloud_database.client_secret_key,
-                        "client secret key",
-                    ),
-                ):
-                    if existing == new:
-                        message = message_fmt.format(
-                            key_name=key_name,
-                            value=new,
-                        )
-                        raise ValueError(message)
-
-            self._cloud_databases = {*self._cloud_databases, cloud_database}
+            state = self._state
+            self._state = copy.replace(
+                state,  # pyrefly: ignore[bad-argument-type]
+                cloud_databases=state.cloud_databases.set(
+                    key=cloud_database.database_name,
+                    value=cloud_database,
+                ),
+                database_names_by_key=_with_database_keys(
+                    database_names_by_key=state.database_names_by_key,
+                    database=cloud_database,
+                ),
+            )
 
     def add_vumark_database(self, vumark_database: VuMarkDatabase) -> None:
         """Add a VuMark database.
@@ -222,41 +625,16 @@ class TargetManager:
             ValueError: One of the given database keys matches a key for
                 an existing database.
         """
-        message_fmt = (
-            "All {key_name}s must be unique. "
-            'There is already a database with the {key_name} "{value}".'
-        )
         with self._lock:
-            all_databases: list[AnyDatabase] = [
-                *self._cloud_databases,
-                *self._vumark_databases,
-            ]
-            for existing_db in all_databases:
-                for existing, new, key_name in (
-                    (
-                        existing_db.server_access_key,
-                        vumark_database.server_access_key,
-                        "server access key",
-                    ),
-                    (
-                        existing_db.server_secret_key,
-                        vumark_database.server_secret_key,
-                        "server secret key",
-                    ),
-                    (
-                        existing_db.database_name,
-                        vumark_database.database_name,
-                        "name",
-                    ),
-                ):
-                    if existing == new:
-                        message = message_fmt.format(
-                            key_name=key_name,
-                            value=new,
-                        )
-                        raise ValueError(message)
-
-            self._vumark_databases = {
-                *self._vumark_databases,
-                vumark_database,
-            }
+            state = self._state
+            self._state = copy.replace(
+                state,  # pyrefly: ignore[bad-argument-type]
+                vumark_databases=state.vumark_databases.set(
+                    key=vumark_database.database_name,
+                    value=vumark_database,
+                ),
+                database_names_by_key=_with_database_keys(
+                    database_names_by_key=state.database_names_by_key,
+                    database=vumark_database,
+                ),
+            )
@@ -1,4 +1,8 @@
-"""Raters for target quality."""
+"""Raters for target quality.
+
+``pyteenybrisque``, and NumPy which it uses, are imported when a BRISQUE
+score is first computed, rather than when this module is imported.
+"""
 
 import functools
 import io
@@ -8,7 +12,6 @@ import warnings
 from typing import Protocol, runtime_checkable
 
 from beartype import beartype
-from pyteenybrisque import score
 
 from mock_vws._image_opening import open_image
 
@@ -25,6 +28,10 @@ def _get_brisque_target_tracking_rating(*, image_content: bytes) -> int:
     Args:
         image_content: A target's image's content.
     """
+    from pyteenybrisque import (  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        score,
+    )
+
     image_file = io.BytesIO(initial_bytes=image_content)
     with open_image(fp=image_file) as image, warnings.catch_warnings():
         # Uniform images produce a zero-variance warning and non-finite score.
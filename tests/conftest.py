@@ -22,6 +22,8 @@ _TARGET_SUCCESS_ATTEMPTS = 3
 # If listed later, those imports happen before pytest can register it for
 # assertion rewriting, causing a PytestAssertRewriteWarning.
 pytest_plugins = [
+    # ``pytester`` is used to test the ``mock_vws`` plugin for ``pytest``.
+    "pytester",
     "tests.mock_vws.fixtures.credentials",
     "tests.mock_vws.fixtures.prepared_requests",
     "tests.mock_vws.fixtures.vuforia_backends",
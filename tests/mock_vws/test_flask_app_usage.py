@@ -1,9 +1,14 @@
 """Tests for the usage of the mock Flask application."""
 
+import asyncio
 import base64
+import copy
 import email.utils
+import hashlib
 import io
 import json
+import logging
+import struct
 import sys
 import threading
 import time
@@ -13,11 +18,16 @@ from collections.abc import Callable, Iterator
 from http import HTTPMethod, HTTPStatus
 from typing import Any
 
+import httpx
 import pytest
 import requests
 import responses
+import respx
+from flask import Response
 from PIL import Image
 from requests_mock_flask import add_flask_app_to_mock
+from responses.registries import OrderedRegistry
+from urllib3.filepost import encode_multipart_formdata
 from vws import VWS, CloudRecoService
 from vws.exceptions.vws_exceptions import (
     RequestQuotaReachedError,
@@ -28,12 +38,26 @@ from vws_auth_tools import authorization_header, rfc_1123_date
 from werkzeug.serving import BaseWSGIServer, make_server
 
 from mock_vws._constants import ResultCodes
+from mock_vws._flask_server.embedded import (
+    EMBEDDED_APP,
+    IN_PROCESS_TARGET_MANAGER_BASE_URL,
+)
 from mock_vws._flask_server.target_manager import (
     TARGET_MANAGER,
     TARGET_MANAGER_FLASK_APP,
 )
+from mock_vws._flask_server.target_manager_client import (
+    ASYNC_TARGET_MANAGER_CLIENT,
+    TARGET_MANAGER_CLIENT,
+)
 from mock_vws._flask_server.vwq import CLOUDRECO_FLASK_APP
-from mock_vws._flask_server.vws import VWS_FLASK_APP
+from mock_vws._flask_server.vwq_asgi import CLOUDRECO_ASGI_APP
+from mock_vws._flask_server.vws import VWS_FLASK_APP, VWS_SETTINGS
+from mock_vws._flask_server.wire_format import (
+    BINARY_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    wire_reader,
+)
 from mock_vws.database import CloudDatabase, VuMarkDatabase
 from mock_vws.model_target import (
     ModelTargetDataset,
@@ -42,7 +66,8 @@ from mock_vws.model_target import (
     ModelTargetGenerationWarning,
 )
 from mock_vws.request_rate_limits import RequestRateLimit, RequestRateLimits
-from mock_vws.target import VuMarkTarget
+from mock_vws.target import ImageTarget, VuMarkTarget
+from mock_vws.target_raters import HardcodedTargetTrackingRater
 from tests.mock_vws.utils.usage_test_helpers import (
     processing_time_seconds,
 )
@@ -261,6 +286,303 @@ class TestRequestQuota:
         # Other endpoints are not limited.
         client.get_database_summary_report()
 
+    @staticmethod
+    def test_limits_shared_through_target_manager() -> None:
+        """
+        By default, the target manager keeps the request rate limit history,
+        so it is shared by all VWS app instances.
+        """
+        database = CloudDatabase(
+            request_rate_limits=RequestRateLimits(
+                list_targets=RequestRateLimit(
+                    max_requests=1,
+                    window_seconds=60.0,
+                ),
+            ),
+        )
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(
+            url=databases_url,
+            json=database.to_dict(),
+            timeout=30,
+        )
+        response.raise_for_status()
+        client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+
+        client.list_targets()
+
+        requests_url = (
+            f"{databases_url}/by_server_access_key/"
+            f"{database.server_access_key}/requests"
+        )
+        response = requests.post(
+            url=requests_url,
+            json={"endpoint": "LIST_TARGETS"},
+            timeout=30,
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    @staticmethod
+    def test_target_manager_error(
+        *,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        A request is not allowed when the target manager does not record it,
+        as it is not known whether a limit has been reached.
+        """
+
+        def record_cloud_database_request(server_access_key: str) -> Response:
+            """Fail to record a request."""
+            del server_access_key
+            return Response(status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        monkeypatch.setitem(
+            TARGET_MANAGER_FLASK_APP.view_functions,
+            "record_cloud_database_request",
+            record_cloud_database_request,
+        )
+        database = CloudDatabase(
+            request_rate_limits=RequestRateLimits(
+                list_targets=RequestRateLimit(
+                    max_requests=1,
+                    window_seconds=60.0,
+                ),
+            ),
+        )
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(
+            url=databases_url,
+            json=database.to_dict(),
+            timeout=30,
+        )
+        response.raise_for_status()
+        client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+
+        with pytest.raises(expected_exception=requests.HTTPError):
+            client.list_targets()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        argnames="data",
+        argvalues=[
+            b"not JSON",
+            b"[]",
+            b"{}",
+            b'{"endpoint": "UNKNOWN"}',
+        ],
+    )
+    def test_invalid_recorded_request(data: bytes) -> None:
+        """The target manager does not record a request whose body does not
+        give the name of an endpoint group.
+        """
+        database = CloudDatabase()
+        TARGET_MANAGER.add_cloud_database(cloud_database=database)
+
+        response = requests.post(
+            url=_EXAMPLE_URL_FOR_TARGET_MANAGER
+            + "/cloud_databases/by_server_access_key/"
+            + database.server_access_key
+            + "/requests",
+            data=data,
+            timeout=30,
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @staticmethod
+    def test_local_request_rate_limiter(
+        *,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        It is possible to keep the request rate limit history in each VWS
+        app instance.
+        """
+        monkeypatch.setenv(name="REQUEST_RATE_LIMITER", value="local")
+        database = CloudDatabase(
+            request_rate_limits=RequestRateLimits(
+                list_targets=RequestRateLimit(
+                    max_requests=1,
+                    window_seconds=60.0,
+                ),
+            ),
+        )
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(
+            url=databases_url,
+            json=database.to_dict(),
+            timeout=30,
+        )
+        response.raise_for_status()
+        client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+
+        client.list_targets()
+        with pytest.raises(expected_exception=TooManyRequestsError):
+            client.list_targets()
+
+        # The target manager has not recorded the requests.
+        requests_url = (
+            f"{databases_url}/by_server_access_key/"
+            f"{database.server_access_key}/requests"
+        )
+        response = requests.post(
+            url=requests_url,
+            json={"endpoint": "LIST_TARGETS"},
+            timeout=30,
+        )
+        assert response.status_code == HTTPStatus.OK
+
+
+class TestStreamTargetLists:
+    """Tests for streaming target lists."""
+
+    @staticmethod
+    def test_stream_target_lists(
+        *,
+        high_quality_image: io.BytesIO,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        Streamed target lists have the same targets as target lists which
+        are not streamed.
+        """
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(
+            url=databases_url,
+            json=database.to_dict(),
+            timeout=30,
+        )
+        response.raise_for_status()
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        target_ids = [
+            vws_client.add_target(
+                name=name,
+                width=1,
+                image=high_quality_image,
+                active_flag=True,
+                application_metadata=None,
+            )
+            for name in ("example-1", "example-2")
+        ]
+
+        target_list = vws_client.list_targets()
+        monkeypatch.setenv(name="STREAM_TARGET_LISTS", value="true")
+        streamed_target_list = vws_client.list_targets()
+
+        assert set(target_list) == set(target_ids)
+        assert streamed_target_list == target_list
+
+
+class TestEmbedded:
+    """Tests for serving all applications from one process."""
+
+    @staticmethod
+    def test_embedded(
+        *,
+        high_quality_image: io.BytesIO,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        The VWS, VWQ and target manager applications can be served
+        together, sharing one target manager.
+        """
+        monkeypatch.setenv(
+            name="TARGET_MANAGER_BASE_URL",
+            value=IN_PROCESS_TARGET_MANAGER_BASE_URL,
+        )
+        monkeypatch.setenv(name="PROCESSING_TIME_SECONDS", value="0")
+        server: BaseWSGIServer = make_server(
+            host="127.0.0.1",
+            port=0,
+            app=EMBEDDED_APP,
+            threaded=True,
+        )
+        server_thread = threading.Thread(
+            target=server.serve_forever,
+            daemon=True,
+        )
+        server_thread.start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            database = CloudDatabase()
+            response = requests.post(
+                url=f"{base_url}/target-manager/cloud_databases",
+                json=database.to_dict(),
+                timeout=30,
+            )
+            assert response.status_code == HTTPStatus.CREATED
+
+            vws_client = VWS(
+                server_access_key=database.server_access_key,
+                server_secret_key=database.server_secret_key,
+                base_vws_url=base_url,
+            )
+            cloud_reco_client = CloudRecoService(
+                client_access_key=database.client_access_key,
+                client_secret_key=database.client_secret_key,
+                base_vwq_url=base_url,
+            )
+            target_id = vws_client.add_target(
+                name="example",
+                width=1,
+                image=high_quality_image,
+                application_metadata=None,
+                active_flag=True,
+            )
+            vws_client.wait_for_target_processed(target_id=target_id)
+            (matching_target,) = cloud_reco_client.query(
+                image=high_quality_image,
+            )
+        finally:
+            server.shutdown()
+            server_thread.join()
+            server.server_close()
+
+        assert matching_target.target_id == target_id
+        (shared_database,) = TARGET_MANAGER.cloud_databases
+        assert {target.target_id for target in shared_database.targets} == {
+            target_id,
+        }
+
+
+class TestSettingsCache:
+    """Tests for reading settings once for many requests."""
+
+    @staticmethod
+    def test_settings_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Settings are read again only when the environment variables which
+        they are read from change.
+        """
+        settings = VWS_SETTINGS.get()
+        assert VWS_SETTINGS.get() is settings
+        assert (
+            settings.duplicates_match_checker
+            is settings.duplicates_match_checker
+        )
+
+        monkeypatch.setenv(name="RESPONSE_DELAY_SECONDS", value="0.5")
+        new_settings = VWS_SETTINGS.get()
+
+        assert new_settings is not settings
+        expected_delay_seconds = 0.5
+        assert new_settings.response_delay_seconds == expected_delay_seconds
+        assert VWS_SETTINGS.get() is new_settings
+
 
 class TestUnroutedRequests:
     """Tests for requests which the Flask app does not route.
@@ -344,148 +666,734 @@ class TestAddCloudDatabase:
                 timeout=30,
             )
 
-            assert response.status_code == HTTPStatus.CONFLICT
-            assert response.text == expected_message
+            assert response.status_code == HTTPStatus.CONFLICT
+            assert response.text == expected_message
+
+    @staticmethod
+    def test_give_no_details(high_quality_image: io.BytesIO) -> None:
+        """It is possible to create a cloud database without giving any
+        data.
+        """
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(url=databases_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.CREATED
+
+        data = json.loads(s=response.text)
+
+        assert data["targets"] == []
+        assert data["state_name"] == "WORKING"
+        assert "database_name" in data
+
+        vws_client = VWS(
+            server_access_key=data["server_access_key"],
+            server_secret_key=data["server_secret_key"],
+        )
+
+        cloud_reco_client = CloudRecoService(
+            client_access_key=data["client_access_key"],
+            client_secret_key=data["client_secret_key"],
+        )
+
+        assert not vws_client.list_targets()
+        assert not cloud_reco_client.query(image=high_quality_image)
+
+
+class TestAddVuMarkDatabase:
+    """Tests for adding VuMark databases to the mock."""
+
+    @staticmethod
+    def test_duplicate_keys() -> None:
+        """
+        It is not possible to have multiple VuMark databases with
+        matching
+        keys.
+        """
+        database = VuMarkDatabase(
+            server_access_key="1",
+            server_secret_key="2",
+            database_name="3",
+        )
+
+        bad_server_access_key_db = VuMarkDatabase(server_access_key="1")
+        bad_server_secret_key_db = VuMarkDatabase(server_secret_key="2")
+        bad_database_name_db = VuMarkDatabase(database_name="3")
+
+        server_access_key_conflict_error = (
+            "All server access keys must be unique. "
+            'There is already a database with the server access key "1".'
+        )
+        server_secret_key_conflict_error = (
+            "All server secret keys must be unique. "
+            'There is already a database with the server secret key "2".'
+        )
+        database_name_conflict_error = (
+            "All names must be unique. "
+            'There is already a database with the name "3".'
+        )
+
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
+
+        for bad_database, expected_message in (
+            (bad_server_access_key_db, server_access_key_conflict_error),
+            (bad_server_secret_key_db, server_secret_key_conflict_error),
+            (bad_database_name_db, database_name_conflict_error),
+        ):
+            response = requests.post(
+                url=databases_url,
+                json=bad_database.to_dict(),
+                timeout=30,
+            )
+
+            assert response.status_code == HTTPStatus.CONFLICT
+            assert response.text == expected_message
+
+
+class TestDeleteCloudDatabase:
+    """Tests for deleting cloud databases from the mock."""
+
+    @staticmethod
+    def test_not_found() -> None:
+        """
+        A 404 error is returned when trying to delete a cloud database
+        which does not exist.
+        """
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        delete_url = databases_url + "/" + "foobar"
+        response = requests.delete(url=delete_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @staticmethod
+    def test_delete_cloud_database() -> None:
+        """It is possible to delete a cloud database."""
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(url=databases_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.CREATED
+
+        data = json.loads(s=response.text)
+        delete_url = databases_url + "/" + data["database_name"]
+        response = requests.delete(url=delete_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.OK
+
+        response = requests.delete(url=delete_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestDeleteVuMarkDatabase:
+    """Tests for deleting VuMark databases from the mock."""
+
+    @staticmethod
+    def test_not_found() -> None:
+        """
+        A 404 error is returned when trying to delete a VuMark database
+        which does not exist.
+        """
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
+        delete_url = databases_url + "/" + "foobar"
+        response = requests.delete(url=delete_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @staticmethod
+    def test_delete_vumark_database() -> None:
+        """It is possible to delete a VuMark database."""
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
+        response = requests.post(url=databases_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.CREATED
+
+        data = json.loads(s=response.text)
+        delete_url = databases_url + "/" + data["database_name"]
+        response = requests.delete(url=delete_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.OK
+
+        response = requests.delete(url=delete_url, json={}, timeout=30)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestCreateTarget:
+    """Tests for creating targets in cloud databases in the target
+    manager.
+    """
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        argnames="content_type",
+        argvalues=[JSON_MEDIA_TYPE, BINARY_MEDIA_TYPE],
+    )
+    def test_minimal_body(
+        *,
+        high_quality_image: io.BytesIO,
+        content_type: str,
+    ) -> None:
+        """A target can be created from a body which has only the details
+        which are given when a target is added.
+        """
+        database = CloudDatabase()
+        TARGET_MANAGER.add_cloud_database(cloud_database=database)
+        image_value = high_quality_image.getvalue()
+        target_id = uuid.uuid4().hex
+        target_dict = {
+            "name": "example",
+            "width": 1,
+            "image_base64": base64.b64encode(s=image_value).decode(),
+            "active_flag": True,
+            "processing_time_seconds": 0,
+            "application_metadata": None,
+            "target_id": target_id,
+        }
+        if content_type == BINARY_MEDIA_TYPE:
+            digest = hashlib.sha256(image_value).hexdigest()
+            target_dict["image_base64"] = digest
+            parts = [
+                json.dumps(obj=target_dict).encode(),
+                digest.encode(),
+                image_value,
+            ]
+            data = b"".join(
+                struct.pack(">I", len(part)) + part for part in parts
+            )
+        else:
+            data = json.dumps(obj=target_dict).encode()
+
+        response = requests.post(
+            url=_EXAMPLE_URL_FOR_TARGET_MANAGER
+            + f"/cloud_databases/{database.database_name}/targets",
+            data=data,
+            headers={"Content-Type": content_type},
+            timeout=30,
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        stored_database = TARGET_MANAGER.get_cloud_database(
+            database_name=database.database_name,
+        )
+        (target,) = stored_database.targets
+        assert target.target_id == target_id
+        assert target.image_value == image_value
+
+
+class TestPutTargets:
+    """Tests for putting targets into cloud databases in the target
+    manager.
+    """
+
+    @staticmethod
+    def test_put_targets(high_quality_image: io.BytesIO) -> None:
+        """Targets which are put into a cloud database are in it when it is
+        next read, and a target replaces the target with the same ID.
+        """
+        database = CloudDatabase()
+        TARGET_MANAGER.add_cloud_database(cloud_database=database)
+        first_target, second_target = (
+            ImageTarget(
+                active_flag=True,
+                application_metadata=None,
+                image_value=high_quality_image.getvalue(),
+                name=name,
+                processing_time_seconds=0,
+                width=1,
+                target_tracking_rater=HardcodedTargetTrackingRater(rating=1),
+            )
+            for name in ("first", "second")
+        )
+        for target in (first_target, second_target):
+            TARGET_MANAGER.put_target(
+                database_name=database.database_name,
+                target=target,
+            )
+        # See https://github.com/facebook/pyrefly/issues/1897
+        renamed_target: ImageTarget = copy.replace(
+            first_target,  # pyrefly: ignore[bad-argument-type]
+            name="renamed",
+        )
+        TARGET_MANAGER.put_target(
+            database_name=database.database_name,
+            target=renamed_target,
+        )
+
+        stored_database = TARGET_MANAGER.get_cloud_database(
+            database_name=database.database_name,
+        )
+        assert stored_database.targets == {renamed_target, second_target}
+        # The database is not changed by reading it again.
+        (listed_database,) = TARGET_MANAGER.cloud_databases
+        assert listed_database is stored_database
+
+    @staticmethod
+    def test_unknown_database(high_quality_image: io.BytesIO) -> None:
+        """A target cannot be put into a cloud database which does not
+        exist.
+        """
+        target = ImageTarget(
+            active_flag=True,
+            application_metadata=None,
+            image_value=high_quality_image.getvalue(),
+            name="example",
+            processing_time_seconds=0,
+            width=1,
+            target_tracking_rater=HardcodedTargetTrackingRater(rating=1),
+        )
+        with pytest.raises(expected_exception=KeyError):
+            TARGET_MANAGER.put_target(
+                database_name=uuid.uuid4().hex,
+                target=target,
+            )
+
+
+class TestExportImportCloudDatabase:
+    """Tests for exporting and importing cloud databases."""
+
+    @staticmethod
+    def test_export_not_found() -> None:
+        """
+        A 404 error is returned when trying to export a cloud database
+        which does not exist.
+        """
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        export_url = databases_url + "/foobar/export"
+        response = requests.get(url=export_url, timeout=30)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @staticmethod
+    def test_export_and_import(*, high_quality_image: io.BytesIO) -> None:
+        """
+        A cloud database which is exported and then imported has the same
+        targets, including their images and ratings.
+        """
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(
+            url=databases_url,
+            json=database.to_dict(),
+            timeout=30,
+        )
+        response.raise_for_status()
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        target_id = vws_client.add_target(
+            name="example",
+            width=1,
+            image=high_quality_image,
+            active_flag=True,
+            application_metadata=None,
+        )
+
+        export_url = f"{databases_url}/{database.database_name}/export"
+        export_response = requests.get(url=export_url, timeout=30)
+        assert export_response.status_code == HTTPStatus.OK
+        assert (
+            export_response.headers["Content-Type"] == "application/x-ndjson"
+        )
+
+        exported_database = TARGET_MANAGER.get_cloud_database(
+            database_name=database.database_name,
+        )
+        TARGET_MANAGER.remove_cloud_database(cloud_database=exported_database)
+
+        import_response = requests.post(
+            url=databases_url + "/import",
+            data=export_response.content,
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=30,
+        )
+        assert import_response.status_code == HTTPStatus.CREATED
+        assert import_response.json() == {
+            "database_name": database.database_name,
+            "target_count": 1,
+        }
+
+        imported_database = TARGET_MANAGER.get_cloud_database(
+            database_name=database.database_name,
+        )
+        assert imported_database.to_dict() == exported_database.to_dict()
+        target_record = vws_client.get_target_record(target_id=target_id)
+        assert target_record.target_record.name == "example"
+
+    @staticmethod
+    def test_import_conflict() -> None:
+        """
+        A 409 error is returned when trying to import a cloud database which
+        has the same name as an existing database.
+        """
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        response = requests.post(
+            url=databases_url,
+            json=database.to_dict(),
+            timeout=30,
+        )
+        response.raise_for_status()
+
+        export_url = f"{databases_url}/{database.database_name}/export"
+        export_response = requests.get(url=export_url, timeout=30)
+        import_response = requests.post(
+            url=databases_url + "/import",
+            data=export_response.content,
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=30,
+        )
+        assert import_response.status_code == HTTPStatus.CONFLICT
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        argnames="invalid_line",
+        argvalues=[b"not json", b"[]", b"{}"],
+    )
+    def test_import_invalid_line(
+        *,
+        high_quality_image: io.BytesIO,
+        invalid_line: bytes,
+    ) -> None:
+        """
+        A 400 error is returned when trying to import a body with a line
+        which is not a valid target, and no cloud database is added.
+        """
+        database = CloudDatabase()
+        target = ImageTarget(
+            active_flag=True,
+            application_metadata=None,
+            image_value=high_quality_image.getvalue(),
+            name="example",
+            processing_time_seconds=0,
+            width=1,
+            target_tracking_rater=HardcodedTargetTrackingRater(rating=1),
+        )
+        lines = [
+            json.dumps(obj=database.to_dict()).encode(),
+            json.dumps(obj=target.to_dict()).encode(),
+            invalid_line,
+        ]
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        import_response = requests.post(
+            url=databases_url + "/import",
+            data=b"\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=30,
+        )
+
+        assert import_response.status_code == HTTPStatus.BAD_REQUEST
+        assert import_response.text == "Line 3 is not a valid target."
+        with pytest.raises(expected_exception=KeyError):
+            TARGET_MANAGER.get_cloud_database(
+                database_name=database.database_name,
+            )
+
+
+class TestCloudDatabaseChanges:
+    """Tests for the feed of changes to cloud databases."""
+
+    @staticmethod
+    def test_unknown_journal() -> None:
+        """
+        Every cloud database is returned to a requester which does not
+        have the current journal ID.
+        """
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
+
+        response = requests.get(
+            url=_EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_database_changes",
+            params={"journal_id": uuid.uuid4().hex, "since": "0"},
+            timeout=30,
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        response_json = response.json()
+        assert response_json["changes"] == []
+        assert [
+            database_dict["database_name"]
+            for database_dict in response_json["databases"]
+        ] == [database.database_name]
+
+    @staticmethod
+    def test_changes_since(high_quality_image: io.BytesIO) -> None:
+        """
+        Only the changes after the given version are returned to a
+        requester which has the current journal ID.
+        """
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        changes_url = (
+            _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_database_changes"
+        )
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
+        snapshot = requests.get(url=changes_url, timeout=30).json()
+
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        target_id = vws_client.add_target(
+            name="example",
+            width=1,
+            image=high_quality_image,
+            application_metadata=None,
+            active_flag=True,
+        )
+
+        response = requests.get(
+            url=changes_url,
+            params={
+                "journal_id": snapshot["journal_id"],
+                "since": str(object=snapshot["version"]),
+            },
+            timeout=30,
+        )
+
+        response_json = response.json()
+        assert response_json["databases"] is None
+        assert response_json["version"] == snapshot["version"] + 1
+        (change,) = response_json["changes"]
+        assert change["kind"] == "target_put"
+        assert change["database_name"] == database.database_name
+        assert change["target"]["target_id"] == target_id
+
+    @staticmethod
+    def test_up_to_date() -> None:
+        """
+        No changes are returned to a requester which has the latest
+        version.
+        """
+        changes_url = (
+            _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_database_changes"
+        )
+        snapshot = requests.get(url=changes_url, timeout=30).json()
+
+        response = requests.get(
+            url=changes_url,
+            params={
+                "journal_id": snapshot["journal_id"],
+                "since": str(object=snapshot["version"]),
+            },
+            timeout=30,
+        )
+
+        response_json = response.json()
+        assert response_json["databases"] is None
+        assert response_json["changes"] == []
+        assert response_json["version"] == snapshot["version"]
+
+
+class TestGetDatabaseByAccessKey:
+    """Tests for getting a single database by one of its access keys."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        argnames="key_kind",
+        argvalues=["server_access_key", "client_access_key"],
+    )
+    def test_cloud_database(
+        *,
+        high_quality_image: io.BytesIO,
+        key_kind: str,
+    ) -> None:
+        """
+        A cloud database can be fetched by its server or client access
+        key, with or without the images of its targets.
+        """
+        database = CloudDatabase()
+        other_database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        for database_to_add in (database, other_database):
+            requests.post(
+                url=databases_url,
+                json=database_to_add.to_dict(),
+                timeout=30,
+            )
+
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        vws_client.add_target(
+            name="example",
+            width=1,
+            image=high_quality_image,
+            application_metadata=None,
+            active_flag=True,
+        )
+
+        access_key = (
+            database.server_access_key
+            if key_kind == "server_access_key"
+            else database.client_access_key
+        )
+        url = f"{databases_url}/by_{key_kind}/{access_key}"
+
+        response = requests.get(url=url, timeout=30)
+        assert response.status_code == HTTPStatus.OK
+        (target_dict,) = response.json()["targets"]
+        assert response.json()["database_name"] == database.database_name
+        assert base64.b64decode(s=target_dict["image_base64"]) == (
+            high_quality_image.getvalue()
+        )
+
+        response = requests.get(
+            url=url,
+            params={"include_images": "false"},
+            timeout=30,
+        )
+        assert response.status_code == HTTPStatus.OK
+        (target_dict,) = response.json()["targets"]
+        assert target_dict["image_base64"] == ""
 
     @staticmethod
-    def test_give_no_details(high_quality_image: io.BytesIO) -> None:
-        """It is possible to create a cloud database without giving any
-        data.
-        """
+    def test_cloud_database_not_found() -> None:
+        """A 404 error is returned when no cloud database has the key."""
         databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
-        response = requests.post(url=databases_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.CREATED
-
-        data = json.loads(s=response.text)
+        response = requests.get(
+            url=databases_url + "/by_server_access_key/foobar",
+            timeout=30,
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
 
-        assert data["targets"] == []
-        assert data["state_name"] == "WORKING"
-        assert "database_name" in data
+    @staticmethod
+    def test_vumark_database() -> None:
+        """A VuMark database can be fetched by its server access key."""
+        database = VuMarkDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
 
-        vws_client = VWS(
-            server_access_key=data["server_access_key"],
-            server_secret_key=data["server_secret_key"],
+        response = requests.get(
+            url=(
+                f"{databases_url}/by_server_access_key/"
+                f"{database.server_access_key}"
+            ),
+            timeout=30,
         )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == database.to_dict()
 
-        cloud_reco_client = CloudRecoService(
-            client_access_key=data["client_access_key"],
-            client_secret_key=data["client_secret_key"],
+        response = requests.get(
+            url=databases_url + "/by_server_access_key/foobar",
+            timeout=30,
         )
-
-        assert not vws_client.list_targets()
-        assert not cloud_reco_client.query(image=high_quality_image)
+        assert response.status_code == HTTPStatus.NOT_FOUND
 
 
-class TestAddVuMarkDatabase:
-    """Tests for adding VuMark databases to the mock."""
+class TestBinaryWireFormat:
+    """Tests for the binary format for target manager traffic."""
 
     @staticmethod
-    def test_duplicate_keys() -> None:
+    def test_negotiated_by_accept_header(
+        high_quality_image: io.BytesIO,
+    ) -> None:
         """
-        It is not possible to have multiple VuMark databases with
-        matching
-        keys.
+        Cloud databases are sent in the binary format when it is
+        accepted, and as JSON otherwise.
         """
-        database = VuMarkDatabase(
-            server_access_key="1",
-            server_secret_key="2",
-            database_name="3",
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        vws_client.add_target(
+            name="example",
+            width=1,
+            image=high_quality_image,
+            application_metadata=None,
+            active_flag=True,
         )
 
-        bad_server_access_key_db = VuMarkDatabase(server_access_key="1")
-        bad_server_secret_key_db = VuMarkDatabase(server_secret_key="2")
-        bad_database_name_db = VuMarkDatabase(database_name="3")
+        json_response = requests.get(url=databases_url, timeout=30)
+        binary_response = requests.get(
+            url=databases_url,
+            headers={"Accept": BINARY_MEDIA_TYPE},
+            timeout=30,
+        )
 
-        server_access_key_conflict_error = (
-            "All server access keys must be unique. "
-            'There is already a database with the server access key "1".'
+        assert json_response.headers["Content-Type"] == JSON_MEDIA_TYPE
+        assert binary_response.headers["Content-Type"] == BINARY_MEDIA_TYPE
+        assert len(binary_response.content) < len(json_response.content)
+
+        json_reader = wire_reader(
+            content=json_response.content,
+            content_type=json_response.headers["Content-Type"],
         )
-        server_secret_key_conflict_error = (
-            "All server secret keys must be unique. "
-            'There is already a database with the server secret key "2".'
+        binary_reader = wire_reader(
+            content=binary_response.content,
+            content_type=binary_response.headers["Content-Type"],
         )
-        database_name_conflict_error = (
-            "All names must be unique. "
-            'There is already a database with the name "3".'
+        (json_database_dict,) = json_reader.document
+        (binary_database_dict,) = binary_reader.document
+        json_database = json_reader.cloud_database_from_dict(
+            database_dict=json_database_dict,
         )
+        binary_database = binary_reader.cloud_database_from_dict(
+            database_dict=binary_database_dict,
+        )
+        assert binary_database == json_database
+        (target,) = binary_database.targets
+        assert target.image_value == high_quality_image.getvalue()
 
-        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
-        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
-
-        for bad_database, expected_message in (
-            (bad_server_access_key_db, server_access_key_conflict_error),
-            (bad_server_secret_key_db, server_secret_key_conflict_error),
-            (bad_database_name_db, database_name_conflict_error),
+    @staticmethod
+    def test_invalid_binary_body() -> None:
+        """A truncated binary body cannot be read."""
+        with pytest.raises(
+            expected_exception=ValueError,
+            match="The binary body is not complete",
         ):
-            response = requests.post(
-                url=databases_url,
-                json=bad_database.to_dict(),
-                timeout=30,
+            wire_reader(
+                content=b"\x00\x00\x00\x10{}",
+                content_type=BINARY_MEDIA_TYPE,
             )
 
-            assert response.status_code == HTTPStatus.CONFLICT
-            assert response.text == expected_message
-
-
-class TestDeleteCloudDatabase:
-    """Tests for deleting cloud databases from the mock."""
 
-    @staticmethod
-    def test_not_found() -> None:
-        """
-        A 404 error is returned when trying to delete a cloud database
-        which does not exist.
-        """
-        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
-        delete_url = databases_url + "/" + "foobar"
-        response = requests.delete(url=delete_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.NOT_FOUND
+class TestTargetManagerClient:
+    """Tests for the client which the apps use for the target manager."""
 
     @staticmethod
-    def test_delete_cloud_database() -> None:
-        """It is possible to delete a cloud database."""
+    def test_latency_is_logged(
+        *,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """The time taken by each request to the target manager is logged."""
+        caplog.set_level(
+            level=logging.DEBUG,
+            logger="mock_vws._flask_server.target_manager_client",
+        )
+        database = CloudDatabase()
         databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
-        response = requests.post(url=databases_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.CREATED
-
-        data = json.loads(s=response.text)
-        delete_url = databases_url + "/" + data["database_name"]
-        response = requests.delete(url=delete_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.OK
-
-        response = requests.delete(url=delete_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.NOT_FOUND
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
 
+        vws_client.list_targets()
 
-class TestDeleteVuMarkDatabase:
-    """Tests for deleting VuMark databases from the mock."""
+        expected_prefix = (
+            f"GET {_EXAMPLE_URL_FOR_TARGET_MANAGER}/cloud_database_changes"
+        )
+        assert any(
+            message.startswith(expected_prefix)
+            and message.endswith(" seconds.")
+            for message in caplog.messages
+        )
 
     @staticmethod
-    def test_not_found() -> None:
+    def test_unavailable_is_retried() -> None:
         """
-        A 404 error is returned when trying to delete a VuMark database
-        which does not exist.
+        An idempotent request which gets a response showing that the
+        target manager is not available is retried.
         """
-        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
-        delete_url = databases_url + "/" + "foobar"
-        response = requests.delete(url=delete_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.NOT_FOUND
-
-    @staticmethod
-    def test_delete_vumark_database() -> None:
-        """It is possible to delete a VuMark database."""
-        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/vumark_databases"
-        response = requests.post(url=databases_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.CREATED
+        url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/unavailable"
+        with responses.RequestsMock(
+            registry=OrderedRegistry,
+        ) as mock_obj:
+            mock_obj.get(url=url, status=HTTPStatus.SERVICE_UNAVAILABLE)
+            mock_obj.get(url=url, status=HTTPStatus.OK)
+            response = TARGET_MANAGER_CLIENT.request(
+                method=HTTPMethod.GET,
+                url=url,
+            )
 
-        data = json.loads(s=response.text)
-        delete_url = databases_url + "/" + data["database_name"]
-        response = requests.delete(url=delete_url, json={}, timeout=30)
         assert response.status_code == HTTPStatus.OK
 
-        response = requests.delete(url=delete_url, json={}, timeout=30)
-        assert response.status_code == HTTPStatus.NOT_FOUND
-
 
 class TestQueryImageMatchers:
     """Tests for query image matchers."""
@@ -1156,6 +2064,186 @@ class TestResponseDelay:
         assert elapsed >= self.DELAY_SECONDS
 
 
+def _target_manager_response(request: httpx.Request) -> httpx.Response:
+    """Handle a request to the target manager with the Flask app."""
+    flask_response = TARGET_MANAGER_FLASK_APP.test_client().open(
+        path=request.url.path,
+        method=request.method,
+        query_string=request.url.query,
+        headers=dict(request.headers),
+        data=request.content,
+    )
+    return httpx.Response(
+        status_code=flask_response.status_code,
+        headers=list(flask_response.headers.items()),
+        content=flask_response.get_data(),
+    )
+
+
+def _send_to_asgi_app(
+    *,
+    requests_to_send: list[httpx.Request],
+) -> list[httpx.Response]:
+    """Send requests to the asyncio query app, all at once."""
+
+    async def send_all() -> list[httpx.Response]:
+        """Send the requests in one event loop."""
+        transport = httpx.ASGITransport(app=CLOUDRECO_ASGI_APP)
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses_received = await asyncio.gather(
+                *(
+                    client.send(request=request)
+                    for request in requests_to_send
+                ),
+            )
+        await ASYNC_TARGET_MANAGER_CLIENT.aclose()
+        return list(responses_received)
+
+    with respx.mock(
+        base_url=_EXAMPLE_URL_FOR_TARGET_MANAGER,
+        assert_all_called=False,
+    ) as respx_mock:
+        respx_mock.route().mock(side_effect=_target_manager_response)
+        return asyncio.run(main=send_all())
+
+
+def _query_request(
+    *,
+    database: CloudDatabase,
+    image: io.BytesIO,
+) -> httpx.Request:
+    """Make a signed request to query a database with an image."""
+    files = {"image": ("image.jpeg", image.getvalue(), "image/jpeg")}
+    content, content_type_header = encode_multipart_formdata(fields=files)
+    date = rfc_1123_date()
+    request_path = "/v1/query"
+    authorization_string = authorization_header(
+        access_key=database.client_access_key,
+        secret_key=database.client_secret_key,
+        method=HTTPMethod.POST,
+        content=content,
+        content_type="multipart/form-data",
+        date=date,
+        request_path=request_path,
+    )
+    return httpx.Request(
+        method=HTTPMethod.POST,
+        url="https://cloudreco.vuforia.com" + request_path,
+        headers={
+            "Authorization": authorization_string,
+            "Date": date,
+            "Content-Type": content_type_header,
+        },
+        content=content,
+    )
+
+
+class TestAsyncQueryService:
+    """Tests for the asyncio implementation of the query service."""
+
+    @staticmethod
+    def test_same_responses_as_flask_app(
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """Queries get the same responses as from the Flask app."""
+        database = CloudDatabase()
+        databases_url = _EXAMPLE_URL_FOR_TARGET_MANAGER + "/cloud_databases"
+        requests.post(url=databases_url, json=database.to_dict(), timeout=30)
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        target_id = vws_client.add_target(
+            name="example",
+            width=1,
+            image=high_quality_image,
+            application_metadata=None,
+            active_flag=True,
+        )
+        vws_client.wait_for_target_processed(target_id=target_id)
+
+        matching_request = _query_request(
+            database=database,
+            image=high_quality_image,
+        )
+        unauthenticated_request = _query_request(
+            database=CloudDatabase(),
+            image=high_quality_image,
+        )
+        asgi_responses = _send_to_asgi_app(
+            requests_to_send=[matching_request, unauthenticated_request],
+        )
+        flask_responses = [
+            requests.post(
+                url=str(object=request.url),
+                headers=dict(request.headers),
+                data=request.content,
+                timeout=30,
+            )
+            for request in (matching_request, unauthenticated_request)
+        ]
+
+        for asgi_response, flask_response in zip(
+            asgi_responses,
+            flask_responses,
+            strict=True,
+        ):
+            assert asgi_response.status_code == flask_response.status_code
+            assert asgi_response.headers.keys() == {
+                key.lower() for key in flask_response.headers
+            }
+
+        matching_response, unauthenticated_response = asgi_responses
+        assert matching_response.status_code == HTTPStatus.OK
+        [result] = matching_response.json()["results"]
+        assert result["target_id"] == target_id
+        assert unauthenticated_response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @staticmethod
+    def test_unknown_path() -> None:
+        """A request to a path which is not routed returns a 404."""
+        request = httpx.Request(
+            method=HTTPMethod.GET,
+            url="https://cloudreco.vuforia.com/some-random-endpoint",
+        )
+        (response,) = _send_to_asgi_app(requests_to_send=[request])
+        flask_response = CLOUDRECO_FLASK_APP.test_client().get(
+            "/some-random-endpoint",
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response.content == flask_response.get_data()
+
+    @staticmethod
+    def test_response_delays_overlap(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Responses which are delayed do not wait for each other."""
+        delay_seconds = 0.5
+        num_requests = 20
+        monkeypatch.setenv(
+            name="RESPONSE_DELAY_SECONDS",
+            value=f"{delay_seconds}",
+        )
+        requests_to_send = [
+            httpx.Request(
+                method=HTTPMethod.POST,
+                url="https://cloudreco.vuforia.com/v1/query",
+            )
+            for _ in range(num_requests)
+        ]
+
+        start = time.monotonic()
+        responses_received = _send_to_asgi_app(
+            requests_to_send=requests_to_send,
+        )
+        elapsed = time.monotonic() - start
+
+        assert all(
+            response.status_code != HTTPStatus.OK
+            for response in responses_received
+        )
+        assert delay_seconds <= elapsed < delay_seconds * num_requests / 2
+
+
 _NUM_WRITER_THREADS = 4
 _NUM_READER_THREADS = 4
 _NUM_REQUESTS_PER_WRITER = 25
@@ -1431,3 +2519,52 @@ class TestConcurrentRequests:
                 target["target_id"] for target in listed_database["targets"]
             }
             assert listed_target_ids == target_ids
+
+    @staticmethod
+    def test_create_targets_in_separate_databases(
+        *,
+        threaded_target_manager_url: str,
+        small_image_base64: str,
+    ) -> None:
+        """Targets added to different databases at the same time are all
+        kept.
+        """
+        base_url = threaded_target_manager_url
+        databases = [
+            _create_cloud_database(base_url=base_url)
+            for _ in range(_NUM_WRITER_THREADS)
+        ]
+        databases_to_write = list(databases)
+        databases_to_write_lock = threading.Lock()
+
+        def writer(session: requests.Session) -> list[requests.Response]:
+            """Add targets to one database."""
+            with databases_to_write_lock:
+                database = databases_to_write.pop()
+            return [
+                _create_image_target(
+                    session=session,
+                    base_url=base_url,
+                    database=database,
+                    image_base64=small_image_base64,
+                )
+                for _ in range(_NUM_REQUESTS_PER_WRITER)
+            ]
+
+        def reader(session: requests.Session) -> list[requests.Response]:
+            """List all cloud databases."""
+            return [_list_cloud_databases(session=session, base_url=base_url)]
+
+        all_responses = _run_concurrently(writer=writer, reader=reader)
+
+        error_statuses = [
+            response.status_code
+            for response in all_responses
+            if response.status_code not in {HTTPStatus.OK, HTTPStatus.CREATED}
+        ]
+        assert not error_statuses
+        for database in databases:
+            stored_database = TARGET_MANAGER.get_cloud_database(
+                database_name=database.database_name,
+            )
+            assert len(stored_database.targets) == _NUM_REQUESTS_PER_WRITER
@@ -56,6 +56,20 @@ def test_nothing_listening() -> None:
     assert not flask_app_healthy(port=_unused_port())
 
 
+@beartype
+def test_not_responding() -> None:
+    """A server which accepts connections but does not respond is not
+    healthy.
+
+    This is the state while a Gunicorn worker is starting.
+    """
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        sock.listen()
+        port: int = sock.getsockname()[1]
+        assert not flask_app_healthy(port=port)
+
+
 @pytest.mark.parametrize(
     argnames="status",
     argvalues=[
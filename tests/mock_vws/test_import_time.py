@@ -0,0 +1,41 @@
+"""Tests for what importing the package imports."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Importing each of these takes a long time compared with importing the rest
+# of the package, and they are needed only by some matchers, raters and
+# mocks.
+_SLOW_TO_IMPORT_MODULES = ("cv2", "httpx", "numpy", "pyteenybrisque", "respx")
+
+
+@pytest.mark.parametrize(
+    argnames="module_name",
+    argvalues=[
+        "mock_vws",
+        "mock_vws.image_matchers",
+        "mock_vws.target_raters",
+    ],
+)
+def test_slow_modules_are_not_imported(module_name: str) -> None:
+    """Importing the package, or the modules which give the default matchers
+    and raters, does not import modules which are slow to import.
+    """
+    code = (
+        "import importlib, json, sys\n"
+        f"importlib.import_module({module_name!r})\n"
+        f"print(json.dumps([name for name in {_SLOW_TO_IMPORT_MODULES!r} "
+        "if name in sys.modules]))\n"
+    )
+    # A new interpreter is used, as this test process has already imported
+    # these modules.
+    result = subprocess.run(
+        args=[sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert json.loads(s=result.stdout) == []
@@ -0,0 +1,73 @@
+"""Tests for the immutable mapping which backs the target manager."""
+
+import random
+
+import pytest
+
+from mock_vws._persistent_map import PersistentMap
+
+_OPERATIONS = 2000
+
+
+class _CollidingKey:
+    """A key whose hash is shared with other keys."""
+
+    def __init__(self, *, name: str, key_hash: int) -> None:
+        """
+        Args:
+            name: What makes this key different from other keys.
+            key_hash: The hash of this key.
+        """
+        self.name = name
+        self.key_hash = key_hash
+
+    def __hash__(self) -> int:
+        """The given hash."""
+        return self.key_hash
+
+    def __eq__(self, other: object) -> bool:
+        """Whether another key has the same name."""
+        if not isinstance(other, _CollidingKey):
+            return NotImplemented
+        return self.name == other.name
+
+
+def test_matches_dict() -> None:
+    """A persistent map has the same items as a dictionary which is changed
+    in the same way, and earlier versions are not changed.
+    """
+    rng = random.Random(x=0)  # noqa: S311
+    keys: list[object] = [
+        *range(200),
+        *(
+            _CollidingKey(name=str(index), key_hash=index % 3)
+            for index in range(20)
+        ),
+    ]
+    expected: dict[object, int] = {}
+    persistent_map: PersistentMap[object, int] = PersistentMap()
+    versions: list[tuple[PersistentMap[object, int], dict[object, int]]] = []
+
+    for value in range(_OPERATIONS):
+        key = rng.choice(seq=keys)
+        if rng.random() < 1 / 3:
+            persistent_map = persistent_map.discard(key=key)
+            expected.pop(key, None)
+        else:
+            persistent_map = persistent_map.set(key=key, value=value)
+            expected[key] = value
+        versions.append((persistent_map, dict(expected)))
+
+    for version, expected_items in versions:
+        assert dict(version) == expected_items
+        assert len(version) == len(expected_items)
+
+
+def test_delete_missing_key() -> None:
+    """Deleting a key which is not in a map raises ``KeyError``, and
+    discarding it returns the same map.
+    """
+    persistent_map = PersistentMap[str, int]().set(key="a", value=1)
+    with pytest.raises(expected_exception=KeyError):
+        persistent_map.delete(key="b")
+    assert persistent_map.discard(key="b") is persistent_map
@@ -0,0 +1,100 @@
+"""Tests for the ``pytest`` plugin."""
+
+import pytest
+
+_CONFTEST = """
+import io
+import uuid
+
+import pytest
+from PIL import Image
+
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase
+from mock_vws.target import ImageTarget
+from mock_vws.target_raters import HardcodedTargetTrackingRater
+
+pytest_plugins = ["mock_vws.pytest_plugin"]
+
+
+@pytest.fixture(name="seeded_database", scope="session")
+def fixture_seeded_database() -> CloudDatabase:
+    image_file = io.BytesIO()
+    Image.new(mode="RGB", size=(100, 100), color="red").save(
+        fp=image_file,
+        format="PNG",
+    )
+    target = ImageTarget(
+        active_flag=True,
+        application_metadata=None,
+        image_value=image_file.getvalue(),
+        name=uuid.uuid4().hex,
+        processing_time_seconds=0,
+        target_tracking_rater=HardcodedTargetTrackingRater(rating=3),
+        width=1,
+    )
+    return CloudDatabase(targets={target})
+
+
+@pytest.fixture(name="mock_vws_session", scope="session")
+def fixture_mock_vws_session(*, seeded_database: CloudDatabase) -> MockVWS:
+    mock = MockVWS()
+    mock.add_cloud_database(cloud_database=seeded_database)
+    return mock
+"""
+
+_TESTS = """
+import pytest
+from vws import VWS
+from vws.exceptions.vws_exceptions import AuthenticationFailureError
+
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase
+
+_ADDED_DATABASE = CloudDatabase()
+
+
+def _client(*, database: CloudDatabase) -> VWS:
+    return VWS(
+        server_access_key=database.server_access_key,
+        server_secret_key=database.server_secret_key,
+    )
+
+
+def test_change_state(
+    *,
+    mock_vws: MockVWS,
+    seeded_database: CloudDatabase,
+) -> None:
+    vws_client = _client(database=seeded_database)
+    (target_id,) = vws_client.list_targets()
+    vws_client.delete_target(target_id=target_id)
+    assert vws_client.list_targets() == []
+
+    mock_vws.add_cloud_database(cloud_database=_ADDED_DATABASE)
+    assert _client(database=_ADDED_DATABASE).list_targets() == []
+
+
+@pytest.mark.usefixtures("mock_vws")
+def test_state_is_rolled_back(*, seeded_database: CloudDatabase) -> None:
+    (target,) = seeded_database.targets
+    assert _client(database=seeded_database).list_targets() == [
+        target.target_id,
+    ]
+
+    with pytest.raises(expected_exception=AuthenticationFailureError):
+        _client(database=_ADDED_DATABASE).list_targets()
+"""
+
+
+def test_state_is_rolled_back_after_each_test(
+    pytester: pytest.Pytester,
+) -> None:
+    """Each test which uses the ``mock_vws`` fixture gets the databases and
+    targets which the session's mock was given, and not those made by
+    earlier tests.
+    """
+    pytester.makeconftest(source=_CONFTEST)
+    pytester.makepyfile(_TESTS)
+    result = pytester.runpytest_inprocess()
+    result.assert_outcomes(passed=2)
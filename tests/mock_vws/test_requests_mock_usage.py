@@ -1,13 +1,20 @@
 """Tests for the usage of the mock for ``requests``."""
 
+import copy
 import dataclasses
 import datetime
 import email.utils
 import io
 import json
 import socket
+import threading
+import uuid
 import zipfile
+from collections.abc import Set as AbstractSet
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
 from http import HTTPStatus
+from typing import IO, Any
 from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
@@ -28,8 +35,10 @@ from vws.reports import TargetStatuses
 from vws.transports import HTTPXTransport
 from vws_auth_tools import authorization_header, rfc_1123_date
 
+import mock_vws.target
 from mock_vws import MissingSchemeError, MockVWS
 from mock_vws._constants import ResultCodes
+from mock_vws._image_opening import open_image
 from mock_vws._services_validators.exceptions import (
     TooManyRequestsError as TooManyRequestsValidatorError,
 )
@@ -46,7 +55,8 @@ from mock_vws.request_rate_limits import (
     RequestRateLimits,
 )
 from mock_vws.states import States
-from mock_vws.target import ImageTarget, VuMarkTarget
+from mock_vws.target import ImageTarget, ImageTargetSeed, VuMarkTarget
+from mock_vws.target_manager import TargetManager
 from mock_vws.target_raters import HardcodedTargetTrackingRater
 from tests.mock_vws.utils import Endpoint
 from tests.mock_vws.utils.assertions import assert_vws_failure
@@ -89,6 +99,21 @@ def _not_exact_matcher(
     return first_image_content != second_image_content
 
 
+@beartype
+class _CountingTargetTrackingRater:
+    """A target tracking rater which counts how often it is used."""
+
+    def __init__(self) -> None:
+        """Create a rater which has not been used."""
+        self.calls = 0
+
+    def __call__(self, image_content: bytes) -> int:
+        """Give a rating of 3, and count the call."""
+        del image_content
+        self.calls += 1
+        return 3
+
+
 @beartype
 def _unused_local_url() -> str:
     """Return a URL for a local address with nothing listening on it."""
@@ -772,6 +797,112 @@ class TestAdditionalResultCodes:
         assert response.json()["result_code"] == "ProjectHasNoApiAccess"
 
 
+@beartype
+def _list_targets(
+    *,
+    database: CloudDatabase,
+    extra_headers: dict[str, str],
+) -> requests.Response:
+    """Make a ``GET /targets`` request with the given extra headers."""
+    request_path = "/targets"
+    date = rfc_1123_date()
+    auth = authorization_header(
+        access_key=database.server_access_key,
+        secret_key=database.server_secret_key,
+        method="GET",
+        content=b"",
+        content_type="",
+        date=date,
+        request_path=request_path,
+    )
+    return requests.get(
+        url="https://vws.vuforia.com" + request_path,
+        headers={"Authorization": auth, "Date": date, **extra_headers},
+        timeout=30,
+    )
+
+
+class TestTargetListPages:
+    """Tests for listing targets a page at a time."""
+
+    @staticmethod
+    def test_pages(high_quality_image: io.BytesIO) -> None:
+        """
+        Targets can be listed a page at a time, in the same order as they
+        are listed all at once.
+        """
+        database = CloudDatabase()
+        for _ in range(3):
+            database.targets.add(
+                ImageTarget(
+                    active_flag=True,
+                    application_metadata=None,
+                    image_value=high_quality_image.getvalue(),
+                    name=uuid.uuid4().hex,
+                    processing_time_seconds=0,
+                    target_tracking_rater=HardcodedTargetTrackingRater(
+                        rating=3,
+                    ),
+                    width=1,
+                ),
+            )
+
+        with MockVWS() as mock:
+            mock.add_cloud_database(cloud_database=database)
+            all_targets_response = _list_targets(
+                database=database,
+                extra_headers={},
+            )
+            first_page_response = _list_targets(
+                database=database,
+                extra_headers={"X-Mock-Page-Size": "2"},
+            )
+            next_cursor = first_page_response.headers["X-Mock-Next-Cursor"]
+            second_page_response = _list_targets(
+                database=database,
+                extra_headers={
+                    "X-Mock-Page-Size": "2",
+                    "X-Mock-Cursor": next_cursor,
+                },
+            )
+
+        all_target_ids = all_targets_response.json()["results"]
+        assert len(all_target_ids) == len(database.targets)
+        assert "X-Mock-Next-Cursor" not in all_targets_response.headers
+        first_page = first_page_response.json()["results"]
+        second_page = second_page_response.json()["results"]
+        assert first_page == all_target_ids[:2]
+        assert second_page == all_target_ids[2:]
+        assert "X-Mock-Next-Cursor" not in second_page_response.headers
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        argnames="page_size",
+        argvalues=[
+            "-1",
+            # This is a digit to ``str.isdigit``, but ``int`` does not
+            # accept it.
+            "\N{SUPERSCRIPT TWO}",
+        ],
+    )
+    def test_invalid_headers_ignored(page_size: str) -> None:
+        """Invalid page sizes and cursors are ignored."""
+        database = CloudDatabase()
+
+        with MockVWS() as mock:
+            mock.add_cloud_database(cloud_database=database)
+            response = _list_targets(
+                database=database,
+                extra_headers={
+                    "X-Mock-Page-Size": page_size,
+                    "X-Mock-Cursor": "not-a-cursor",
+                },
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["results"] == []
+
+
 class TestCustomBaseURLs:
     """Tests for using custom base URLs."""
 
@@ -1001,7 +1132,7 @@ class TestTargets:
         """Every field of a target survives a dictionary round trip.
 
         The target tracking rater is deliberately not preserved:
-        ``to_dict`` writes the computed tracking rating and ``from_dict``
+        ``to_dict`` writes the current tracking rating and ``from_dict``
         rebuilds the target with a hardcoded rater which gives that
         rating.
         """
@@ -1062,6 +1193,107 @@ class TestTargets:
         assert new_target == target
         assert new_target.tracking_rating == target.tracking_rating
 
+    @staticmethod
+    def test_to_dict_while_rating(high_quality_image: io.BytesIO) -> None:
+        """A target gives a tracking rating of -1 while it is being rated,
+        and a target loaded with the rating after processing also gives -1
+        until then.
+        """
+        rater = _CountingTargetTrackingRater()
+        target = ImageTarget(
+            active_flag=True,
+            application_metadata=None,
+            image_value=high_quality_image.getvalue(),
+            name="example",
+            processing_time_seconds=60,
+            target_tracking_rater=rater,
+            width=1,
+        )
+
+        target_dict = target.to_dict()
+        assert target_dict["tracking_rating"] == -1
+        assert "post_processing_tracking_rating" not in target_dict
+        assert rater.calls == 0
+
+        replicated_dict = target.to_dict(
+            include_post_processing_tracking_rating=True,
+        )
+        post_processing_rating = replicated_dict[
+            "post_processing_tracking_rating"
+        ]
+        assert replicated_dict["tracking_rating"] == -1
+        assert rater.calls == 1
+        assert post_processing_rating == rater(image_content=b"")
+
+        new_target = ImageTarget.from_dict(target_dict=replicated_dict)
+        assert new_target.tracking_rating == -1
+        new_rater = new_target.target_tracking_rater
+        assert new_rater(image_content=b"") == post_processing_rating
+
+    @staticmethod
+    def test_to_dict_memoized(high_quality_image: io.BytesIO) -> None:
+        """
+        A target is rated only once however often it is dumped, and
+        changing a dumped dictionary does not change later dumps.
+        """
+        rater = _CountingTargetTrackingRater()
+        target = ImageTarget(
+            active_flag=True,
+            application_metadata=None,
+            image_value=high_quality_image.getvalue(),
+            name="example",
+            processing_time_seconds=0,
+            target_tracking_rater=rater,
+            width=1,
+        )
+
+        target_dict = target.to_dict()
+        target_dict["name"] = "changed"
+        target_dict_without_image = target.to_dict(include_image=False)
+
+        assert target.to_dict()["name"] == "example"
+        assert target.to_dict() == target.to_dict()
+        assert target_dict_without_image["image_base64"] == ""
+        assert rater.calls == 1
+
+    @staticmethod
+    def test_image_decoded_once(
+        *,
+        high_quality_image: io.BytesIO,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        A target's image is decoded only when its status is needed, and
+        only once however often the status is needed.
+        """
+        opened_files: list[IO[bytes]] = []
+
+        def _open_image(*, fp: IO[bytes]) -> AbstractContextManager[Any]:
+            """Open an image, and record that it was opened."""
+            opened_files.append(fp)
+            return open_image(fp=fp)
+
+        monkeypatch.setattr(
+            target=mock_vws.target,
+            name="open_image",
+            value=_open_image,
+        )
+        target = ImageTarget(
+            active_flag=True,
+            application_metadata=None,
+            image_value=high_quality_image.getvalue(),
+            name="example",
+            processing_time_seconds=0,
+            target_tracking_rater=HardcodedTargetTrackingRater(rating=3),
+            width=1,
+        )
+        assert not opened_files
+
+        statuses = {target.status for _ in range(3)}
+
+        assert statuses == {TargetStatuses.SUCCESS.value}
+        assert len(opened_files) == 1
+
     @staticmethod
     def test_vumark_target_to_dict() -> None:
         """It is possible to dump a VuMark target to a dictionary and
@@ -1079,6 +1311,57 @@ class TestTargets:
         assert new_target == vumark_target
 
 
+class TestAddImageTargets:
+    """Tests for adding targets which have finished processing."""
+
+    @staticmethod
+    def test_add_image_targets(high_quality_image: io.BytesIO) -> None:
+        """Added targets have finished processing, with the given tracking
+        rating and status if there are any.
+        """
+        database = CloudDatabase()
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        image_value = high_quality_image.getvalue()
+        default_rating = 5
+
+        mock = MockVWS(
+            processing_time_seconds=100,
+            target_tracking_rater=HardcodedTargetTrackingRater(
+                rating=default_rating,
+            ),
+        )
+        mock.add_cloud_database(cloud_database=database)
+        rated_target_id, failed_target_id = mock.add_image_targets(
+            cloud_database=database,
+            seeds=[
+                ImageTargetSeed(image_value=image_value),
+                ImageTargetSeed(
+                    image_value=image_value,
+                    name="failed",
+                    tracking_rating=1,
+                    status="failed",
+                ),
+            ],
+        )
+
+        with mock:
+            rated_target = vws_client.get_target_record(
+                target_id=rated_target_id,
+            )
+            failed_target = vws_client.get_target_record(
+                target_id=failed_target_id,
+            )
+
+        assert rated_target.status == TargetStatuses.SUCCESS
+        assert rated_target.target_record.tracking_rating == default_rating
+        assert failed_target.status == TargetStatuses.FAILED
+        assert failed_target.target_record.name == "failed"
+        assert failed_target.target_record.tracking_rating == 1
+
+
 class TestDatabaseToDict:
     """Tests for dumping a database to a dictionary."""
 
@@ -1393,6 +1676,98 @@ class TestAddDatabase:
                     mock.add_vumark_database(vumark_database=bad_database)
 
 
+class TestTargetManagerReads:
+    """Tests for reading the state of a target manager."""
+
+    @staticmethod
+    def test_reads_do_not_wait_for_lock() -> None:
+        """The databases can be read on one thread while another thread
+        holds the target manager's lock, and a change is seen only once it
+        is made.
+        """
+        target_manager = TargetManager()
+        database = CloudDatabase()
+        target_manager.add_cloud_database(cloud_database=database)
+        read_databases: list[AbstractSet[CloudDatabase]] = []
+
+        def read() -> None:
+            """Read the databases."""
+            read_databases.append(target_manager.cloud_databases)
+
+        with target_manager.lock:
+            new_database = CloudDatabase()
+            target_manager.add_cloud_database(cloud_database=new_database)
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(timeout=30)
+            assert not reader.is_alive()
+
+        before_change = target_manager.cloud_databases
+        target_manager.remove_cloud_database(cloud_database=new_database)
+        assert read_databases == [frozenset({database, new_database})]
+        assert before_change == frozenset({database, new_database})
+        assert target_manager.cloud_databases == frozenset({database})
+
+    @staticmethod
+    def test_get_database_by_access_key() -> None:
+        """Databases can be looked up by their access keys, and the keys of
+        a removed database can be used by a new database.
+        """
+        target_manager = TargetManager()
+        cloud_database = CloudDatabase()
+        vumark_database = VuMarkDatabase()
+        target_manager.add_cloud_database(cloud_database=cloud_database)
+        target_manager.add_vumark_database(vumark_database=vumark_database)
+
+        assert (
+            target_manager.get_cloud_database_by_server_access_key(
+                server_access_key=cloud_database.server_access_key,
+            )
+            == cloud_database
+        )
+        assert (
+            target_manager.get_cloud_database_by_client_access_key(
+                client_access_key=cloud_database.client_access_key,
+            )
+            == cloud_database
+        )
+        assert (
+            target_manager.get_vumark_database_by_server_access_key(
+                server_access_key=vumark_database.server_access_key,
+            )
+            == vumark_database
+        )
+        with pytest.raises(expected_exception=KeyError):
+            target_manager.get_cloud_database_by_server_access_key(
+                server_access_key=vumark_database.server_access_key,
+            )
+
+        target_manager.remove_cloud_database(cloud_database=cloud_database)
+        with pytest.raises(expected_exception=KeyError):
+            target_manager.get_cloud_database_by_server_access_key(
+                server_access_key=cloud_database.server_access_key,
+            )
+        target_manager.add_cloud_database(cloud_database=cloud_database)
+        assert target_manager.cloud_databases == frozenset({cloud_database})
+
+    @staticmethod
+    def test_membership_is_by_identity() -> None:
+        """A database is in the set of databases only if it is the database
+        which was added, not if it is equal to that database.
+        """
+        target_manager = TargetManager()
+        database = CloudDatabase()
+        target_manager.add_cloud_database(cloud_database=database)
+        # See https://github.com/facebook/pyrefly/issues/1897
+        equal_database: CloudDatabase = copy.replace(
+            database,  # pyrefly: ignore[bad-argument-type]
+        )
+
+        assert equal_database == database
+        assert database in target_manager.cloud_databases
+        assert equal_database not in target_manager.cloud_databases
+
+
 class TestContextManagerReuse:
     """Tests for reusing a ``MockVWS`` instance as a context manager."""
 
@@ -1547,6 +1922,65 @@ class TestQueryImageMatchers:
             )
             assert not different_image_result
 
+    @staticmethod
+    def test_queries_are_handled_concurrently(
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """Requests which do not change targets are handled at the same time
+        as each other.
+        """
+        num_requests = 3
+        # This is broken after the timeout if the queries are handled one at
+        # a time, as then only one of them waits at the barrier.
+        barrier = threading.Barrier(parties=num_requests, timeout=10)
+
+        def waiting_matcher(
+            first_image_content: bytes,
+            second_image_content: bytes,
+        ) -> bool:
+            """Wait until every query is being handled."""
+            barrier.wait()
+            return first_image_content == second_image_content
+
+        database = CloudDatabase()
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        cloud_reco_client = CloudRecoService(
+            client_access_key=database.client_access_key,
+            client_secret_key=database.client_secret_key,
+        )
+        image_content = high_quality_image.getvalue()
+
+        def query() -> int:
+            """Query with the image of the target.
+
+            Returns:
+                The number of matches.
+            """
+            return len(
+                cloud_reco_client.query(
+                    image=io.BytesIO(initial_bytes=image_content),
+                ),
+            )
+
+        with MockVWS(query_match_checker=waiting_matcher) as mock:
+            mock.add_cloud_database(cloud_database=database)
+            target_id = vws_client.add_target(
+                name="example",
+                width=1,
+                image=high_quality_image,
+                application_metadata=None,
+                active_flag=True,
+            )
+            vws_client.wait_for_target_processed(target_id=target_id)
+            with ThreadPoolExecutor(max_workers=num_requests) as executor:
+                futures = [executor.submit(query) for _ in range(num_requests)]
+                num_matches = [future.result() for future in futures]
+
+        assert num_matches == [1] * num_requests
+
 
 class TestDuplicatesImageMatchers:
     """Tests for duplicates image matchers."""
@@ -1916,6 +2350,34 @@ class TestDecorator:
         ):
             requests.get(url=summary_url, timeout=30)
 
+    @staticmethod
+    def test_nested_starts() -> None:
+        """An instance which is started while it is already started stays
+        started until the outermost start ends, and can be started again.
+        """
+        base_vws_url = _unused_local_url()
+        summary_url = base_vws_url + "/summary"
+        mock = MockVWS(base_vws_url=base_vws_url)
+
+        def status_code() -> int:
+            """Make a request to the mocked VWS API.
+
+            Returns:
+                The status code of the response.
+            """
+            return requests.get(url=summary_url, timeout=30).status_code
+
+        for _ in range(2):
+            with mock:
+                with mock:
+                    assert status_code() == HTTPStatus.UNAUTHORIZED
+                assert status_code() == HTTPStatus.UNAUTHORIZED
+
+            with pytest.raises(
+                expected_exception=requests.exceptions.ConnectionError,
+            ):
+                status_code()
+
     @staticmethod
     def test_httpx_requests_are_mocked() -> None:
         """Requests made with ``httpx`` are mocked within the decorated
@@ -2140,6 +2602,76 @@ class TestDecorator:
         add_one_target()
         assert not database.targets
 
+    @staticmethod
+    def test_existing_targets_are_restored(
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """Targets which a database has before a call are there again after
+        it, even when the call deletes them.
+
+        The database's set of targets is changed back in place rather than
+        replaced with a copy.
+        """
+        database = CloudDatabase()
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        mock = MockVWS(processing_time_seconds=0)
+        mock.add_cloud_database(cloud_database=database)
+        with mock:
+            target_id = vws_client.add_target(
+                name="existing",
+                width=1,
+                image=high_quality_image,
+                active_flag=True,
+                application_metadata=None,
+            )
+            vws_client.wait_for_target_processed(target_id=target_id)
+        targets_before_call = database.targets
+        (existing_target,) = targets_before_call
+
+        @mock
+        def delete_target() -> None:
+            """Delete the existing target."""
+            vws_client.delete_target(target_id=target_id)
+            assert not vws_client.list_targets()
+
+        delete_target()
+        delete_target()
+        assert database.targets is targets_before_call
+        assert database.targets == {existing_target}
+
+    @staticmethod
+    def test_adding_database_replaces_targets_set(
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """Adding a database replaces its set of targets with a set of the
+        same targets, and it is that set which the mock changes.
+        """
+        database = CloudDatabase()
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+        targets_before_adding = database.targets
+        mock = MockVWS()
+        mock.add_cloud_database(cloud_database=database)
+        assert database.targets is not targets_before_adding
+        assert database.targets == targets_before_adding
+
+        with mock:
+            vws_client.add_target(
+                name="example",
+                width=1,
+                image=high_quality_image,
+                active_flag=True,
+                application_metadata=None,
+            )
+
+        assert len(database.targets) == 1
+        assert not targets_before_adding
+
     @staticmethod
     def test_exception_restores_database_targets(
         high_quality_image: io.BytesIO,
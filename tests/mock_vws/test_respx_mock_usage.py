@@ -2,6 +2,7 @@
 clients.
 """
 
+import asyncio
 import io
 import uuid
 from http import HTTPStatus
@@ -212,3 +213,85 @@ class TestModelTargetWebAPI:
 
         assert create_response.status_code == HTTPStatus.CREATED
         assert status_response.json()["status"] == "done"
+
+
+class TestAsyncClient:
+    """``httpx.AsyncClient`` usage through the mock."""
+
+    @staticmethod
+    def test_delays_are_awaited_concurrently() -> None:
+        """Response delays of concurrent requests overlap, and they are
+        awaited with the given asynchronous sleep function rather than
+        the synchronous one.
+        """
+        num_requests = 5
+        sync_sleeps: list[float] = []
+        async_sleeps: list[float] = []
+        all_sleeping = asyncio.Event()
+
+        async def sleep(seconds: float) -> None:
+            """Wait until every request is delayed at once.
+
+            This waits forever if the requests are handled one at a time.
+            """
+            async_sleeps.append(seconds)
+            if len(async_sleeps) == num_requests:
+                all_sleeping.set()
+            await all_sleeping.wait()
+
+        async def send_all() -> list[httpx.Response]:
+            """Send the requests at once."""
+            async with httpx.AsyncClient() as client:
+                responses = await asyncio.wait_for(
+                    asyncio.gather(
+                        *(
+                            client.get(
+                                url="https://vws.vuforia.com/summary",
+                                timeout=30,
+                            )
+                            for _ in range(num_requests)
+                        ),
+                    ),
+                    timeout=30,
+                )
+            return list(responses)
+
+        with MockVWS(
+            response_delay_seconds=1.5,
+            sleep_fn=sync_sleeps.append,
+            async_sleep_fn=sleep,
+        ):
+            responses = asyncio.run(main=send_all())
+
+        assert [response.status_code for response in responses] == [
+            HTTPStatus.UNAUTHORIZED
+        ] * num_requests
+        assert async_sleeps == [1.5] * num_requests
+        assert not sync_sleeps
+
+    @staticmethod
+    def test_response_delay_causes_timeout() -> None:
+        """A response delay longer than the read timeout raises a timeout
+        error after awaiting the timeout.
+        """
+        async_sleeps: list[float] = []
+
+        async def sleep(seconds: float) -> None:
+            """Record the sleep."""
+            async_sleeps.append(seconds)
+
+        async def send() -> httpx.Response:
+            """Send a request."""
+            async with httpx.AsyncClient() as client:
+                return await client.get(
+                    url="https://vws.vuforia.com/summary",
+                    timeout=0.1,
+                )
+
+        with (
+            MockVWS(response_delay_seconds=5.0, async_sleep_fn=sleep),
+            pytest.raises(expected_exception=httpx.ReadTimeout),
+        ):
+            asyncio.run(main=send())
+
+        assert async_sleeps == [0.1]
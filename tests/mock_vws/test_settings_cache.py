@@ -0,0 +1,64 @@
+"""Tests for the cache of the settings of the Flask applications."""
+
+import pytest
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from mock_vws._flask_server.settings_cache import SettingsCache
+
+
+class _Settings(BaseSettings):
+    """Settings which are read from names with a prefix and from aliases."""
+
+    prefixed: int = 0
+    aliased: int = Field(
+        default=0,
+        validation_alias=AliasChoices("FIRST_ALIAS", "SECOND_ALIAS"),
+    )
+
+    model_config = SettingsConfigDict(frozen=True, env_prefix="EXAMPLE_")
+
+
+@pytest.mark.parametrize(
+    argnames=("environment_variable_name", "field_name"),
+    argvalues=[
+        ("EXAMPLE_PREFIXED", "prefixed"),
+        ("example_prefixed", "prefixed"),
+        ("Second_Alias", "aliased"),
+    ],
+)
+def test_environment_changes(
+    *,
+    monkeypatch: pytest.MonkeyPatch,
+    environment_variable_name: str,
+    field_name: str,
+) -> None:
+    """Cached settings are read again when an environment variable which
+    they are read from changes, whatever the case of its name.
+    """
+    settings_cache = SettingsCache(settings_class=_Settings)
+    assert getattr(settings_cache.get(), field_name) == 0
+
+    new_value = 1
+    monkeypatch.setenv(
+        name=environment_variable_name,
+        value=str(object=new_value),
+    )
+
+    assert getattr(settings_cache.get(), field_name) == new_value
+
+
+def test_unrelated_environment_changes(
+    *,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Cached settings are not read again when an environment variable
+    which they are not read from changes.
+    """
+    settings_cache = SettingsCache(settings_class=_Settings)
+    settings = settings_cache.get()
+
+    # Without the prefix, this is not read.
+    monkeypatch.setenv(name="PREFIXED", value="1")
+
+    assert settings_cache.get() is settings
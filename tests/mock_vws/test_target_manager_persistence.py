@@ -0,0 +1,196 @@
+"""Tests for keeping the target manager service's state in a directory."""
+
+import copy
+import io
+from pathlib import Path
+
+from mock_vws._flask_server.persistence import TargetManagerStore
+from mock_vws.database import CloudDatabase, VuMarkDatabase
+from mock_vws.model_target import OAuth2ClientCredential
+from mock_vws.target import ImageTarget, VuMarkTarget
+from mock_vws.target_manager import TargetManager
+from mock_vws.target_raters import HardcodedTargetTrackingRater
+
+
+def _restore(*, directory: Path) -> TargetManager:
+    """Load a new target manager from the state in a directory."""
+    target_manager = TargetManager()
+    TargetManagerStore(
+        target_manager=target_manager,
+        directory=directory,
+        snapshot_interval_changes=1000,
+    ).load()
+    return target_manager
+
+
+def _record_changes(
+    *,
+    directory: Path,
+    snapshot_interval_changes: int,
+    image: io.BytesIO,
+) -> TargetManager:
+    """Make and record changes to a new target manager, and return it."""
+    target_manager = TargetManager()
+    store = TargetManagerStore(
+        target_manager=target_manager,
+        directory=directory,
+        snapshot_interval_changes=snapshot_interval_changes,
+    )
+    store.load()
+
+    database = CloudDatabase()
+    target_manager.add_cloud_database(cloud_database=database)
+    store.record_cloud_database_added(database=database)
+
+    removed_database = CloudDatabase()
+    target_manager.add_cloud_database(cloud_database=removed_database)
+    store.record_cloud_database_added(database=removed_database)
+    target_manager.remove_cloud_database(cloud_database=removed_database)
+    store.record_cloud_database_removed(
+        database_name=removed_database.database_name,
+    )
+
+    target = ImageTarget(
+        name="example",
+        width=1,
+        image_value=image.getvalue(),
+        active_flag=True,
+        processing_time_seconds=0,
+        application_metadata=None,
+        target_tracking_rater=HardcodedTargetTrackingRater(rating=3),
+    )
+    # See https://github.com/facebook/pyrefly/issues/1897
+    renamed_target: ImageTarget = copy.replace(
+        target,  # pyrefly: ignore[bad-argument-type]
+        name="renamed",
+    )
+    # The renamed target replaces the first version of the target.
+    for put_target in (target, renamed_target):
+        database = copy.replace(
+            database,  # pyrefly: ignore[bad-argument-type]
+            targets={put_target},
+        )
+        target_manager.replace_cloud_database(cloud_database=database)
+        store.record_target_put(
+            database_name=database.database_name,
+            target=put_target,
+        )
+
+    vumark_database = VuMarkDatabase()
+    target_manager.add_vumark_database(vumark_database=vumark_database)
+    store.record_vumark_database_added(database=vumark_database)
+    vumark_target = VuMarkTarget(name="example")
+    target_manager.replace_vumark_database(
+        vumark_database=copy.replace(
+            vumark_database,  # pyrefly: ignore[bad-argument-type]
+            vumark_targets={vumark_target},
+        ),
+    )
+    store.record_vumark_target_added(
+        database_name=vumark_database.database_name,
+        target=vumark_target,
+    )
+
+    credential = OAuth2ClientCredential(
+        client_id="client-id",
+        client_secret="client-secret",
+        scopes=("scope",),
+    )
+    target_manager.add_oauth2_client_credential(credential=credential)
+    store.record_oauth2_client_credential_put(credential=credential)
+    store.wait_for_snapshot()
+    return target_manager
+
+
+class TestTargetManagerStore:
+    """Tests for the store of a target manager's state."""
+
+    @staticmethod
+    def test_state_is_restored(
+        *,
+        tmp_path: Path,
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """A new target manager is given the state which was recorded."""
+        target_manager = _record_changes(
+            directory=tmp_path,
+            snapshot_interval_changes=1000,
+            image=high_quality_image,
+        )
+
+        restored = _restore(directory=tmp_path)
+
+        assert restored.cloud_databases == target_manager.cloud_databases
+        assert restored.vumark_databases == target_manager.vumark_databases
+        assert (
+            restored.oauth2_client_credentials
+            == target_manager.oauth2_client_credentials
+        )
+
+    @staticmethod
+    def test_snapshots(
+        *,
+        tmp_path: Path,
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """
+        State is restored from a snapshot and from the changes logged
+        after that snapshot.
+        """
+        target_manager = _record_changes(
+            directory=tmp_path,
+            snapshot_interval_changes=3,
+            image=high_quality_image,
+        )
+
+        restored = _restore(directory=tmp_path)
+
+        assert restored.cloud_databases == target_manager.cloud_databases
+        assert restored.vumark_databases == target_manager.vumark_databases
+
+    @staticmethod
+    def test_incomplete_change_is_ignored(
+        *,
+        tmp_path: Path,
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """
+        A change which was not completely written, for example because
+        the service was killed, is ignored.
+        """
+        target_manager = _record_changes(
+            directory=tmp_path,
+            snapshot_interval_changes=1000,
+            image=high_quality_image,
+        )
+        (log_path,) = tmp_path.glob(pattern="*.log")
+        with log_path.open(mode="ab") as log_file:
+            log_file.write(b"\x00\x00\x01\x00partial")
+
+        restored = _restore(directory=tmp_path)
+
+        assert restored.cloud_databases == target_manager.cloud_databases
+
+    @staticmethod
+    def test_set_aside_log_is_replayed(
+        *,
+        tmp_path: Path,
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """
+        Changes in a log which was set aside for a snapshot which was not
+        written, for example because the service was killed, are restored.
+        """
+        target_manager = _record_changes(
+            directory=tmp_path,
+            snapshot_interval_changes=1000,
+            image=high_quality_image,
+        )
+        (log_path,) = tmp_path.glob(pattern="*.log")
+        log_path.replace(target=log_path.with_name(name=log_path.name + ".8"))
+
+        restored = _restore(directory=tmp_path)
+
+        assert restored.cloud_databases == target_manager.cloud_databases
+        assert restored.vumark_databases == target_manager.vumark_databases
+        assert list(tmp_path.glob(pattern="*.log.*")) == []
@@ -0,0 +1,57 @@
+"""Tests for skipping internal type checks."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mock_vws._type_checks import (
+    SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE,
+)
+
+# This prints whether a private function, and a public class's
+# ``__init__``, are wrapped by a type checker.
+_CODE = """
+import mock_vws._route_table
+import mock_vws.database
+
+print(
+    hasattr(mock_vws._route_table._first_segment, "__wrapped__"),
+    hasattr(mock_vws.database.CloudDatabase.__init__, "__wrapped__"),
+)
+"""
+
+
+@pytest.mark.parametrize(
+    argnames=("environment_variable_value", "expected_output"),
+    argvalues=[
+        (None, "True True"),
+        ("0", "True True"),
+        ("1", "False True"),
+        ("true", "False True"),
+    ],
+)
+def test_skip_internal_type_checks(
+    environment_variable_value: str | None,
+    expected_output: str,
+) -> None:
+    """Internal functions are type checked unless the environment variable
+    is set, and public classes are always type checked.
+    """
+    env = dict(os.environ)
+    env.pop(SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE, None)
+    if environment_variable_value is not None:
+        env[SKIP_INTERNAL_TYPE_CHECKS_ENVIRONMENT_VARIABLE] = (
+            environment_variable_value
+        )
+    # A new interpreter is used, as type checks are chosen when modules are
+    # imported.
+    result = subprocess.run(
+        args=[sys.executable, "-c", _CODE],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    assert result.stdout.strip() == expected_output